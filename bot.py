@@ -4,6 +4,7 @@
 # Dependencies: discord.py, pymongo, dnspython, certifi
 
 import os
+import sys
 import asyncio
 import re
 import random
@@ -12,21 +13,27 @@ from datetime import datetime, timedelta
 import discord
 from discord.ext import commands
 from discord.ui import View, Button, Select
-from pymongo import MongoClient, ReturnDocument
+from pymongo import MongoClient, ReturnDocument, UpdateOne, InsertOne, DeleteMany
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from bson import ObjectId
 import certifi
 from fastapi import FastAPI
 import uvicorn
 import threading
 import typing
-from discord.ext import tasks
 import re
 from datetime import datetime, timezone, timedelta
 import math
 import chat_exporter
-import io
 import uuid
 import copy
 import json
+import heapq
+from collections import deque
+import hashlib
+import gzip
+import socket
+import time
 from groq import AsyncGroq
 from ddgs import DDGS
 
@@ -34,6 +41,10 @@ from ddgs import DDGS
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 MONGO_URL = os.getenv("MONGO_URL")
 BOT_OWNER_ID = int(os.getenv("BOT_OWNER_ID")) if os.getenv("BOT_OWNER_ID") else None
+# `python bot.py --worker` runs background jobs over REST only, with no gateway connection
+WORKER_MODE = "--worker" in sys.argv
+JOB_WORKERS = WORKER_MODE or os.getenv("JOB_WORKERS", "").lower() in ("1", "true", "yes") # Gateway leaves offloadable jobs to workers
+LIVE_AUCTION_ROOMS = [int(c) for c in os.getenv("LIVE_AUCTION_ROOMS", "1483860258932916336").split(",") if c.strip()] # Bidding channels run lots in parallel
 
 # Initialize Groq Client
 groq_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
@@ -50,6 +61,14 @@ LOG_CHANNELS = {
     "chat_channel": 975275349573271552, # Daily Task Channel
 }
 
+# Optional webhooks for log channels (channel_id -> webhook URL). Batches go out
+# through the webhook instead of the bot's own channel send when one is set.
+LOG_WEBHOOKS = {}
+LOG_FLUSH_INTERVAL = 2.0   # Seconds a batch may wait to fill up before posting
+LOG_BUFFER_LIMIT = 200     # Max queued embeds per channel before producers get pushed back
+LOG_MESSAGE_CHARS = 6000   # Discord's cap on the combined length of all embeds in one message
+DM_DIGEST_WINDOW = 10.0    # Seconds to collect a user's notifications into one DM
+
 # Constants
 TIME_LIMIT = 90 
 MIN_INCREMENT_PERCENT = 5
@@ -233,6 +252,43 @@ if db is not None:
     gamble_profiles_col = db["gamble_profiles"]
     ai_memory_col = db["ai_knowledge"]
     ai_reminders_col = db["ai_reminders"]
+    scheduled_jobs_col = db["scheduled_jobs"]
+
+    # Due-time index for the job scheduler; (kind, key) keeps one job per thing
+    scheduled_jobs_col.create_index([("status", 1), ("due_at", 1)])
+    scheduled_jobs_col.create_index([("kind", 1), ("key", 1)], unique=True)
+
+    # Club/duelist auction timers; `live` is only set while an auction is open or settling
+    timed_auctions_col = db["timed_auctions"]
+    timed_auctions_col.create_index([("status", 1), ("ends_at", 1)])
+    timed_auctions_col.create_index([("item_type", 1), ("item_id", 1)], unique=True, partialFilterExpression={"live": True})
+
+    # Giveaways + one row per entrant, written as reactions come in
+    giveaways_col = db["giveaways"]
+    giveaway_entries_col = db["giveaway_entries"]
+    giveaways_col.create_index("message_id", unique=True)
+    giveaways_col.create_index([("ended", 1), ("end_time", 1)])
+    giveaway_entries_col.create_index([("giveaway_id", 1), ("user_id", 1)], unique=True)
+
+    # Live Pokémon auction session (one doc per event) so a restart resumes mid-slot
+    live_sessions_col = db["live_auction_sessions"]
+    live_sessions_col.create_index([("status", 1), ("started_at", -1)])
+    # Registration slots: each block slot and each user's slots can only be inserted once
+    auction_queue_col.create_index("slot", unique=True, sparse=True)
+    auction_queue_col.create_index([("user_id", 1), ("user_slot", 1)], unique=True, partialFilterExpression={"user_slot": {"$exists": True}})
+
+    # Leader election for singleton background jobs; TTL only cleans up, expiry is checked on acquire
+    leases_col = db["leases"]
+    leases_col.create_index("expires_at", expireAfterSeconds=0)
+
+    # Progress of keyed settlements on servers without transactions (see Settlement._apply_once)
+    settlement_journal_col = db["settlement_journal"]
+    settlement_journal_col.create_index("finished_at", expireAfterSeconds=7 * 86400)
+
+    # Tax sweep range-scans this instead of loading every owned club
+    clubs_col.create_index("next_tax_alert_at", sparse=True)
+    # Same idea for login pings: only wallets with a pending reminder carry remind_at
+    wallets_col.create_index("remind_at", sparse=True)
 
 PREDICTION_PING_ROLE = "<@&1458516530739286111>"
 PREDICTION_LOG_CHANNEL_ID = 1445461752094396446
@@ -249,6 +305,123 @@ def get_next_id(sequence_name):
     )
     return ret['seq']
 
+class SettlementAborted(Exception):
+    pass
+
+class Settlement:
+    """Collects the writes of one settlement (auction win, trade, sale) and commits them together.
+
+    On a replica set everything runs in one multi-document transaction. Standalone servers have no
+    transactions, so there the guards run first and are undone if a later one fails; after that the
+    remaining writes are applied in order. A crash in that window leaves a half-applied settlement
+    unless a `key` is given: then progress is journaled under it in `settlement_journal`, and committing
+    again skips what already landed and finishes the rest (see finalize_auction).
+    Plain writes are batched into one bulk_write per collection instead of a round trip each."""
+    transactional = None # Probed on first commit
+
+    def __init__(self, name, key=None):
+        self.name = name
+        self.key = key
+        self.guards = [] # (col, filter, update, undo) that must each match one doc
+        self.ops = {} # collection name -> (col, [(op, filter or doc, update, upsert)]), order kept per collection
+
+    def guard(self, col, filt, update, undo=None):
+        self.guards.append((col, filt, update, undo))
+        return self
+
+    def debit(self, col, filt, field, amount):
+        """Guarded $inc that fails the settlement instead of going negative."""
+        if amount <= 0: return self
+        return self.guard(col, {**filt, field: {"$gte": amount}}, {"$inc": {field: -amount}}, {"$inc": {field: amount}})
+
+    def _add(self, col, *op):
+        self.ops.setdefault(col.name, (col, []))[1].append(op)
+        return self
+
+    def insert(self, col, doc): return self._add(col, "insert", doc, None, False)
+    def update(self, col, filt, update, upsert=False): return self._add(col, "update", filt, update, upsert)
+    def delete(self, col, filt): return self._add(col, "delete", filt, None, False)
+
+    @staticmethod
+    def _plain(filt):
+        return {k: v for k, v in filt.items() if not isinstance(v, dict)}
+
+    def _apply(self, session=None):
+        if self.key and session is None: return self._apply_once()
+        done = []
+        for col, filt, update, undo in self.guards:
+            if col.update_one(filt, update, session=session).modified_count != 1:
+                if session is None: # No transaction to roll back, so put the earlier guards back by hand
+                    for ucol, ufilt, uundo in reversed(done): ucol.update_one(ufilt, uundo)
+                raise SettlementAborted(self.name)
+            if undo: done.append((col, self._plain(filt), undo))
+        for col, ops in self.ops.values():
+            bulk = [InsertOne(t) if op == "insert" else UpdateOne(t, u, upsert=up) if op == "update" else DeleteMany(t) for op, t, u, up in ops]
+            col.bulk_write(bulk, ordered=True, session=session)
+
+    def _landed(self, field, tag):
+        settlement_journal_col.update_one({"_id": self.key}, {"$addToSet": {field: tag}})
+
+    def _apply_once(self):
+        """Guarded writes without a transaction, safe to repeat. The journal doc (one per key) lists the guards
+        and ops that landed, so a resumed commit skips them. Inserts get ObjectIds fixed in the journal up
+        front and are exact; an update can only repeat if the crash falls between it and its journal entry."""
+        inserts = {f"{col.name}:{n}": ObjectId() for col, ops in self.ops.values() for n, op in enumerate(ops) if op[0] == "insert"}
+        journal = settlement_journal_col.find_one_and_update(
+            {"_id": self.key},
+            {"$setOnInsert": {"name": self.name, "guards": [], "ops": [], "ids": inserts, "started_at": datetime.now()}},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        if journal.get("finished_at"): return
+
+        done = []
+        for i, (col, filt, update, undo) in enumerate(self.guards):
+            if i not in journal["guards"]:
+                if col.update_one(filt, update).modified_count != 1:
+                    # Put back every guard this settlement applied, in this run or the crashed one
+                    for ucol, ufilt, uundo in reversed(done): ucol.update_one(ufilt, uundo)
+                    settlement_journal_col.delete_one({"_id": self.key})
+                    raise SettlementAborted(self.name)
+                self._landed("guards", i)
+            if undo: done.append((col, self._plain(filt), undo))
+        for col, ops in self.ops.values():
+            for n, (op, target, update, upsert) in enumerate(ops):
+                tag = f"{col.name}:{n}"
+                if tag in journal["ops"]: continue
+                if op == "insert":
+                    try: col.insert_one({"_id": journal["ids"][tag], **target})
+                    except DuplicateKeyError: pass # Landed before the crash
+                elif op == "delete":
+                    col.delete_many(target)
+                else:
+                    col.update_one(target, update, upsert=upsert)
+                self._landed("ops", tag)
+        settlement_journal_col.update_one({"_id": self.key}, {"$set": {"finished_at": datetime.now()}})
+
+    def commit(self):
+        """True if applied, False if a guard didn't match (nothing is left applied)."""
+        if db is None: return False
+        if Settlement.transactional is None:
+            try:
+                hello = cluster.admin.command("hello")
+                Settlement.transactional = bool(hello.get("setName") or hello.get("msg") == "isdbgrid")
+            except Exception:
+                Settlement.transactional = False
+            print(f"[Settlement] Transactions {'enabled' if Settlement.transactional else 'unavailable, using guarded writes'}.")
+        try:
+            if Settlement.transactional:
+                try:
+                    with cluster.start_session() as session:
+                        session.with_transaction(lambda s: self._apply(s))
+                    return True
+                except OperationFailure as e:
+                    if e.code != 20: raise # 20 = IllegalOperation: transactions not supported here
+                    Settlement.transactional = False
+            self._apply()
+            return True
+        except SettlementAborted:
+            return False
+
 # ---------- BOT SETUP ----------
 # ---------- BOT SETUP & HELPERS ----------
 # Global variable to store prefix in memory
@@ -263,7 +436,7 @@ def get_prefix(bot, message):
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
-bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
+bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None, owner_id=BOT_OWNER_ID) # None: the application owner
 active_timers = {}
 bidding_frozen = False
 
@@ -284,6 +457,488 @@ def get_wallet(user_id):
     new_wallet = {"user_id": str(user_id), "balance": 0, "shiny_coins": 0, "pc": 0}
     wallets_col.insert_one(new_wallet)
     return new_wallet
+
+class UserResolver:
+    """Resolves user IDs: gateway cache first, then an LRU+TTL cache, then bounded parallel REST fetches."""
+    def __init__(self, max_size=2000, ttl=3600, concurrency=5):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache = {} # user_id -> (user or None, expires_at); dict order doubles as LRU order
+        self.sem = asyncio.Semaphore(concurrency)
+        self.inflight = {} # user_id -> task, so two commands never fetch the same user twice
+        self.fetches = 0
+
+    def _lookup(self, uid):
+        user = bot.get_user(uid)
+        if user: return True, user
+        entry = self.cache.pop(uid, None)
+        if entry and entry[1] > datetime.now().timestamp():
+            self.cache[uid] = entry # Move to the most-recent end
+            return True, entry[0]
+        return False, None
+
+    def _store(self, uid, user):
+        self.cache.pop(uid, None)
+        self.cache[uid] = (user, datetime.now().timestamp() + self.ttl)
+        while len(self.cache) > self.max_size:
+            self.cache.pop(next(iter(self.cache)))
+
+    async def _fetch(self, uid):
+        async with self.sem:
+            self.fetches += 1
+            try: user = await bot.fetch_user(uid)
+            except discord.NotFound: user = None # Deleted account, cache the miss too
+            except discord.HTTPException: return None
+        self._store(uid, user)
+        return user
+
+    async def resolve_many(self, ids):
+        """Returns {int_id: User or None}. Non-numeric IDs (e.g. group:name) are skipped."""
+        found, missing = {}, []
+        for raw in ids:
+            try: uid = int(raw)
+            except (TypeError, ValueError): continue
+            if uid in found or uid in missing: continue
+            hit, user = self._lookup(uid)
+            if hit: found[uid] = user
+            else: missing.append(uid)
+
+        # One parallel batch for everything not cached
+        fetches = []
+        for uid in missing:
+            task = self.inflight.get(uid)
+            if task is None:
+                task = self.inflight[uid] = bot.loop.create_task(self._fetch(uid))
+                task.add_done_callback(lambda _t, uid=uid: self.inflight.pop(uid, None))
+            fetches.append(task)
+        results = await asyncio.gather(*fetches, return_exceptions=True)
+        for uid, user in zip(missing, results):
+            found[uid] = None if isinstance(user, BaseException) else user
+        return found
+
+    async def resolve(self, user_id):
+        return (await self.resolve_many([user_id])).get(int(user_id)) if str(user_id).isdigit() else None
+
+user_resolver = UserResolver()
+
+# ==========================================================
+# 🧭 BACKGROUND TASK SUPERVISOR (one instance of every loop per process)
+# ==========================================================
+
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+class LeaseLost(Exception):
+    pass
+
+class LeaderLease:
+    """Mongo lease (`leases` collection): whoever holds an unexpired lease is the leader for singleton jobs.
+    The holder renews every `renew` seconds; standbys retry on the same beat and take over once it lapses."""
+    def __init__(self, name="background", ttl=15, renew=5):
+        self.name = name
+        self.ttl = ttl
+        self.renew = renew
+        self.expires_at = None
+        self.acquired = asyncio.Event()
+        self.lost = asyncio.Event()
+
+    @property
+    def is_leader(self):
+        return self.expires_at is not None and datetime.now() < self.expires_at
+
+    def _try_acquire(self):
+        now = datetime.now()
+        try:
+            lease = leases_col.find_one_and_update(
+                {"_id": self.name, "$or": [{"holder": INSTANCE_ID}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"holder": INSTANCE_ID, "expires_at": now + timedelta(seconds=self.ttl), "renewed_at": now}},
+                upsert=True, return_document=ReturnDocument.AFTER
+            )
+            return lease["expires_at"]
+        except DuplicateKeyError:
+            return None # Someone else holds a live lease
+
+    async def run(self):
+        if db is None:
+            self.expires_at = datetime.max # Single process without Mongo is always the leader
+            return self.acquired.set()
+        while not bot.is_closed():
+            was_leader = self.is_leader
+            try: self.expires_at = await asyncio.to_thread(self._try_acquire)
+            except Exception as e: print(f"[Lease] Renewal failed: {e}") # Keep the old expiry; it lapses on its own
+            if self.is_leader and not was_leader:
+                print(f"[Lease] {INSTANCE_ID} is now the leader.")
+                self.lost.clear(); self.acquired.set()
+            elif was_leader and not self.is_leader:
+                print(f"[Lease] {INSTANCE_ID} lost leadership.")
+                self.acquired.clear(); self.lost.set()
+            await asyncio.sleep(self.renew)
+
+    async def run_while_leader(self, coro):
+        """Runs coro until it finishes or leadership is lost (then it is cancelled and LeaseLost raised)."""
+        task = asyncio.ensure_future(coro)
+        lost = asyncio.ensure_future(self.lost.wait())
+        await asyncio.wait({task, lost}, return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            lost.cancel()
+            return task.result()
+        task.cancel()
+        try: await task
+        except (asyncio.CancelledError, Exception): pass
+        raise LeaseLost()
+
+gateway_lease = LeaderLease("gateway") # Only its holder connects to the gateway (see run_gateway); its singletons run there
+jobs_lease = LeaderLease("jobs")       # Singletons that can run on a worker (market simulations)
+
+async def ready_for_jobs():
+    # Workers never connect to the gateway, so there is no ready event to wait for
+    if not WORKER_MODE: await bot.wait_until_ready()
+
+def messageable(channel_id):
+    """Cached channel on the gateway process, a REST-only partial channel on a worker."""
+    return bot.get_channel(channel_id) or bot.get_partial_messageable(channel_id)
+
+class TaskSupervisor:
+    """Starts each registered background coroutine once per process and restarts it with backoff if it crashes.
+    on_ready fires again on every gateway reconnect, so it only ever calls start_all().
+    role: "gateway" tasks never run on a worker, "jobs" tasks move to workers when JOB_WORKERS is set, "both" run everywhere."""
+    def __init__(self, base_backoff=5, max_backoff=300):
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.factories = {} # name -> (coroutine fn, restart on crash, lease or None, role)
+        self.tasks = {}
+        self.stats = {}
+
+    def register(self, name, factory, restart=True, lease=None, role="gateway"):
+        """With a lease the task only runs while this process holds it, and is cancelled if it is lost."""
+        self.factories[name] = (factory, restart, lease, role)
+        self.stats[name] = {"starts": 0, "crashes": 0, "runs": 0, "last_run": None, "last_duration": None, "last_error": None}
+
+    def once(self, name, lease=None, role="gateway"):
+        """Decorator: a startup step that runs exactly once per process, however many times on_ready fires."""
+        def decorator(fn):
+            async def runner():
+                await ready_for_jobs()
+                started = time.perf_counter()
+                self.stats[name]["last_run"] = datetime.now()
+                result = fn()
+                if asyncio.iscoroutine(result): await result
+                self.stats[name]["last_duration"] = time.perf_counter() - started
+                self.stats[name]["runs"] += 1
+            self.register(name, runner, restart=False, lease=lease, role=role)
+            return fn
+        return decorator
+
+    def every(self, name, seconds, delay_first=False, lease=None, role="gateway"):
+        """Decorator: runs fn every `seconds`, recording when each run happened and how long it took."""
+        def decorator(fn):
+            async def runner():
+                await ready_for_jobs()
+                if delay_first: await asyncio.sleep(seconds)
+                while not bot.is_closed():
+                    started = time.perf_counter()
+                    self.stats[name]["last_run"] = datetime.now()
+                    await fn()
+                    self.stats[name]["last_duration"] = time.perf_counter() - started
+                    self.stats[name]["runs"] += 1
+                    await asyncio.sleep(seconds)
+            self.register(name, runner, lease=lease, role=role)
+            return fn
+        return decorator
+
+    def runs_here(self, role):
+        if WORKER_MODE: return role != "gateway"
+        return role != "jobs" or not JOB_WORKERS
+
+    def start_all(self):
+        for name, (_, _, _, role) in self.factories.items():
+            if name not in self.tasks and self.runs_here(role):
+                self.tasks[name] = bot.loop.create_task(self._supervise(name))
+
+    async def _supervise(self, name):
+        factory, restart, lease, _ = self.factories[name]
+        backoff = self.base_backoff
+        while not bot.is_closed():
+            if lease: await lease.acquired.wait()
+            self.stats[name]["starts"] += 1
+            started = time.monotonic()
+            try:
+                if lease: await lease.run_while_leader(factory())
+                else: await factory()
+                return # Finished on its own (one-shot, or the bot is closing)
+            except asyncio.CancelledError:
+                raise
+            except LeaseLost:
+                continue # Park until this process is leader again
+            except Exception as e:
+                self.stats[name]["crashes"] += 1
+                self.stats[name]["last_error"] = f"{type(e).__name__}: {e}"
+                print(f"[Supervisor] Task '{name}' crashed: {e}")
+                if not restart: return
+            # A task that stayed up for a while earns a fresh backoff
+            if time.monotonic() - started > self.max_backoff: backoff = self.base_backoff
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+supervisor = TaskSupervisor()
+# gateway_lease is run by run_gateway() before the bot connects, not by the supervisor
+supervisor.register("jobs_lease", jobs_lease.run, role="jobs")
+
+@bot.command(name="taskstatus", description="Admin: Background task health.")
+@commands.has_permissions(administrator=True)
+async def taskstatus(ctx):
+    lines = []
+    for name, st in supervisor.stats.items():
+        task = supervisor.tasks.get(name)
+        state = "🟢 running" if task and not task.done() else ("⚪ done" if task else "⚫ not started")
+        last = f"<t:{int(st['last_run'].timestamp())}:R>" if st["last_run"] else "never"
+        took = f"{st['last_duration'] * 1000:.0f}ms" if st["last_duration"] is not None else "-"
+        line = f"**{name}** — {state} | runs {st['runs']} | last {last} ({took}) | restarts {max(0, st['starts'] - 1)}"
+        if st["last_error"]: line += f"\n{E_ERROR} `{st['last_error'][:120]}`"
+        lines.append(line)
+    leases = " | ".join(f"{l.name}: {'👑 leader' if l.is_leader else '💤 standby'}" for l in (gateway_lease, jobs_lease))
+    mode = "workers handle offloaded jobs" if JOB_WORKERS else "all jobs in this process"
+    await ctx.send(embed=create_embed(f"{E_ADMIN} Background Tasks", f"**Instance:** `{INSTANCE_ID}` ({leases})\n**Mode:** {mode}\n\n" + "\n".join(lines), 0x3498db))
+
+# ==========================================================
+# ⏰ PERSISTENT JOB SCHEDULER (scheduled_jobs collection)
+# ==========================================================
+
+class JobScheduler:
+    """Sleeps until the next due job in `scheduled_jobs`, claims it atomically and runs its handler."""
+    def __init__(self, retry_delay=60, max_attempts=5, poll_interval=30, stale_after=300):
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval # Catches jobs scheduled by other processes when change streams aren't available
+        self.stale_after = stale_after     # A running job not heartbeated for this long lost its worker
+        self.handlers = {} # kind -> async fn(job)
+        self.gateway_kinds = set() # Kinds whose handler needs the gateway cache (never run on a worker)
+        self.seeders = {}  # kind -> fn that enqueues pre-existing work once at startup
+        self.heap = []     # (due_at, job_id) for every pending job we know about
+        self.wakeup = asyncio.Event()
+        self.follower = None # Task feeding the heap from the change stream
+        self.executing = {}  # job_id -> task, heartbeated while it runs and cancelled with the scheduler
+        self.runs = 0
+
+    def handler(self, kind, seed=None, gateway=False):
+        """Decorator: registers the coroutine that runs jobs of this kind."""
+        def decorator(fn):
+            self.handlers[kind] = fn
+            if gateway: self.gateway_kinds.add(kind)
+            if seed: self.seeders[kind] = seed
+            return fn
+        return decorator
+
+    def kinds(self):
+        """Job kinds this process claims: gateway kinds stay on the bot, the rest go to workers if there are any."""
+        if WORKER_MODE: return [k for k in self.handlers if k not in self.gateway_kinds]
+        if JOB_WORKERS: return list(self.gateway_kinds)
+        return list(self.handlers)
+
+    def schedule(self, kind, key, due_at, payload=None, earliest=False):
+        """Creates or moves the (kind, key) job. Call this when the underlying event happens.
+        earliest=True only ever pulls an existing job forward (for sweep jobs fed by many writers).
+        It never touches a running job: that one gets a rerun_at instead, acted on when it finishes."""
+        if db is None: return
+        if earliest:
+            try:
+                job = scheduled_jobs_col.find_one_and_update(
+                    {"kind": kind, "key": str(key), "status": {"$ne": "running"}},
+                    {"$min": {"due_at": due_at}, "$set": {"status": "pending"}, "$setOnInsert": {"payload": payload or {}, "attempts": 0}},
+                    upsert=True, return_document=ReturnDocument.AFTER
+                )
+            except DuplicateKeyError:
+                # Running right now; flipping it to pending would start a second run over the same data
+                if scheduled_jobs_col.update_one({"kind": kind, "key": str(key), "status": "running"}, {"$min": {"rerun_at": due_at}}).matched_count: return
+                return self.schedule(kind, key, due_at, payload, earliest) # It finished in between
+        else:
+            job = scheduled_jobs_col.find_one_and_update(
+                {"kind": kind, "key": str(key)},
+                {"$set": {"due_at": due_at, "payload": payload or {}, "status": "pending", "attempts": 0}},
+                upsert=True, return_document=ReturnDocument.AFTER
+            )
+            if job.get("rerun_at"):
+                # A handler re-scheduling itself after a wake-up arrived mid-run keeps the earlier time
+                scheduled_jobs_col.update_one({"_id": job["_id"], "status": "pending"}, {"$min": {"due_at": job["rerun_at"]}, "$unset": {"rerun_at": ""}})
+                job["due_at"] = min(job["due_at"], job["rerun_at"])
+        self._push(job["due_at"], job["_id"])
+
+    def seed(self, kind, items):
+        """Bulk-enqueues (key, due_at, payload) tuples without moving jobs that already exist."""
+        if db is None or not items: return
+        scheduled_jobs_col.bulk_write([
+            UpdateOne({"kind": kind, "key": str(key)},
+                      {"$setOnInsert": {"due_at": due_at, "payload": payload or {}, "status": "pending", "attempts": 0}},
+                      upsert=True)
+            for key, due_at, payload in items
+        ], ordered=False)
+
+    def cancel(self, kind, key=None):
+        if db is None: return
+        query = {"kind": kind}
+        if key is not None: query["key"] = str(key)
+        scheduled_jobs_col.delete_many(query) # Stale heap entries fail their claim harmlessly
+
+    def _load(self, kinds):
+        for job in scheduled_jobs_col.find({"status": "pending", "kind": {"$in": kinds}}, {"due_at": 1}):
+            heapq.heappush(self.heap, (job["due_at"], job["_id"]))
+
+    def _follow(self, kinds):
+        """Opens a change stream on pending jobs of our kinds so other processes' schedule() calls wake us.
+        Returns False where there are no change streams (standalone mongod), and the caller polls instead."""
+        try:
+            stream = scheduled_jobs_col.watch([{"$match": {
+                "operationType": {"$in": ["insert", "update", "replace"]},
+                "fullDocument.status": "pending", "fullDocument.kind": {"$in": kinds}
+            }}], full_document="updateLookup")
+        except Exception: return False
+        self.follower = bot.loop.create_task(self._pump(stream))
+        return True
+
+    async def _pump(self, stream):
+        """Pushes each job the stream reports onto the heap. The stream blocks server-side between events."""
+        loop = asyncio.get_running_loop()
+        def follow():
+            for change in stream:
+                doc = change.get("fullDocument")
+                if doc: loop.call_soon_threadsafe(self._push, doc["due_at"], doc["_id"])
+        try: await asyncio.to_thread(follow)
+        except Exception as e: print(f"[Scheduler] Change stream closed: {e}")
+        finally:
+            stream.close()
+            self.wakeup.set() # Let run() notice and fall back to polling
+
+    def _sweep(self, kinds):
+        """Heartbeats the jobs we are running (claimed_at doubles as the heartbeat) and takes back any
+        running job whose worker stopped heartbeating."""
+        now = datetime.now()
+        if self.executing:
+            scheduled_jobs_col.update_many({"_id": {"$in": list(self.executing)}, "status": "running", "claimed_by": INSTANCE_ID}, {"$set": {"claimed_at": now}})
+        stale = now - timedelta(seconds=self.stale_after)
+        for job in scheduled_jobs_col.find({"status": "running", "kind": {"$in": kinds}, "claimed_at": {"$lte": stale}}, {"due_at": 1, "claimed_at": 1}):
+            if scheduled_jobs_col.update_one({"_id": job["_id"], "status": "running", "claimed_at": job["claimed_at"]}, {"$set": {"status": "pending"}}).modified_count:
+                print(f"[Scheduler] Re-queued job {job['_id']} from a worker that stopped heartbeating.")
+                self._push(job["due_at"], job["_id"])
+
+    def _pull_earliest(self, kinds):
+        """One indexed lookup: picks up a job another process scheduled ahead of our next wake-up (polling fallback)."""
+        job = scheduled_jobs_col.find_one({"status": "pending", "kind": {"$in": kinds}}, {"due_at": 1}, sort=[("status", 1), ("due_at", 1)])
+        if job and (not self.heap or job["due_at"] < self.heap[0][0]):
+            heapq.heappush(self.heap, (job["due_at"], job["_id"]))
+
+    def _push(self, due_at, job_id):
+        heapq.heappush(self.heap, (due_at, job_id))
+        self.wakeup.set()
+
+    async def run(self):
+        await ready_for_jobs()
+        if db is None: return
+        kinds = self.kinds()
+
+        # Jobs whose worker died mid-run go back to pending, then load the whole backlog in one query.
+        # Gateway kinds only ever run under the gateway lease, so whatever the previous leader had running
+        # of those is orphaned. Every other kind may still be running on a live worker: those only come
+        # back once their heartbeat stops.
+        self.heap, self.follower = [], None
+        exclusive = [k for k in kinds if k in self.gateway_kinds]
+        stale = datetime.now() - timedelta(seconds=self.stale_after)
+        requeued = scheduled_jobs_col.update_many(
+            {"status": "running", "claimed_by": {"$ne": INSTANCE_ID}, "$or": [
+                {"kind": {"$in": exclusive}},
+                {"kind": {"$in": kinds}, "claimed_at": {"$lte": stale}},
+            ]},
+            {"$set": {"status": "pending"}}
+        ).modified_count
+        if requeued: print(f"[Scheduler] Re-queued {requeued} jobs left running by a previous instance.")
+        for kind in kinds:
+            if kind not in self.seeders: continue
+            try: self.seeders[kind]()
+            except Exception as e: print(f"[Scheduler] Seeding {kind} failed: {e}")
+        # Stream first, then the backlog, so a job scheduled in between can't slip through
+        following = self._follow(kinds)
+        if not following: print(f"[Scheduler] Change streams unavailable, polling every {self.poll_interval}s for jobs from other processes.")
+        self._load(kinds)
+        print(f"[Scheduler] Loaded {len(self.heap)} pending jobs ({', '.join(kinds)}).")
+
+        next_sweep = datetime.now()
+        try:
+            while not bot.is_closed():
+                self.wakeup.clear()
+                if following and self.follower.done(): following = False # Dropped (failover); poll until it reopens
+                if datetime.now() >= next_sweep:
+                    self._sweep(kinds)
+                    next_sweep = datetime.now() + timedelta(seconds=self.stale_after / 3)
+                delay = (self.heap[0][0] - datetime.now()).total_seconds() if self.heap else None
+                if delay is None or delay > 0:
+                    # With a change stream there is nothing to poll: sleep until the next job, sweep or wake-up
+                    timeout = (next_sweep - datetime.now()).total_seconds()
+                    if delay is not None: timeout = min(timeout, delay)
+                    if not following: timeout = min(timeout, self.poll_interval)
+                    try: await asyncio.wait_for(self.wakeup.wait(), timeout=max(timeout, 0))
+                    except asyncio.TimeoutError:
+                        if following: continue
+                        self._pull_earliest(kinds)
+                        if self.follower is not None and self._follow(kinds):
+                            following = True
+                            self._load(kinds) # Whatever was scheduled while the stream was down
+                    continue
+
+                due_at, job_id = self.heap[0]
+
+                heapq.heappop(self.heap)
+                # Atomic claim; fails if the job was cancelled, moved later or taken already
+                job = scheduled_jobs_col.find_one_and_update(
+                    {"_id": job_id, "status": "pending", "kind": {"$in": kinds}, "due_at": {"$lte": datetime.now()}},
+                    {"$set": {"status": "running", "claimed_at": datetime.now(), "claimed_by": INSTANCE_ID}},
+                    return_document=ReturnDocument.AFTER
+                )
+                if job: self.executing[job["_id"]] = bot.loop.create_task(self._execute(job))
+        finally:
+            if self.follower: self.follower.cancel()
+            # Lost the lease or shutting down: stop our handlers so a new leader never runs a job twice
+            for task in list(self.executing.values()): task.cancel()
+
+    async def _execute(self, job):
+        fn = self.handlers.get(job["kind"])
+        try:
+            if fn is None: print(f"[Scheduler] No handler for job kind '{job['kind']}'")
+            else: await fn(job)
+            self.runs += 1
+        except asyncio.CancelledError:
+            # Hand the job back right away, unless the next leader already took it
+            scheduled_jobs_col.update_one({"_id": job["_id"], "status": "running", "claimed_by": INSTANCE_ID}, {"$set": {"status": "pending"}})
+            raise
+        except (discord.NotFound, discord.Forbidden) as e:
+            # The channel or message is gone or off-limits: retrying can't fix that, and keeping the job
+            # as failed stops its seeder from re-creating it on every boot
+            print(f"[Scheduler] Job {job['kind']}:{job['key']} failed for good: {e}")
+            scheduled_jobs_col.update_one({"_id": job["_id"], "status": "running"}, {"$set": {"status": "failed", "error": str(e)}, "$unset": {"rerun_at": ""}})
+            return
+        except Exception as e:
+            print(f"[Scheduler] Job {job['kind']}:{job['key']} failed: {e}")
+            if job.get("attempts", 0) + 1 < self.max_attempts:
+                retry_at = datetime.now() + timedelta(seconds=self.retry_delay)
+                scheduled_jobs_col.update_one({"_id": job["_id"], "status": "running"}, {"$set": {"status": "pending", "due_at": retry_at}, "$unset": {"rerun_at": ""}, "$inc": {"attempts": 1}})
+                return self._push(retry_at, job["_id"])
+        finally:
+            self.executing.pop(job["_id"], None)
+
+        # Finished, unless the handler re-scheduled its own (kind, key), which flips it back to pending
+        self._finish(job["_id"])
+
+    def _finish(self, job_id):
+        """Deletes a finished job, or puts it back to pending if a wake-up set rerun_at while it ran."""
+        while True:
+            if scheduled_jobs_col.delete_one({"_id": job_id, "status": "running", "rerun_at": {"$exists": False}}).deleted_count: return
+            job = scheduled_jobs_col.find_one({"_id": job_id, "status": "running"}, {"rerun_at": 1})
+            if not job: return
+            rerun_at = job["rerun_at"]
+            if scheduled_jobs_col.update_one({"_id": job_id, "status": "running", "rerun_at": rerun_at}, {"$set": {"status": "pending", "due_at": rerun_at}, "$unset": {"rerun_at": ""}}).modified_count:
+                return self._push(rerun_at, job_id)
+
+job_scheduler = JobScheduler()
+# Gateway schedulers are one-at-a-time; worker schedulers all drain the queue in parallel (claims are atomic)
+supervisor.register("job_scheduler", job_scheduler.run, lease=None if WORKER_MODE else gateway_lease, role="both") # PC claims, club tax, login/AI/event reminders, auction clock, giveaways
+
 class HumanInt(commands.Converter):
     async def convert(self, ctx, argument):
         try:
@@ -325,6 +980,7 @@ class DepositModal(discord.ui.Modal, title="Deposit Pokécoins"):
             "listed_at": None
         }
         deposits_col.insert_one(new_deposit)
+        deposit_matcher.add(new_deposit)
 
         await interaction.response.send_message(embed=create_embed("Deposit Queued", f"{E_SUCCESS} Deposit request for **{pc_amount:,} PC** queued (ID: `{dep_id}`).\n\nPlease wait in your DMs for the Market ID.", 0x2ecc71), ephemeral=True)
 
@@ -370,6 +1026,43 @@ class AuctionVoteView(discord.ui.View):
         self.yes_votes.discard(interaction.user.id)
         await interaction.response.send_message(f"{E_ERROR} Vote cast: NO", ephemeral=True)
         
+AUCTION_BLOCK_SIZE = 25
+AUCTION_MAX_PER_USER = 2
+
+class RegistrationGate:
+    """Admission counters for the registration window, kept in memory so a rush costs one insert per entry.
+    Each entry reserves a numbered block slot and user slot; the queue's unique indexes on those make
+    the insert itself the atomic check, so even a stale counter can't over-admit."""
+    def __init__(self, capacity=AUCTION_BLOCK_SIZE, per_user=AUCTION_MAX_PER_USER):
+        self.capacity = capacity
+        self.per_user = per_user
+        self.taken = set()  # Block slots in use
+        self.users = {}     # user_id -> user slots in use
+        self.entries = set() # (user_id, pokemon_id) already registered
+
+    def open(self):
+        """Seeds from one aggregate over the queue (non-empty when a registration window is resumed)."""
+        self.taken, self.users, self.entries = set(), {}, set()
+        rows = auction_queue_col.aggregate([{"$group": {"_id": "$user_id", "slots": {"$push": "$slot"}, "user_slots": {"$push": "$user_slot"}, "pokemon": {"$push": "$pokemon_id"}}}])
+        for row in rows:
+            self.taken.update(row["slots"])
+            self.users[row["_id"]] = set(row["user_slots"])
+            self.entries.update((row["_id"], p) for p in row["pokemon"])
+
+    def reserve(self, user_id, pokemon_id):
+        """(slot, user_slot), or None if the block is full, the user is at their limit or already entered this Pokémon."""
+        used = self.users.get(user_id, set())
+        if (user_id, pokemon_id) in self.entries or len(used) >= self.per_user: return None
+        slot = next((n for n in range(1, self.capacity + 1) if n not in self.taken), None)
+        if slot is None: return None
+        user_slot = next(k for k in range(self.per_user) if k not in used)
+        self.taken.add(slot)
+        self.users.setdefault(user_id, set()).add(user_slot)
+        self.entries.add((user_id, pokemon_id))
+        return slot, user_slot
+
+registration_gate = RegistrationGate()
+
 @bot.listen('on_message')
 async def auction_registration_scanner(message):
     # Ignore bots
@@ -395,108 +1088,314 @@ async def auction_registration_scanner(message):
             pokemon_id = match.group(1)
             user_id = message.author.id
 
-            # 1. Check Server Limit (Max 25 total)
-            total_entries = auction_queue_col.count_documents({})
-            if total_entries >= 25:
-                return # Block is full, silently ignore
-            
-            # 2. Check User Limit (Max 2 per user)
-            user_entries = auction_queue_col.count_documents({"user_id": user_id})
-            if user_entries >= 2:
-                return # User hit their limit, silently ignore
+            # 1. Block size, per-user limit and repeats, all checked in memory
+            reserved = registration_gate.reserve(user_id, pokemon_id)
+            if not reserved:
+                return # Block is full or user hit their limit, silently ignore
+            slot, user_slot = reserved
 
-            # 3. Success! Generate a permanent, unique ID (e.g., AUC-X7B9K)
+            # 2. Success! Generate a permanent, unique ID (e.g., AUC-X7B9K)
             unique_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
             auc_id = f"AUC-{unique_code}"
             
-            auction_queue_col.insert_one({
-                "auction_id": auc_id,
-                "pokemon_id": pokemon_id,
-                "user_id": user_id,
-                "status": "queued"
-            })
+            try:
+                auction_queue_col.insert_one({
+                    "auction_id": auc_id,
+                    "pokemon_id": pokemon_id,
+                    "user_id": user_id,
+                    "status": "queued",
+                    "slot": slot,
+                    "user_slot": user_slot
+                })
+            except DuplicateKeyError:
+                registration_gate.open() # Counters were out of step with the queue; resync and drop this attempt
             
-async def run_live_auction(bot, guild):
-    bidding_channel = guild.get_channel(1483860258932916336)
-    disputes_channel = guild.get_channel(1483860590907883580)
-    seller_role = guild.get_role(1483871103473553498)
-    
-    # Get all queued auctions
-    queue = list(auction_queue_col.find({"status": "queued"}))
-    total_slots = len(queue)
-    
-    if total_slots == 0:
-        return await bidding_channel.send(embed=create_embed("Auction Canceled", f"{E_ERROR} No Pokémon were registered today!", 0xff0000))
+# --- SLOT MESSAGE TRACKING (replaces channel.purge between slots) ---
+live_auction_tracked = {} # channel_id -> set of message IDs posted since the last cleanup
+
+@bot.listen('on_message')
+async def live_auction_message_tracker(message):
+    tracked = live_auction_tracked.get(message.channel.id)
+    if tracked is not None:
+        tracked.add(message.id)
+
+@bot.listen('on_raw_message_delete')
+async def live_auction_message_untracker(payload):
+    tracked = live_auction_tracked.get(payload.channel_id)
+    if tracked is not None:
+        tracked.discard(payload.message_id) # e.g. delete_after denial replies
+
+async def delete_tracked_messages(channel):
+    """Bulk deletes everything recorded for this channel, no history fetch needed."""
+    ids = list(live_auction_tracked.get(channel.id, ()))
+    live_auction_tracked[channel.id] = set()
+    for i in range(0, len(ids), 100): # Discord caps bulk delete at 100 per call
+        chunk = [discord.Object(id=mid) for mid in ids[i:i+100]]
+        try: await channel.delete_messages(chunk)
+        except discord.HTTPException as e: print(f"[Live Auction] Bulk delete failed: {e}")
+
+# --- LIVE SESSION STATE (lets a restart resume the event mid-slot) ---
+class LiveSessionWriter:
+    """In-memory copy of the live auction session doc (or, with a prefix, one room inside it).
+    Bids go through update() and are written at most once per `interval`; phase changes use
+    commit(), which writes straight through together with anything still pending."""
+    def __init__(self, session_id, state=None, interval=2.0, prefix=""):
+        self.session_id = session_id
+        self.state = dict(state or {})
+        self.interval = interval
+        self.prefix = prefix
+        self.dirty = set()
+        self.task = None
+        self.writes = 0
+
+    def update(self, **fields):
+        self.state.update(fields)
+        self.dirty.update(fields)
+        if self.task is None or self.task.done():
+            self.task = bot.loop.create_task(self._flush_later())
+
+    def commit(self, **fields):
+        self.state.update(fields)
+        self.dirty.update(fields)
+        if self.task and not self.task.done(): self.task.cancel()
+        self._write()
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
+        self._write()
+
+    def _write(self):
+        if not self.dirty or db is None: return
+        fields = {self.prefix + k: self.state[k] for k in self.dirty}
+        self.dirty = set()
+        try:
+            live_sessions_col.update_one({"_id": self.session_id}, {"$set": fields}, upsert=True)
+            self.writes += 1
+        except Exception as e:
+            print(f"[Live Auction] Session write failed: {e}")
+
+def seconds_until(when):
+    return max(0.0, (when - datetime.now()).total_seconds()) if when else 0.0
+
+class LiveWalletHolds:
+    """PC each bidder has committed across rooms: standing high bids plus won lots still in escrow.
+    A bid only counts the wallet minus what is held elsewhere, so nobody can lead three rooms on one balance."""
+    def __init__(self):
+        self.holds = {} # user_id -> {room channel id or auction id: amount}
+
+    def set(self, user_id, key, amount):
+        self.holds.setdefault(int(user_id), {})[key] = amount
+
+    def release(self, user_id, key):
+        if user_id is None: return
+        held = self.holds.get(int(user_id))
+        if held is None: return
+        held.pop(key, None)
+        if not held: self.holds.pop(int(user_id), None)
 
-    await bidding_channel.send(embed=create_embed("Live Auction Starting", f"{E_SUCCESS} The floor is open! We have **{total_slots}** Pokémon on the block today.", 0x2ecc71))
+    def release_key(self, key):
+        """Drops every bidder's hold under one room or auction."""
+        for user_id in [u for u, held in self.holds.items() if key in held]: self.release(user_id, key)
 
-    for index, item in enumerate(queue):
+    def committed(self, user_id, exclude=None):
+        return sum(amount for key, amount in self.holds.get(int(user_id), {}).items() if key != exclude)
+
+live_holds = LiveWalletHolds()
+live_rooms = {} # bidding channel id -> AuctionRoom while an event is running
+
+@bot.listen('on_message')
+async def live_auction_bid_router(message):
+    """One listener for every room instead of a wait_for check per room per message."""
+    room = live_rooms.get(message.channel.id)
+    if room and not message.author.bot: room.inbox.put_nowait(message)
+
+ROOM_STATS = ("lots", "sold", "unsold", "skipped", "bids", "volume")
+
+def live_min_bid(current):
+    return max(int(current * 1.025), current + 1)
+
+class AuctionRoom:
+    """One bidding channel of a live event. Rooms pull lots from the shared queue and run them side by side."""
+    def __init__(self, guild, channel, event, state=None):
+        self.guild = guild
+        self.channel = channel
+        self.event = event
+        self.session = LiveSessionWriter(event.session_id, state=state, prefix=f"rooms.{channel.id}.")
+        self.stats = {k: 0 for k in ROOM_STATS}
+        self.stats.update(self.session.state.get("stats") or {})
+        self.inbox = asyncio.Queue() # Routed messages; None is a wake-up after a new max bid
+        self.proxies = ProxyBook()
+        self.seller_id = None
+        self.disputes_channel = guild.get_channel(1483860590907883580)
+        self.seller_role = guild.get_role(1483871103473553498)
+
+    def free_pc(self, user_id):
+        """Wallet PC minus leading bids in other rooms and unpaid wins."""
+        user_wallet = get_wallet(user_id)
+        return (user_wallet.get("pc", 0) if user_wallet else 0) - live_holds.committed(user_id, exclude=self.channel.id)
+
+    def drain(self):
+        while not self.inbox.empty(): self.inbox.get_nowait()
+
+    async def next_message(self, deadline, check):
+        """Next routed message passing `check`; asyncio.TimeoutError once the deadline passes."""
+        while True:
+            msg = await asyncio.wait_for(self.inbox.get(), timeout=seconds_until(deadline))
+            if check(msg): return msg
+
+    def claim(self):
+        """Our own interrupted lot first, else the oldest queued lot whose seller isn't on stage in another room."""
+        lot = auction_queue_col.find_one({"status": "live", "room": self.channel.id})
+        if lot: return lot
+        busy = [r.seller_id for r in live_rooms.values() if r is not self and r.seller_id is not None]
+        return auction_queue_col.find_one_and_update(
+            {"status": "queued", "user_id": {"$nin": busy}},
+            {"$set": {"status": "live", "room": self.channel.id}},
+            sort=[("_id", 1)], return_document=ReturnDocument.AFTER
+        )
+
+    async def run(self, total_slots):
+        live_rooms[self.channel.id] = self
+        # Start recording every message in the bidding channel (bot + bidders)
+        live_auction_tracked[self.channel.id] = set()
+        try:
+            while True:
+                item = self.claim()
+                if not item:
+                    if not auction_queue_col.find_one({"status": "queued"}, {"_id": 1}): break
+                    await asyncio.sleep(5) # Only lots whose seller is busy in another room are left
+                    continue
+                self.seller_id = item["user_id"]
+                seller = self.guild.get_member(item["user_id"])
+                resumed = self.session.state.get("auction_id") == item["auction_id"]
+                if not resumed:
+                    slot = auction_queue_col.count_documents({"status": {"$ne": "queued"}})
+                    self.session.commit(auction_id=item["auction_id"], slot=slot, phase="summon", high_bid=None, min_increment=0, deadline=None)
+                
+                result = await self.run_lot(item, self.session.state["slot"], total_slots, resumed)
+                self.proxies.clear(item["auction_id"])
+                auction_queue_col.update_one({"_id": item["_id"]}, {"$set": {"status": result}})
+                self.stats["lots"] += 1
+                self.stats[result] += 1
+                self.session.commit(auction_id=None, phase=None, high_bid=None, deadline=None, stats=self.stats)
+                self.seller_id = None
+
+               # ==========================================
+                # 6. CLEANUP & LOCKDOWN BETWEEN AUCTIONS
+                # ==========================================
+                # Instantly lock the channel so no one can spam late bids
+                await self.channel.set_permissions(self.guild.default_role, send_messages=False)
+
+                # Clean up the seller role
+                if seller: await seller.remove_roles(self.seller_role)
+                
+                # Bulk delete the slot's tracked messages to keep the premium clean look
+                await delete_tracked_messages(self.channel)
+                
+                # Send the lock embed AFTER the cleanup so it doesn't get deleted
+                lock_desc = f"{E_ALERT} The floor is temporarily locked while we process this transaction and prepare the next slot..."
+                await self.channel.send(embed=create_embed("🔒 Bidding Paused", lock_desc, 0xe74c3c))
+                
+                # Wait 5 seconds before looping to the next Pokémon
+                await asyncio.sleep(5)
+        finally:
+            live_rooms.pop(self.channel.id, None)
+            live_auction_tracked.pop(self.channel.id, None)
+
+    async def escrow(self, auc_id, seller_id, buyer_id, price, pokemon_id, bid_transcript):
+        try:
+            await create_escrow_thread(bot, self.guild, auc_id, seller_id, buyer_id, price, pokemon_id, bid_transcript)
+        finally:
+            live_holds.release(buyer_id, auc_id)
+
+    async def run_lot(self, item, slot, total_slots, resumed=False):
+        """Runs one slot from whatever phase the room's session says it is in. Returns the lot's final status."""
         auc_id = item["auction_id"]
         seller_id = item["user_id"]
         pokemon_id = item["pokemon_id"]
-        seller = guild.get_member(seller_id)
+        seller = self.guild.get_member(seller_id)
+        bidding_channel = self.channel
+        session = self.session
+        phase = session.state.get("phase") or "summon"
 
         # --- PHASE 3A: THE SUMMON ---
-        if seller:
-            await seller.add_roles(seller_role)
-        
-        summon_desc = (
-            f"**SELLER:** <@{seller_id}>\n\n"
-            f"You are up! Please spawn your registered Pokémon for the server to review.\n"
-            f"**Command:** `<@716390085896962058> i {pokemon_id}`\n\n"
-            f"*(You have 90 seconds to do this, or your slot will be skipped and you will be fined 2,000 PC!)*"
-        )
-        await bidding_channel.send(content=f"<@{seller_id}>", embed=create_embed(f"{E_ALERT} AUCTION QUEUE: SLOT {index+1}/{total_slots} (ID: {auc_id})", summon_desc, 0x3498db))
-        
-        # Wait for the seller to type the info command
-        def check_info(m):
-            return m.author.id == seller_id and m.channel.id == bidding_channel.id and f"i {pokemon_id}" in m.content.lower()
+        if phase == "summon":
+            if seller:
+                await seller.add_roles(self.seller_role)
+            
+            summon_desc = (
+                f"**SELLER:** <@{seller_id}>\n\n"
+                f"You are up! Please spawn your registered Pokémon for the server to review.\n"
+                f"**Command:** `<@716390085896962058> i {pokemon_id}`\n\n"
+                f"*(You have 90 seconds to do this, or your slot will be skipped and you will be fined 2,000 PC!)*"
+            )
+            self.drain()
+            await bidding_channel.send(content=f"<@{seller_id}>", embed=create_embed(f"{E_ALERT} AUCTION QUEUE: SLOT {slot}/{total_slots} (ID: {auc_id})", summon_desc, 0x3498db))
+            
+            # Wait for the seller to type the info command
+            def check_info(m):
+                return m is not None and m.author.id == seller_id and f"i {pokemon_id}" in m.content.lower()
 
-        try:
-            info_msg = await bot.wait_for('message', timeout=90.0, check=check_info)
-        except asyncio.TimeoutError:
-            # Trap 1: AFK Seller Penalty
-            await bidding_channel.send(embed=create_embed("Dispute Triggered", f"{E_ERROR} Seller failed to info in 90s. Slot skipped.", 0xff0000))
-            if seller: await seller.remove_roles(seller_role)
-            wallets_col.update_one({"user_id": str(seller_id)}, {"$inc": {"pc": -2000}}, upsert=True)
-            await disputes_channel.send(embed=create_embed(f"{E_ERROR} DISPUTE LOG: AFK SELLER", f"**User:** <@{seller_id}>\n**ID:** {auc_id}\n**Penalty:** 2,000 PC deducted.", 0xff0000))
-            continue
+            try:
+                info_msg = await self.next_message(datetime.now() + timedelta(seconds=90), check_info)
+            except asyncio.TimeoutError:
+                # Trap 1: AFK Seller Penalty
+                await bidding_channel.send(embed=create_embed("Dispute Triggered", f"{E_ERROR} Seller failed to info in 90s. Slot skipped.", 0xff0000))
+                if seller: await seller.remove_roles(self.seller_role)
+                wallets_col.update_one({"user_id": str(seller_id)}, {"$inc": {"pc": -2000}}, upsert=True)
+                await self.disputes_channel.send(embed=create_embed(f"{E_ERROR} DISPUTE LOG: AFK SELLER", f"**User:** <@{seller_id}>\n**ID:** {auc_id}\n**Penalty:** 2,000 PC deducted.", 0xff0000))
+                return "skipped"
 
-        await asyncio.sleep(2)
+            await asyncio.sleep(2)
+            phase = "vote"
+            session.commit(phase=phase)
 
         # --- PHASE 3B: QUALITY CONTROL VOTE ---
-        await bidding_channel.set_permissions(guild.default_role, send_messages=False)
-        vote_view = AuctionVoteView()
-        
-        vote_desc = (
-            f"{E_ALERT} **To ensure maximum quality, the community must verify this Pokémon.**\n\n"
-            f"Please review the Pokémon above. Is this worth auctioning?\n"
-            f"*(You have 15 seconds to vote.)*"
-        )
-        vote_msg = await bidding_channel.send(embed=create_embed(f"{E_ALERT} VOTING PHASE - {auc_id}", vote_desc, 0xe67e22), view=vote_view)
-        
-        await vote_view.wait()
-        
-        yes_count = len(vote_view.yes_votes)
-        no_count = len(vote_view.no_votes)
-        
-        if no_count > yes_count:
-            # Trap 2: Trash Registration Penalty
-            await bidding_channel.send(embed=create_embed("Vote Failed", f"{E_ERROR} Community rejected this Pokémon. Slot skipped.", 0xff0000))
-            if seller: await seller.remove_roles(seller_role)
-            wallets_col.update_one({"user_id": str(seller_id)}, {"$inc": {"pc": -2000}}, upsert=True)
-            await disputes_channel.send(embed=create_embed(f"{E_ERROR} DISPUTE LOG: FAILED VOTE", f"**User:** <@{seller_id}>\n**ID:** {auc_id}\n**Votes:** {yes_count} Yes / {no_count} No\n**Penalty:** 2,000 PC deducted.", 0xff0000))
-            continue
-
-        # --- PHASE 3C: THE BIDDING WAR ---
-        await bidding_channel.set_permissions(guild.default_role, send_messages=True)
-        await bidding_channel.send(embed=create_embed("Vote Passed!", f"{E_SUCCESS} The floor is open! Start placing your bids (e.g., `10k`, `1m`).", 0x2ecc71))
-
-        current_bid = 0
-        highest_bidder = None
-        min_increment = 0
+        if phase == "vote":
+            await bidding_channel.set_permissions(self.guild.default_role, send_messages=False)
+            vote_view = AuctionVoteView()
+            
+            vote_desc = (
+                f"{E_ALERT} **To ensure maximum quality, the community must verify this Pokémon.**\n\n"
+                f"Please review the Pokémon above. Is this worth auctioning?\n"
+                f"*(You have 15 seconds to vote.)*"
+            )
+            vote_msg = await bidding_channel.send(embed=create_embed(f"{E_ALERT} VOTING PHASE - {auc_id}", vote_desc, 0xe67e22), view=vote_view)
+            
+            await vote_view.wait()
+            
+            yes_count = len(vote_view.yes_votes)
+            no_count = len(vote_view.no_votes)
+            
+            if no_count > yes_count:
+                # Trap 2: Trash Registration Penalty
+                await bidding_channel.send(embed=create_embed("Vote Failed", f"{E_ERROR} Community rejected this Pokémon. Slot skipped.", 0xff0000))
+                if seller: await seller.remove_roles(self.seller_role)
+                wallets_col.update_one({"user_id": str(seller_id)}, {"$inc": {"pc": -2000}}, upsert=True)
+                await self.disputes_channel.send(embed=create_embed(f"{E_ERROR} DISPUTE LOG: FAILED VOTE", f"**User:** <@{seller_id}>\n**ID:** {auc_id}\n**Votes:** {yes_count} Yes / {no_count} No\n**Penalty:** 2,000 PC deducted.", 0xff0000))
+                return "skipped"
+
+            # --- PHASE 3C: THE BIDDING WAR ---
+            self.drain()
+            await bidding_channel.set_permissions(self.guild.default_role, send_messages=True)
+            await bidding_channel.send(embed=create_embed("Vote Passed!", f"{E_SUCCESS} The floor is open! Start placing your bids (e.g., `10k`, `1m`).", 0x2ecc71))
+            phase = "bidding"
+            session.commit(phase=phase, deadline=datetime.now() + timedelta(seconds=30))
+
+        high_bid = session.state.get("high_bid") or {}
+        current_bid = high_bid.get("amount", 0)
+        highest_bidder = high_bid.get("bidder")
+        min_increment = session.state.get("min_increment", 0)
         tracker_msg = None
 
+        if phase in ("bidding", "going") and resumed:
+            # Back from a restart: give the floor a short window before the clock can close the lot
+            session.commit(deadline=max(session.state.get("deadline") or datetime.now(), datetime.now() + timedelta(seconds=15)))
+            await bidding_channel.set_permissions(self.guild.default_role, send_messages=True)
+            resume_desc = f"{E_ALERT} The bot restarted mid-slot. Bidding on **{auc_id}** picks up where it left off."
+            if current_bid: resume_desc += f"\n\n{E_MONEY} **HIGHEST BID:** {current_bid:,} PC (<@{highest_bidder}>)\n{E_ALERT} **Next Minimum Bid:** `{min_increment:,} PC`"
+            await bidding_channel.send(embed=create_embed("Auction Resumed", resume_desc, 0x3498db))
+
         # 1. NEW HELPER: Reads the bid cleanly
         def get_bid_value(msg_content):
             content = msg_content.lower().replace(",", "").replace("$", "").strip()
@@ -507,7 +1406,8 @@ async def run_live_auction(bot, guild):
 
         # 2. FIXED CHECK BID (No more __slots__ crashes!)
         def check_bid(m):
-            if m.channel.id != bidding_channel.id or m.author.bot or m.author.id == seller_id:
+            if m is None: return True # A max bid was registered; let the proxies answer
+            if m.author.id == seller_id:
                 return False
                 
             try:
@@ -520,105 +1420,180 @@ async def run_live_auction(bot, guild):
                 bot.loop.create_task(m.reply(f"{E_ALERT} Denied: Your bid must be at least **{min_increment:,} PC**.", delete_after=5))
                 return False
 
-            user_wallet = get_wallet(m.author.id) 
-            pc_balance = user_wallet.get("pc", 0) if user_wallet else 0
+            free = self.free_pc(m.author.id) # Leading bids in other rooms + unpaid wins are held back
             
-            if pc_balance < bid_amount:
+            if free < bid_amount:
                 bot.loop.create_task(m.add_reaction(E_MONEY))
-                bot.loop.create_task(m.reply(f"{E_ALERT} Denied: You only have **{pc_balance:,} PC**.", delete_after=5))
+                held = live_holds.committed(m.author.id, exclude=self.channel.id)
+                held_note = f" ({held:,} PC is held by your bids in other rooms)" if held else ""
+                bot.loop.create_task(m.reply(f"{E_ALERT} Denied: You only have **{free:,} PC** free{held_note}.", delete_after=5))
                 return False 
                 
             return True
         
-        # 3. FIXED BIDDING LOOP
-        bidding_active = True
-        while bidding_active:
+        # 3. BIDDING LOOP: the session deadline is the clock, so a resumed slot keeps its timing
+        while phase in ("bidding", "going"):
             try:
-                bid_msg = await bot.wait_for('message', timeout=30.0, check=check_bid)
+                bid_msg = await self.next_message(session.state["deadline"], check_bid)
+                previous_leader = highest_bidder
                 
-                # Recalculate the amount here safely!
-                current_bid = get_bid_value(bid_msg.content)
-                highest_bidder = bid_msg.author.id
-                min_increment = int(current_bid * 1.025)
+                if bid_msg is not None:
+                    # Recalculate the amount here safely!
+                    live_holds.release(highest_bidder, self.channel.id)
+                    current_bid = get_bid_value(bid_msg.content)
+                    highest_bidder = bid_msg.author.id
+                    live_holds.set(highest_bidder, self.channel.id, current_bid)
+                    self.stats["bids"] += 1
+                    auction_stats_col.update_one({"user_id": highest_bidder}, {"$inc": {"bids_made": 1}}, upsert=True)
+                    await update_quest(highest_bidder, "auc_bid", 1)
+                    await bid_msg.add_reaction(E_SUCCESS)
 
-                auction_stats_col.update_one({"user_id": highest_bidder}, {"$inc": {"bids_made": 1}}, upsert=True)
-                await update_quest(highest_bidder, "auc_bid", 1)
+                # Registered max bids fight it out in memory; only the end state reaches the channel
+                answer = self.proxies.resolve(auc_id, current_bid, highest_bidder, live_min_bid, self.free_pc)
+                if answer:
+                    live_holds.release(highest_bidder, self.channel.id)
+                    highest_bidder, current_bid = answer
+                    live_holds.set(highest_bidder, self.channel.id, current_bid)
+                    self.stats["bids"] += 1
+                elif bid_msg is None:
+                    continue # The new max doesn't beat the standing bid, so nothing changes
                 
-                await bid_msg.add_reaction(E_SUCCESS)
+                min_increment = live_min_bid(current_bid)
+                phase = "bidding"
+                
+                # Coalesced: a burst of bids costs one session write
+                session.update(phase=phase, high_bid={"bidder": highest_bidder, "amount": current_bid}, min_increment=min_increment, deadline=datetime.now() + timedelta(seconds=30), stats=self.stats)
+                if answer and highest_bidder != previous_leader:
+                    await bidding_channel.send(embed=create_embed(f"{E_AUCTION} Max Bid Leads", f"<@{highest_bidder}> takes the lead at **{current_bid:,} PC** (auto-bid).", 0x3498db))
                 
-                if tracker_msg:
-                    try: await tracker_msg.delete()
-                    except: pass
-                    
                 track_desc = f"{E_MONEY} **HIGHEST BID:** {current_bid:,} PC (<@{highest_bidder}>)\n\n{E_ALERT} **Next Minimum Bid:** `{min_increment:,} PC` *(+2.5%)*"
-                tracker_msg = await bidding_channel.send(embed=create_embed("Live Bid Tracker", track_desc, 0x3498db))
+                track_embed = create_embed("Live Bid Tracker", track_desc, 0x3498db)
+                
+                # Edit the tracker in place (rate-limited) instead of delete + resend
+                if tracker_msg: tracker_editor.queue(tracker_msg, embed=track_embed)
+                else: tracker_msg = await bidding_channel.send(embed=track_embed)
                 
             except asyncio.TimeoutError:
                 if current_bid == 0:
                     await bidding_channel.send(embed=create_embed("No Bids", f"{E_ALERT} No one bid on {auc_id}. Moving to next slot.", 0x95a5a6))
                     auction_history_col.insert_one({"auction_id": auc_id, "seller_id": seller_id, "buyer_id": "None", "pokemon_id": pokemon_id, "final_price": 0, "status": "Unsold", "dispute_reason": "No bids.", "log_url": "None"})
-                    bidding_active = False
-                    break
-                    
-                warn_desc = f"**<@{highest_bidder}>** holds the highest bid at **{current_bid:,} PC**!\nIf no higher bids are placed in the next **15 seconds**, the auction will close!"
-                await bidding_channel.send(embed=create_embed(f"{E_ALERT} GOING ONCE...", warn_desc, 0xe67e22))
+                    return "unsold"
                 
-                try:
-                    bid_msg = await bot.wait_for('message', timeout=15.0, check=check_bid)
-                    # Recalculate here too!
-                    current_bid = get_bid_value(bid_msg.content)
-                    highest_bidder = bid_msg.author.id
-                    min_increment = int(current_bid * 1.025)
-                    
-                    await bid_msg.add_reaction(E_SUCCESS)
-                    
-                    if tracker_msg:
-                        try: await tracker_msg.delete()
-                        except: pass
-                        
-                    track_desc = f"{E_MONEY} **HIGHEST BID:** {current_bid:,} PC (<@{highest_bidder}>)\n\n{E_ALERT} **Next Minimum Bid:** `{min_increment:,} PC` *(+2.5%)*"
-                    tracker_msg = await bidding_channel.send(embed=create_embed("Live Bid Tracker", track_desc, 0x3498db))
+                if phase == "bidding":
+                    phase = "going"
+                    session.commit(phase=phase, deadline=datetime.now() + timedelta(seconds=15))
+                    warn_desc = f"**<@{highest_bidder}>** holds the highest bid at **{current_bid:,} PC**!\nIf no higher bids are placed in the next **15 seconds**, the auction will close!"
+                    await bidding_channel.send(embed=create_embed(f"{E_ALERT} GOING ONCE...", warn_desc, 0xe67e22))
+                    continue
                     
-                except asyncio.TimeoutError:
-                    await bidding_channel.send(embed=create_embed(f"{E_SUCCESS} SOLD!", f"Congratulations to <@{highest_bidder}> for winning **{auc_id}** for **{current_bid:,} PC**!", 0x2ecc71))
-                    bidding_active = False
-                    
-                    # ==========================================
-                    # NEW: GENERATE BIDDING TRANSCRIPT BEFORE PURGE
-                    # ==========================================
-                    bid_html = None
-                    try:
-                        bid_html = await chat_exporter.export(bidding_channel, bot=bot)
-                    except Exception as e:
-                        print(f"[ERROR] Could not export bidding chat: {e}")
-                    
-                    # ==========================================
-                    # NEW: LAUNCH ESCROW IN THE BACKGROUND
-                    # ==========================================
-                    # Using create_task means the bot WON'T wait. It will instantly 
-                    # move to Phase 6, purge the chat, and start the next Pokémon!
-                    bot.loop.create_task(create_escrow_thread(bot, guild, auc_id, seller_id, highest_bidder, current_bid, pokemon_id, bid_html))
-
-       # ==========================================
-        # 6. CLEANUP & LOCKDOWN BETWEEN AUCTIONS
-        # ==========================================
-        # Instantly lock the channel so no one can spam late bids
-        await bidding_channel.set_permissions(guild.default_role, send_messages=False)
-
-        # Clean up the seller role
-        if seller: await seller.remove_roles(seller_role)
-        
-        # Purge the chat to keep the premium clean look
-        await bidding_channel.purge(limit=100)
-        
-        # Send the lock embed AFTER the purge so it doesn't get deleted
-        lock_desc = f"{E_ALERT} The floor is temporarily locked while we process this transaction and prepare the next slot..."
-        await bidding_channel.send(embed=create_embed("🔒 Bidding Paused", lock_desc, 0xe74c3c))
-        
-        # Wait 5 seconds before looping to the next Pokémon
-        await asyncio.sleep(5)
-
-async def create_escrow_thread(bot, guild, auc_id, seller_id, buyer_id, final_price, pokemon_id, bid_html):
+                # Make sure the final price is on the tracker before the transcript is taken
+                if tracker_msg: await tracker_editor.flush(tracker_msg)
+                await bidding_channel.send(embed=create_embed(f"{E_SUCCESS} SOLD!", f"Congratulations to <@{highest_bidder}> for winning **{auc_id}** for **{current_bid:,} PC**!", 0x2ecc71))
+                phase = "sold"
+                self.stats["volume"] += current_bid
+                session.commit(phase=phase, stats=self.stats)
+
+        if phase == "sold":
+            # ==========================================
+            # NEW: GENERATE BIDDING TRANSCRIPT BEFORE PURGE
+            # ==========================================
+            bid_transcript = await transcripts.export(bidding_channel, f"Bidding_{auc_id}")
+            
+            # ==========================================
+            # NEW: LAUNCH ESCROW IN THE BACKGROUND
+            # ==========================================
+            # Mark the lot sold first so a restart never opens a second escrow for it.
+            # The winner's hold moves from this room to the escrow until the PC is taken.
+            auction_queue_col.update_one({"_id": item["_id"]}, {"$set": {"status": "sold"}})
+            live_holds.release(highest_bidder, self.channel.id)
+            live_holds.set(highest_bidder, auc_id, current_bid)
+            bot.loop.create_task(self.escrow(auc_id, seller_id, highest_bidder, current_bid, pokemon_id, bid_transcript))
+        return "sold"
+
+async def run_live_auction(bot, guild, session):
+    channels = [guild.get_channel(cid) for cid in LIVE_AUCTION_ROOMS]
+    room_state = session.state.get("rooms") or {}
+    rooms = [AuctionRoom(guild, ch, session, room_state.get(str(ch.id))) for ch in channels if ch]
+    if not rooms:
+        session.commit(status="done", ended_at=datetime.now())
+        return print("[AUCTION ERROR] No live auction rooms found!")
+    main_channel = rooms[0].channel
+
+    # A lot left on stage in a room that is no longer configured goes back in line
+    auction_queue_col.update_many({"status": "live", "room": {"$nin": [r.channel.id for r in rooms]}}, {"$set": {"status": "queued"}})
+    total_slots = auction_queue_col.count_documents({})
+    
+    if total_slots == 0:
+        session.commit(status="done", ended_at=datetime.now())
+        return await main_channel.send(embed=create_embed("Auction Canceled", f"{E_ERROR} No Pokémon were registered today!", 0xff0000))
+
+    # Holds are in memory only; rebuild the standing high bids of resumed rooms
+    for room in rooms:
+        hb = room.session.state.get("high_bid")
+        if hb and hb.get("bidder"): live_holds.set(hb["bidder"], room.channel.id, hb["amount"])
+
+    if not session.state.get("opened"):
+        session.commit(opened=True)
+        where = f" across **{len(rooms)}** rooms ({', '.join(r.channel.mention for r in rooms)})" if len(rooms) > 1 else ""
+        await main_channel.send(embed=create_embed("Live Auction Starting", f"{E_SUCCESS} The floor is open! We have **{total_slots}** Pokémon on the block today{where}.", 0x2ecc71))
+
+    failed = []
+    async def run_room(room):
+        # One room crashing must not take the others down or leave its bidders' PC held
+        try: await room.run(total_slots)
+        except Exception as e:
+            failed.append(room)
+            print(f"[AUCTION ERROR] Room {room.channel.id} stopped: {e}")
+            # Its lot goes back in line for a room that still works, unless the sale was already decided
+            # (that one stays on stage for the resume to hand to escrow)
+            if room.session.state.get("phase") != "sold":
+                auction_queue_col.update_many({"status": "live", "room": room.channel.id}, {"$set": {"status": "queued"}, "$unset": {"room": ""}})
+                room.session.commit(auction_id=None, phase=None, high_bid=None, deadline=None)
+        finally:
+            live_holds.release_key(room.channel.id)
+
+    active = rooms
+    while active:
+        await asyncio.gather(*(run_room(room) for room in active))
+        # Surviving rooms may have emptied the queue before a failed room's lot came back
+        active = [r for r in rooms if r not in failed] if auction_queue_col.find_one({"status": "queued"}, {"_id": 1}) else []
+
+    # Aggregate the rooms into one event summary
+    totals = {k: sum(r.stats[k] for r in rooms) for k in ROOM_STATS}
+    stranded = auction_queue_col.count_documents({"status": {"$in": ["queued", "live"]}})
+    if stranded:
+        # Every room is down or a decided sale never reached escrow: keep the session open so the next start resumes it
+        session.commit(totals=totals, failed_rooms=[r.channel.id for r in failed])
+        print(f"[AUCTION ERROR] {stranded} lots left with no working room; the session resumes on the next start.")
+        return await main_channel.send(embed=create_embed("Live Auction Paused", f"{E_ALERT} The auction hit an error in {', '.join(r.channel.mention for r in failed)}. The remaining **{stranded}** lot(s) continue when the bot restarts.", 0xe67e22))
+    session.commit(status="done", ended_at=datetime.now(), totals=totals, failed_rooms=[r.channel.id for r in failed])
+    minutes = int((datetime.now() - session.state.get("started_at", datetime.now())).total_seconds() // 60)
+    desc = (
+        f"{E_SUCCESS} **Sold:** {totals['sold']} | **Unsold:** {totals['unsold']} | **Skipped:** {totals['skipped']}\n"
+        f"{E_MONEY} **Volume:** {totals['volume']:,} PC over {totals['bids']:,} bids\n"
+        f"{E_TIMER} **Duration:** {minutes} min in {len(rooms)} room(s)"
+    )
+    if len(rooms) > 1:
+        desc += "\n\n" + "\n".join(f"{r.channel.mention}: {r.stats['lots']} lots, {r.stats['volume']:,} PC" for r in rooms)
+    if failed:
+        desc += f"\n\n{E_ALERT} Stopped early: {', '.join(r.channel.mention for r in failed)} (their lot was run in another room)"
+    await main_channel.send(embed=create_embed("Live Auction Complete", desc, 0x3498db))
+
+@bot.hybrid_command(name="livemax", aliases=["lmax"], description="Privately set a max bid on the Pokémon up in this room.")
+async def livemax(ctx, amount: HumanInt):
+    room = live_rooms.get(ctx.channel.id)
+    state = room.session.state if room else {}
+    if not room or state.get("phase") not in ("bidding", "going"):
+        return await reply_privately(ctx, create_embed("Error", f"{E_ERROR} No lot is open for bidding in this channel.", 0xff0000))
+    if ctx.author.id == room.seller_id:
+        return await reply_privately(ctx, create_embed("Error", f"{E_ERROR} You can't bid on your own Pokémon.", 0xff0000))
+    if room.free_pc(ctx.author.id) < amount:
+        return await reply_privately(ctx, create_embed("Error", f"{E_ERROR} You only have **{room.free_pc(ctx.author.id):,} PC** free.", 0xff0000))
+    room.proxies.set(state["auction_id"], ctx.author.id, amount)
+    room.inbox.put_nowait(None) # Wake the bidding loop so the max answers right away
+    await reply_privately(ctx, create_embed(f"{E_SUCCESS} Max Bid Set", f"The bot will bid for you on **{state['auction_id']}** up to **{amount:,} PC**, one minimum step at a time.", 0x2ecc71))
+
+async def create_escrow_thread(bot, guild, auc_id, seller_id, buyer_id, final_price, pokemon_id, bid_transcript):
     bidding_channel = guild.get_channel(1483860258932916336)
     accept_logs = guild.get_channel(1483860540840214629)
     disputes_logs = guild.get_channel(1483860590907883580)
@@ -705,50 +1680,49 @@ async def create_escrow_thread(bot, guild, auc_id, seller_id, buyer_id, final_pr
             break
 
     # ==========================================
-    # 4. GENERATE ESCROW HTML
+    # 4. GENERATE ESCROW TRANSCRIPT (bounded exporter, gzip copy on disk)
     # ==========================================
-    escrow_html = None
-    try:
-        escrow_html = await chat_exporter.export(thread, bot=bot)
-    except Exception as e:
-        print(f"[TRANSCRIPT ERROR] Could not generate Escrow HTML for {auc_id}. Error: {e}")
+    escrow_transcript = await transcripts.export(thread, f"Escrow_{auc_id}")
+    transcript_hashes = {t["name"]: t["sha256"] for t in (bid_transcript, escrow_transcript) if t}
 
     # ==========================================
-    # 5. RESOLUTION & MULTI-FILE ATTACHMENT
+    # 5. RESOLUTION (transcripts are attached to the log message in the background)
     # ==========================================
-    # Package up whatever files successfully generated
-    files_to_send = []
-    if bid_html: files_to_send.append(discord.File(io.BytesIO(bid_html.encode('utf-8')), filename=f"Bidding_{auc_id}.html"))
-    if escrow_html: files_to_send.append(discord.File(io.BytesIO(escrow_html.encode('utf-8')), filename=f"Escrow_{auc_id}.html"))
-
+    log_msg = None
     try:
         if dispute_triggered:
             dispute_embed = create_embed(f"{E_ERROR} DISPUTE LOG", f"**User:** <@{offender_id}>\n**ID:** {auc_id}\n**Reason:** {dispute_reason}", 0xff0000)
-            log_msg = await disputes_logs.send(embed=dispute_embed, files=files_to_send)
+            log_msg = await disputes_logs.send(embed=dispute_embed)
             
             await thread.send(embed=create_embed("Dispute Triggered", f"{E_ERROR} Trade failed: {dispute_reason}. Thread locking.", 0xff0000))
-            wallets_col.update_one({"user_id": str(offender_id)}, {"$inc": {"pc": -2000}}, upsert=True)
-            auction_stats_col.update_one({"user_id": offender_id}, {"$inc": {"disputes_caused": 1, "penalties_paid": 2000}}, upsert=True)
-            auction_history_col.insert_one({"auction_id": auc_id, "seller_id": seller_id, "buyer_id": buyer_id, "pokemon_id": pokemon_id, "status": "Disputed", "dispute_reason": dispute_reason, "log_url": log_msg.jump_url if log_msg else "None"})
+            Settlement(f"escrow dispute {auc_id}") \
+                .update(wallets_col, {"user_id": str(offender_id)}, {"$inc": {"pc": -2000}}, upsert=True) \
+                .update(auction_stats_col, {"user_id": offender_id}, {"$inc": {"disputes_caused": 1, "penalties_paid": 2000}}, upsert=True) \
+                .insert(auction_history_col, {"auction_id": auc_id, "seller_id": seller_id, "buyer_id": buyer_id, "pokemon_id": pokemon_id, "status": "Disputed", "dispute_reason": dispute_reason, "log_url": log_msg.jump_url if log_msg else "None", "transcripts": transcript_hashes}) \
+                .commit()
             
         else:
             success_embed = create_embed(f"🧾 RECEIPT: {auc_id}", f"**Seller:** <@{seller_id}>\n**Buyer:** <@{buyer_id}>\n**Price:** {final_price:,} PC", 0x2ecc71)
-            log_msg = await accept_logs.send(embed=success_embed, files=files_to_send)
+            log_msg = await accept_logs.send(embed=success_embed)
             
             await thread.send(embed=create_embed("Trade Confirmed", f"{E_SUCCESS} Ze Bot successfully transferred {final_price:,} PC!", 0x2ecc71))
-            wallets_col.update_one({"user_id": str(buyer_id)}, {"$inc": {"pc": -final_price}})
-            wallets_col.update_one({"user_id": str(seller_id)}, {"$inc": {"pc": final_price}}, upsert=True)
-            auction_stats_col.update_one({"user_id": buyer_id}, {"$inc": {"pc_spent": final_price, "auctions_won": 1}}, upsert=True)
-            auction_stats_col.update_one({"user_id": seller_id}, {"$inc": {"pc_earned": final_price, "confirmed_trades": 1, "pokemon_registered": 1}}, upsert=True)
-            auction_history_col.insert_one({"auction_id": auc_id, "seller_id": seller_id, "buyer_id": buyer_id, "pokemon_id": pokemon_id, "final_price": final_price, "status": "Confirmed", "log_url": log_msg.jump_url if log_msg else "None"})
-
-        # Attach UI Buttons based on the URLs of the uploaded files
+            Settlement(f"escrow {auc_id}") \
+                .update(wallets_col, {"user_id": str(buyer_id)}, {"$inc": {"pc": -final_price}}) \
+                .update(wallets_col, {"user_id": str(seller_id)}, {"$inc": {"pc": final_price}}, upsert=True) \
+                .update(auction_stats_col, {"user_id": buyer_id}, {"$inc": {"pc_spent": final_price, "auctions_won": 1}}, upsert=True) \
+                .update(auction_stats_col, {"user_id": seller_id}, {"$inc": {"pc_earned": final_price, "confirmed_trades": 1, "pokemon_registered": 1}}, upsert=True) \
+                .insert(auction_history_col, {"auction_id": auc_id, "seller_id": seller_id, "buyer_id": buyer_id, "pokemon_id": pokemon_id, "final_price": final_price, "status": "Confirmed", "log_url": log_msg.jump_url if log_msg else "None", "transcripts": transcript_hashes}) \
+                .commit()
+
+        # Upload the transcripts, then add UI Buttons based on the URLs of the uploaded files
         if log_msg:
-            bid_url, esc_url = None, None
-            for attachment in log_msg.attachments:
-                if attachment.filename.startswith("Bidding"): bid_url = attachment.url
-                if attachment.filename.startswith("Escrow"): esc_url = attachment.url
-            await log_msg.edit(view=TranscriptView(bid_url, esc_url))
+            def transcript_buttons(attachments):
+                bid_url, esc_url = None, None
+                for attachment in attachments:
+                    if attachment.filename.startswith("Bidding"): bid_url = attachment.url
+                    if attachment.filename.startswith("Escrow"): esc_url = attachment.url
+                return TranscriptView(bid_url, esc_url)
+            transcripts.attach(log_msg, [bid_transcript, escrow_transcript], transcript_buttons)
 
     except Exception as e:
         print(f"[FATAL LOGGING ERROR] Error during resolution phase: {e}")
@@ -759,51 +1733,47 @@ async def create_escrow_thread(bot, guild, auc_id, seller_id, buyer_id, final_pr
     await asyncio.sleep(3) # Give Discord a second to process
     await thread.edit(archived=True, locked=True)
         
-async def execute_auction_protocol(bot):
-    guild = bot.guilds[0]
+async def execute_auction_protocol(bot, session=None):
+    guild = bot.get_guild(session.state["guild_id"]) if session else bot.guilds[0]
     info_channel = guild.get_channel(1483860096415961188)
     reg_channel = guild.get_channel(1483860214854844476)
     
     if not info_channel or not reg_channel:
         return print("[AUCTION ERROR] Channels not found!")
 
-    # 0. PREP: Wipe the old queue from yesterday so we start fresh!
-    auction_queue_col.delete_many({})
-
-    # 1. THE ANNOUNCEMENT
-    desc = (
-        f"Welcome to the Ze Bot Premium Auction! The automated protocol has been engaged.\n\n"
-        f"{E_SUCCESS} **1. Registration**\n"
-        f"Want to sell a Pokémon? Click the button below to head to <#1483860214854844476>. "
-        f"The gates are locked, but will open in exactly **90 Seconds**!\n\n"
-        f"{E_ALERT} **2. Live Bidding**\n"
-        f"Once registered, all bidding happens in <#1483860258932916336>.\n\n"
-        f"{E_MONEY} **3. Bank Check**\n"
-        f"Ensure you have used `.depositpc`! You cannot bid what you don't have."
-    )
-    await info_channel.send(content="<@&1442917733422465024>")
-    await info_channel.send(embed=create_embed(f"{E_ALERT} THE POKÉMON AUCTION IS STARTING!", desc, 0xe67e22), view=AuctionInfoView(guild.id))
+    if session is None:
+        if live_sessions_col.find_one({"status": {"$ne": "done"}, "started_at": {"$gte": datetime.now() - timedelta(hours=12)}}, {"_id": 1}):
+            return print("[AUCTION] A live auction is already running, skipping this start.")
+        
+        # 0. PREP: Wipe the old queue from yesterday so we start fresh!
+        auction_queue_col.delete_many({})
+        session = LiveSessionWriter(f"live-{datetime.now():%Y%m%d-%H%M%S}")
+        session.commit(status="announce", guild_id=guild.id, started_at=datetime.now(), announce_ends_at=datetime.now() + timedelta(seconds=90))
+        await announce_auction_protocol(guild, info_channel)
 
     # 2. WAIT 90 SECONDS
-    await asyncio.sleep(90)
+    await asyncio.sleep(seconds_until(session.state["announce_ends_at"]))
 
     # 3. UNLOCK GATES & TURN SCANNER ON
+    registration_gate.open()
     bot.registration_active = True
     await reg_channel.set_permissions(guild.default_role, send_messages=True)
     
-    reg_desc = (
-        f"The gates are unlocked! You have exactly **5 Minutes** to submit your Pokémon.\n\n"
-        f"**How to submit:**\n"
-        f"Ping PokéTwo and type `i` followed by your Pokémon's ID.\n"
-        f"*Example:* `<@716390085896962058> i 2132`\n\n"
-        f"{E_ALERT} **The Rules:**\n"
-        f"▫️ Max **2 Pokémon** per user.\n"
-        f"▫️ The block only holds **25 Pokémon total**!"
-    )
-    await reg_channel.send(embed=create_embed(f"{E_SUCCESS} AUCTION REGISTRATION IS OPEN!", reg_desc, 0x2ecc71))
+    if session.state["status"] == "announce":
+        session.commit(status="registration", registration_ends_at=datetime.now() + timedelta(seconds=120))
+        reg_desc = (
+            f"The gates are unlocked! You have exactly **5 Minutes** to submit your Pokémon.\n\n"
+            f"**How to submit:**\n"
+            f"Ping PokéTwo and type `i` followed by your Pokémon's ID.\n"
+            f"*Example:* `<@716390085896962058> i 2132`\n\n"
+            f"{E_ALERT} **The Rules:**\n"
+            f"▫️ Max **{AUCTION_MAX_PER_USER} Pokémon** per user.\n"
+            f"▫️ The block only holds **{AUCTION_BLOCK_SIZE} Pokémon total**!"
+        )
+        await reg_channel.send(embed=create_embed(f"{E_SUCCESS} AUCTION REGISTRATION IS OPEN!", reg_desc, 0x2ecc71))
 
     # 4. WAIT 5 MINUTES FOR REGISTRATION
-    await asyncio.sleep(120)
+    await asyncio.sleep(seconds_until(session.state["registration_ends_at"]))
 
     # 5. LOCK GATES & TURN SCANNER OFF
     bot.registration_active = False
@@ -814,14 +1784,47 @@ async def execute_auction_protocol(bot):
     
     lock_desc = (
         f"The auction block is fully loaded and locked. No further entries will be accepted.\n\n"
-        f"📊 **Final Tally:** **{total_registered}/25** Pokémon successfully registered!\n\n"
+        f"📊 **Final Tally:** **{total_registered}/{AUCTION_BLOCK_SIZE}** Pokémon successfully registered!\n\n"
         f"The live bidding is about to begin. Grab your wallets and head to <#1483860258932916336>!"
     )
     await reg_channel.send(embed=create_embed(f"{E_ERROR} REGISTRATION CLOSED!", lock_desc, 0xff0000))
+    session.commit(status="bidding")
     # Phase 3: Start the Live Bidding Engine!
-    bot.loop.create_task(run_live_auction(bot, guild))
-    
-    # (Phase 3: The Live Bidding Summon will trigger right here!)
+    bot.loop.create_task(run_live_auction(bot, guild, session))
+
+async def announce_auction_protocol(guild, info_channel):
+    # 1. THE ANNOUNCEMENT
+    desc = (
+        f"Welcome to the Ze Bot Premium Auction! The automated protocol has been engaged.\n\n"
+        f"{E_SUCCESS} **1. Registration**\n"
+        f"Want to sell a Pokémon? Click the button below to head to <#1483860214854844476>. "
+        f"The gates are locked, but will open in exactly **90 Seconds**!\n\n"
+        f"{E_ALERT} **2. Live Bidding**\n"
+        f"Once registered, all bidding happens in <#1483860258932916336>.\n\n"
+        f"{E_MONEY} **3. Bank Check**\n"
+        f"Ensure you have used `.depositpc`! You cannot bid what you don't have."
+    )
+    await info_channel.send(content="<@&1442917733422465024>")
+    await info_channel.send(embed=create_embed(f"{E_ALERT} THE POKÉMON AUCTION IS STARTING!", desc, 0xe67e22), view=AuctionInfoView(guild.id))
+
+@supervisor.once("live_auction_resume", lease=gateway_lease)
+async def resume_live_auction():
+    """Picks an interrupted live auction back up at the phase its session doc recorded."""
+    await bot.wait_until_ready()
+    if db is None: return
+    # An event that was down for half a day is abandoned, not resumed
+    cutoff = datetime.now() - timedelta(hours=12)
+    live_sessions_col.update_many({"status": {"$ne": "done"}, "started_at": {"$lt": cutoff}}, {"$set": {"status": "done", "ended_at": datetime.now()}})
+    doc = live_sessions_col.find_one({"status": {"$ne": "done"}}, sort=[("started_at", -1)])
+    if not doc: return
+    guild = bot.get_guild(doc.get("guild_id"))
+    if not guild:
+        live_sessions_col.update_one({"_id": doc["_id"]}, {"$set": {"status": "done", "ended_at": datetime.now()}})
+        return
+    session = LiveSessionWriter(doc["_id"], state=doc)
+    print(f"[Live Auction] Resuming {doc['_id']} ({doc['status']}, slot {doc.get('slot')}, phase {doc.get('phase')}).")
+    if doc["status"] == "bidding": await run_live_auction(bot, guild, session)
+    else: await execute_auction_protocol(bot, session)
 
 # Helper to parse time strings
 def parse_time(time_str):
@@ -852,6 +1855,86 @@ class TranscriptView(discord.ui.View):
                 url=escrow_url,
                 emoji="🔗"
             ))
+
+TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", "transcripts")
+TRANSCRIPT_KEEP_DAYS = 14
+
+class TranscriptPipeline:
+    """Exports chat transcripts a few at a time, keeps a gzip copy on disk named by content hash,
+    and uploads them onto log messages in the background so the caller never waits on Discord."""
+    def __init__(self, max_exports=2, max_uploads=2, directory=TRANSCRIPT_DIR):
+        self.exports = asyncio.Semaphore(max_exports)
+        self.uploads = asyncio.Semaphore(max_uploads)
+        self.directory = directory
+        self.pending = set() # Upload tasks, kept referenced until done
+        self.exported = 0
+        self.failed = 0
+
+    async def export(self, channel, name):
+        """Renders the channel and stores it. Returns {name, path, sha256, size} or None."""
+        try:
+            async with self.exports:
+                html = await chat_exporter.export(channel, bot=bot)
+            if not html: return None
+            record = await asyncio.to_thread(self._store, name, html.encode("utf-8"))
+            self.exported += 1
+            return record
+        except Exception as e:
+            self.failed += 1
+            print(f"[TRANSCRIPT ERROR] Could not export {name}. Error: {e}")
+            return None
+
+    def _store(self, name, data):
+        digest = hashlib.sha256(data).hexdigest()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{name}-{digest[:16]}.html.gz")
+        if not os.path.exists(path): # Same content is already on disk
+            with open(path + ".tmp", "wb") as fh: fh.write(gzip.compress(data, compresslevel=6))
+            os.replace(path + ".tmp", path)
+        return {"name": name, "path": path, "sha256": digest, "size": len(data)}
+
+    def attach(self, message, records, view_for=None):
+        """Queues the stored transcripts for upload onto an already-sent message. Returns immediately."""
+        records = [r for r in records if r]
+        if not records: return
+        task = bot.loop.create_task(self._attach(message, records, view_for))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def _attach(self, message, records, view_for):
+        try:
+            async with self.uploads:
+                # Streamed straight from the gzip copy; the HTML is never held in memory again
+                handles, files = [], []
+                try:
+                    for r in records: handles.append(gzip.open(r["path"], "rb"))
+                    files = [discord.File(fp, filename=f"{r['name']}.html") for fp, r in zip(handles, records)]
+                    message = await message.edit(attachments=files)
+                finally:
+                    # discord.File stubs out close() on a handle it was given and only restores it in
+                    # File.close(), which never closes the handle itself
+                    for f in files: f.close()
+                    for fp in handles: fp.close()
+            if view_for: await message.edit(view=view_for(message.attachments))
+        except Exception as e:
+            print(f"[TRANSCRIPT ERROR] Upload to {message.jump_url} failed: {e}")
+
+transcripts = TranscriptPipeline()
+
+@supervisor.every("transcript_prune", 6 * 3600, delay_first=True)
+async def prune_transcripts():
+    """Drops local transcript copies older than TRANSCRIPT_KEEP_DAYS."""
+    def prune():
+        if not os.path.isdir(TRANSCRIPT_DIR): return 0
+        cutoff = time.time() - TRANSCRIPT_KEEP_DAYS * 86400
+        removed = 0
+        for entry in os.scandir(TRANSCRIPT_DIR):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        return removed
+    removed = await asyncio.to_thread(prune)
+    if removed: print(f"[Transcripts] Pruned {removed} old transcripts.")
             
 @bot.command(name="scheduleauctions", aliases=["sauc"], description="Schedule a Pokémon auction (e.g., 14:30 or 2:30 PM).")
 @commands.has_permissions(administrator=True)
@@ -867,6 +1950,7 @@ async def scheduleauctions(ctx, *, time_str: str):
         return await ctx.send(embed=create_embed("Duplicate", f"{E_ERROR} An auction is already scheduled for this time.", 0xff0000))
 
     auction_schedules_col.insert_one({"time": parsed_time})
+    job_scheduler.schedule("auction_clock", parsed_time, next_auction_run(parsed_time))
     
     # Build list of current schedules
     times = sorted([doc["time"] for doc in auction_schedules_col.find()])
@@ -883,6 +1967,7 @@ async def removescheduleauction(ctx, *, time_str: str):
     
     if result.deleted_count == 0:
         return await ctx.send(embed=create_embed("Not Found", f"{E_ERROR} No schedule found for that time.", 0xff0000))
+    job_scheduler.cancel("auction_clock", parsed_time)
         
     await ctx.send(embed=create_embed("Schedule Removed", f"{E_SUCCESS} Successfully removed the **{time_str}** auction slot.", 0x2ecc71))
 
@@ -896,21 +1981,30 @@ async def forcepokemonauction(ctx):
     bot.loop.create_task(execute_auction_protocol(bot))
 
 # ==========================================================
-# ⏰ THE AUTOMATED BACKGROUND CLOCK (Checks every 1 minute)
+# ⏰ THE AUTOMATED BACKGROUND CLOCK (One scheduled job per daily slot)
 # ==========================================================
-    
-@tasks.loop(minutes=1)
-async def auction_clock():
-    now_ist = datetime.now(IST).strftime("%H:%M")
-    
-    # Check if the exact current minute matches any saved schedule
-    if auction_schedules_col.find_one({"time": now_ist}):
-        print(f"[AUCTION] Scheduled time {now_ist} hit! Starting protocol...")
-        bot.loop.create_task(execute_auction_protocol(bot))
 
-@auction_clock.before_loop
-async def before_auction_clock():
-    await bot.wait_until_ready()
+def next_auction_run(hhmm):
+    """Next occurrence of an IST HH:MM slot, as a naive local datetime like the rest of the DB."""
+    now_ist = datetime.now(IST)
+    hour, minute = map(int, hhmm.split(":"))
+    run_at = now_ist.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run_at <= now_ist: run_at += timedelta(days=1)
+    return run_at.astimezone().replace(tzinfo=None)
+
+def seed_auction_clock_jobs():
+    job_scheduler.seed("auction_clock", [(d["time"], next_auction_run(d["time"]), None) for d in auction_schedules_col.find()])
+
+@job_scheduler.handler("auction_clock", seed=seed_auction_clock_jobs, gateway=True)
+async def auction_clock(job):
+    hhmm = job["key"]
+    if not auction_schedules_col.find_one({"time": hhmm}): return # Slot was removed
+    
+    # Only fire on time; a slot missed while the bot was offline just rolls to tomorrow
+    if (datetime.now() - job["due_at"]).total_seconds() < 120:
+        print(f"[AUCTION] Scheduled time {hhmm} hit! Starting protocol...")
+        bot.loop.create_task(execute_auction_protocol(bot))
+    job_scheduler.schedule("auction_clock", hhmm, next_auction_run(hhmm))
 
 # ==========================================================
 # 📊 AUCTION STATS & UTILITY COMMANDS
@@ -975,10 +2069,17 @@ async def auctionleaderboard(ctx):
 @bot.command(name="auctionstatus", aliases=["aucs"], description="Check the status of all current queued auctions.")
 async def auctionstatus(ctx):
     queue = list(auction_queue_col.find({"status": "queued"}))
-    if not queue:
+    if not queue and not live_rooms:
         return await ctx.send(embed=create_embed("Auction Status", f"{E_ERROR} The auction block is currently empty.", 0xff0000))
 
     desc = ""
+    for cid, room in live_rooms.items():
+        state = room.session.state
+        if not state.get("auction_id"): continue
+        hb = state.get("high_bid") or {}
+        bid = f"{hb['amount']:,} PC (<@{hb['bidder']}>)" if hb.get("bidder") else "no bids"
+        desc += f"{E_AUCTION} <#{cid}>: **{state['auction_id']}** ({state.get('phase')}, {bid})\n"
+    if desc: desc += "\n"
     for item in queue:
         desc += f"- **{item['auction_id']}**: <@{item['user_id']}> (Poké ID: {item['pokemon_id']})\n"
     
@@ -1146,6 +2247,7 @@ class PCWithdrawModal(discord.ui.Modal, title="PC Withdrawal Request"):
             "unlocks_at": unlocks_at,
             "alert_sent": False
         })
+        job_scheduler.schedule("pc_claim_ready", claim_id, unlocks_at)
         
         desc = (
             f"{E_GOLD_TICK} **Claim ID:** `{claim_id}`\n"
@@ -1163,33 +2265,31 @@ class PCWithdrawView(discord.ui.View):
     async def open_form(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.send_modal(PCWithdrawModal())
 
-async def pc_claim_alert_task():
-    """Background loop to alert admins when a user's PC claim timer ends."""
-    await bot.wait_until_ready()
-    channel = bot.get_channel(PC_APPROVAL_CHANNEL_ID)
+def seed_pc_claim_jobs():
+    """Enqueues claims that were pending before the scheduler existed."""
+    claims = db.pc_claims.find({"status": "PENDING", "alert_sent": False}, {"id": 1, "unlocks_at": 1})
+    job_scheduler.seed("pc_claim_ready", [(c["id"], c["unlocks_at"], None) for c in claims])
+
+@job_scheduler.handler("pc_claim_ready", seed=seed_pc_claim_jobs)
+async def pc_claim_ready_job(job):
+    """Alerts admins when a user's PC claim timer ends."""
+    channel = messageable(PC_APPROVAL_CHANNEL_ID)
+    claim = db.pc_claims.find_one({"id": job["key"], "status": "PENDING", "alert_sent": False})
+    if not claim: return
     
-    while not bot.is_closed():
-        if channel:
-            now = datetime.now()
-            # Find all pending claims where the timer has ended and no alert was sent
-            ready_claims = db.pc_claims.find({"status": "PENDING", "alert_sent": False, "unlocks_at": {"$lte": now}})
-            
-            for claim in ready_claims:
-                user = bot.get_user(int(claim['user_id']))
-                username = user.name if user else f"Unknown ({claim['user_id']})"
-                
-                desc = (
-                    f"{E_CROWN} **User:** <@{claim['user_id']}> ({username})\n"
-                    f"{E_PC} **Amount:** {claim['amount']:,}\n"
-                    f"{E_ITEMBOX} **Market ID:** {claim['market_id']}\n"
-                    f"{E_TIMER} **Requested:** <t:{int(claim['created_at'].timestamp())}:f>"
-                )
-                embed = create_embed(f"{E_ALERT} Claim Ready for Approval: {claim['id']}", desc, 0xf1c40f)
-                
-                await channel.send(content=f"<@&{PC_PING_ROLE_ID}>", embed=embed)
-                db.pc_claims.update_one({"_id": claim["_id"]}, {"$set": {"alert_sent": True}})
-                
-        await asyncio.sleep(60) # Check every 60 seconds
+    user = await user_resolver.resolve(claim['user_id'])
+    username = user.name if user else f"Unknown ({claim['user_id']})"
+    
+    desc = (
+        f"{E_CROWN} **User:** <@{claim['user_id']}> ({username})\n"
+        f"{E_PC} **Amount:** {claim['amount']:,}\n"
+        f"{E_ITEMBOX} **Market ID:** {claim['market_id']}\n"
+        f"{E_TIMER} **Requested:** <t:{int(claim['created_at'].timestamp())}:f>"
+    )
+    embed = create_embed(f"{E_ALERT} Claim Ready for Approval: {claim['id']}", desc, 0xf1c40f)
+    
+    await channel.send(content=f"<@&{PC_PING_ROLE_ID}>", embed=embed)
+    db.pc_claims.update_one({"_id": claim["_id"]}, {"$set": {"alert_sent": True}})
     
 async def update_casino_balance(user_id, amount: int, currency: str):
     """
@@ -1211,16 +2311,7 @@ async def log_casino_receipt(bot, match_id):
     if not match: 
         return
 
-    # 2. Setup the Log Channel (Uses your Global LOG_CHANNEL_ID)
-    channel = bot.get_channel(LOG_CHANNEL_ID)
-    if not channel:
-        try:
-            channel = await bot.fetch_channel(LOG_CHANNEL_ID)
-        except:
-            print(f"CRITICAL: Could not find Log Channel {LOG_CHANNEL_ID}")
-            return
-
-    # 3. Premium Emoji Mapping for the Log Header
+    # 2. Premium Emoji Mapping for the Log Header
     log_icons = {
         "high_low": E_DICE,
         "death_roll": E_DICE,
@@ -1229,7 +2320,7 @@ async def log_casino_receipt(bot, match_id):
     }
     current_icon = log_icons.get(match.get("game"), E_DICE)
     
-    # 4. Build the Premium Receipt Embed
+    # 3. Build the Premium Receipt Embed
     # Uses E_BOOK for the title and E_ARROW for list items
     desc = f"{current_icon} **Game:** {match['game'].replace('_', ' ').title()}\n"
     desc += f"{E_MONEY} **Currency:** {match['currency'].upper()}\n"
@@ -1252,7 +2343,87 @@ async def log_casino_receipt(bot, match_id):
     # Optional: Add the Match ID to the footer for easy reference
     embed.set_footer(text=f"Match ID: {match_id}")
     
-    await channel.send(embed=embed)
+    # 4. Batched into the Log Channel (Uses your Global LOG_CHANNEL_ID)
+    await log_publisher.publish(LOG_CHANNEL_ID, embed)
+
+# ==========================================================
+# 🎞️ MESSAGE EDIT COALESCER (CASINO ANIMATIONS & BID TRACKER)
+# ==========================================================
+
+class MessageEditCoalescer:
+    """Keeps only the latest pending edit per message and writes it at a bounded rate."""
+    def __init__(self, min_interval=1.0, rate=10, per=1.0):
+        self.min_interval = min_interval # Seconds between two edits of the SAME message
+        self.rate, self.per = rate, per   # Shared budget across ALL messages (token bucket)
+        self.tokens = rate
+        self.updated = 0.0
+        self.pending = {}   # message_id -> (message, fields)
+        self.workers = {}   # message_id -> flush task
+        self.last_edit = {} # message_id -> loop time of last write
+        self.sent = 0
+        self.dropped = 0
+
+    def queue(self, message, **fields):
+        """Sets the desired state of a message. Unsent older frames are merged away."""
+        if fields.get("embed") is not None:
+            fields["embed"] = fields["embed"].copy() # Snapshot, callers keep mutating their embed
+
+        mid = message.id
+        if mid in self.pending:
+            self.dropped += 1
+            fields = {**self.pending[mid][1], **fields} # Keep e.g. view=None from the skipped frame
+        self.pending[mid] = (message, fields)
+
+        if mid not in self.workers:
+            self.workers[mid] = bot.loop.create_task(self._worker(mid))
+
+    async def flush(self, message):
+        """Waits until the latest queued state of a message has been written."""
+        task = self.workers.get(message.id)
+        if task: await task
+
+    async def edit(self, message, **fields):
+        """Queues a frame and waits for it (use for final results)."""
+        self.queue(message, **fields)
+        await self.flush(message)
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+
+    async def _worker(self, mid):
+        loop = asyncio.get_running_loop()
+        try:
+            while mid in self.pending:
+                wait = self.last_edit.get(mid, 0) + self.min_interval - loop.time()
+                if wait > 0: await asyncio.sleep(wait)
+                await self._acquire()
+
+                # Pop right before writing so frames queued while we waited get merged in
+                message, fields = self.pending.pop(mid)
+                try:
+                    await message.edit(**fields)
+                    self.sent += 1
+                except discord.NotFound:
+                    self.pending.pop(mid, None) # Message deleted, nothing left to animate
+                except discord.HTTPException as e:
+                    print(f"[EditCoalescer] Edit failed for {mid}: {e}")
+                self.last_edit[mid] = loop.time()
+        finally:
+            self.workers.pop(mid, None)
+            # Only timestamps still inside the spacing window matter
+            now = loop.time()
+            self.last_edit = {k: t for k, t in self.last_edit.items() if now - t < self.min_interval}
+
+casino_editor = MessageEditCoalescer()
+tracker_editor = MessageEditCoalescer() # Live auction bid tracker
 
 # ==========================================================
 # 🎰 THE HIGH ROLLER LOUNGE: LOBBY & HIGH/LOW ENGINE
@@ -1306,19 +2477,19 @@ class HighLowGameView(discord.ui.View):
         embed = discord.Embed(title="<a:rolling_dice:1485554520145662012> HIGH OR LOW: ROLLING PHASE", color=0xe67e22)
         embed.set_image(url=GIF_DICE)
         
-        # Using interaction.message.edit instead of response.edit_message because we deferred
-        await interaction.message.edit(embed=embed, view=None)
+        # Frames go through the coalescer (we deferred, and intermediate frames may be dropped)
+        casino_editor.queue(interaction.message, embed=embed, view=None)
         
         for res in results:
             # Suspense State
             embed.description = f"{E_ARROW} Target: **{target_str} NUMBERS WIN**\n\n{desc_rolls}<a:rolling_dice:1485554520145662012> **{res['player']['name']}** is rolling the dice..."
-            await interaction.message.edit(embed=embed)
+            casino_editor.queue(interaction.message, embed=embed)
             await asyncio.sleep(2) # 2 Second Suspense
             
             # Lock Result
             desc_rolls += f"{E_SUCCESS} **{res['player']['name']}** rolled a **{res['roll']}**!\n"
             embed.description = f"{E_ARROW} Target: **{target_str} NUMBERS WIN**\n\n{desc_rolls}"
-            await interaction.message.edit(embed=embed)
+            casino_editor.queue(interaction.message, embed=embed)
             await asyncio.sleep(1)
 
         # 4. Calculate Payouts (Dynamic Brackets)
@@ -1361,7 +2532,7 @@ class HighLowGameView(discord.ui.View):
         embed.title = f"{E_CROWN} HIGH OR LOW: FINAL RESULTS"
         embed.description = desc_payout
         embed.color = 0x2ecc71
-        await interaction.message.edit(embed=embed)
+        await casino_editor.edit(interaction.message, embed=embed)
         
         # Log to DB
         gamble_history_col.insert_one({
@@ -1395,7 +2566,7 @@ class DeathRollGameView(discord.ui.View):
         
         if current_p['is_bot']:
             self.clear_items()
-            if interaction.response.is_done(): await interaction.message.edit(embed=embed, view=self)
+            if interaction.response.is_done(): casino_editor.queue(interaction.message, embed=embed, view=self)
             else: await interaction.response.edit_message(embed=embed, view=self)
             await asyncio.sleep(2)
             await self.process_roll(interaction, current_p)
@@ -1407,7 +2578,7 @@ class DeathRollGameView(discord.ui.View):
                 await self.process_roll(i, current_p)
             btn.callback = roll_cb
             self.add_item(btn)
-            if interaction.response.is_done(): await interaction.message.edit(embed=embed, view=self)
+            if interaction.response.is_done(): casino_editor.queue(interaction.message, embed=embed, view=self)
             else: await interaction.response.edit_message(embed=embed, view=self)
 
     async def process_roll(self, interaction, player):
@@ -1423,7 +2594,7 @@ class DeathRollGameView(discord.ui.View):
 
         embed = discord.Embed(title="<a:rolling_dice:1485554520145662012> THE DEATH ROLL", description=f"{E_SUCCESS} **{player['name']}** rolled a **{roll:,}**!", color=0xe67e22)
         embed.set_image(url=GIF_DEATHROLL)
-        if interaction.response.is_done(): await interaction.message.edit(embed=embed, view=None)
+        if interaction.response.is_done(): casino_editor.queue(interaction.message, embed=embed, view=None)
         else: await interaction.response.edit_message(embed=embed, view=None)
         await asyncio.sleep(2)
 
@@ -1459,7 +2630,7 @@ class DeathRollGameView(discord.ui.View):
         
         embed = discord.Embed(title=f"{E_CROWN} DEATH ROLL: GAME OVER", description=desc, color=0x2ecc71)
         embed.set_image(url=GIF_DEATHROLL)
-        await interaction.message.edit(embed=embed, view=None)
+        await casino_editor.edit(interaction.message, embed=embed, view=None)
         
         gamble_history_col.insert_one({"match_id": self.match_id, "game": "death_roll", "currency": self.currency, "total_pot": self.pot, "timestamp": int(asyncio.get_event_loop().time()), "players": [p['id'] for p in self.players if not p['is_bot']], "results": db_results})
         await log_casino_receipt(bot, self.match_id)
@@ -1500,8 +2671,8 @@ async def run_slots_game(interaction, host, players, wager, currency, pot):
     embed = discord.Embed(title="<a:777_casino:1485553633784369183> SLOT PARLOR: LIVE SPINS", color=0xf1c40f)
     embed.set_image(url=GIF_SLOTS)
     
-    # Using interaction.message.edit because we deferred
-    await interaction.message.edit(embed=embed, view=None)
+    # Frames go through the coalescer because we deferred
+    casino_editor.queue(interaction.message, embed=embed, view=None)
 
     # Sequential Spin Animation
     for res in player_results:
@@ -1509,19 +2680,19 @@ async def run_slots_game(interaction, host, players, wager, currency, pot):
         name = res['player']['name']
         
         embed.description = f"{E_ARROW} **{name}** pulled the lever!\n\n<a:777_casino:1485553633784369183> **<a:777_casino:1485553633784369183> | <a:777_casino:1485553633784369183> | <a:777_casino:1485553633784369183>**"
-        await interaction.message.edit(embed=embed)
+        casino_editor.queue(interaction.message, embed=embed)
         await asyncio.sleep(1)
         
         embed.description = f"{E_ARROW} **{name}** pulled the lever!\n\n<a:777_casino:1485553633784369183> **[ {reels[0]} ] | <a:777_casino:1485553633784369183> | <a:777_casino:1485553633784369183>**"
-        await interaction.message.edit(embed=embed)
+        casino_editor.queue(interaction.message, embed=embed)
         await asyncio.sleep(1)
         
         embed.description = f"{E_ARROW} **{name}** pulled the lever!\n\n<a:777_casino:1485553633784369183> **[ {reels[0]} ] | [ {reels[1]} ] | <a:777_casino:1485553633784369183>**"
-        await interaction.message.edit(embed=embed)
+        casino_editor.queue(interaction.message, embed=embed)
         await asyncio.sleep(1)
         
         embed.description = f"{E_SUCCESS} **{name}** finished spinning:\n\n<a:777_casino:1485553633784369183> **[ {reels[0]} ] | [ {reels[1]} ] | [ {reels[2]} ]**"
-        await interaction.message.edit(embed=embed)
+        casino_editor.queue(interaction.message, embed=embed)
         await asyncio.sleep(1)
 
     # Payout Logic (Highest Tier Only to protect pot)
@@ -1559,7 +2730,7 @@ async def run_slots_game(interaction, host, players, wager, currency, pot):
     desc += f"{E_ITEMBOX} **House Cut:** {house_cut:,} {currency.upper()}"
     embed.title = f"{E_CROWN} SLOT PARLOR: FINAL RESULTS"
     embed.description = desc
-    await interaction.message.edit(embed=embed)
+    await casino_editor.edit(interaction.message, embed=embed)
     
     gamble_history_col.insert_one({"match_id": match_id, "game": "slots", "currency": currency, "total_pot": pot, "timestamp": int(asyncio.get_event_loop().time()), "players": [p['id'] for p in players if not p['is_bot']], "results": db_results})
     await log_casino_receipt(bot, match_id)
@@ -1661,7 +2832,7 @@ class RouletteBetView(discord.ui.View):
         embed = discord.Embed(title=f"{E_ROULETTE} ROULETTE: TRIPLE THREAT", description=desc, color=0x95a5a6)
         embed.set_image(url=GIF_ROULETTE)
         
-        if interaction.response.is_done(): await interaction.message.edit(embed=embed, view=self)
+        if interaction.response.is_done(): casino_editor.queue(interaction.message, embed=embed, view=self)
         else: await interaction.response.edit_message(embed=embed, view=self)
 
     async def spin_wheel(self, interaction):
@@ -1716,19 +2887,19 @@ class RouletteBetView(discord.ui.View):
         # ==========================================
         embed = discord.Embed(title=f"{E_ROULETTE} ROULETTE: BETS LOCKED", description=f"{E_ARROW} The dealer is spinning the wheel...", color=0xf1c40f)
         embed.set_image(url=GIF_ROULETTE)
-        await interaction.message.edit(embed=embed, view=None)
+        casino_editor.queue(interaction.message, embed=embed, view=None)
         await asyncio.sleep(2)
         
         embed.description = f"{E_ARROW} The ball drops onto Color: **{win_color}**!"
-        await interaction.message.edit(embed=embed)
+        casino_editor.queue(interaction.message, embed=embed)
         await asyncio.sleep(2)
 
         embed.description += f"\n{E_ARROW} It bounces into Slot Number: **{win_num}**!"
-        await interaction.message.edit(embed=embed)
+        casino_editor.queue(interaction.message, embed=embed)
         await asyncio.sleep(2)
 
         embed.description += f"\n{E_ARROW} The secret seal reveals Emoji: {win_emoji}!"
-        await interaction.message.edit(embed=embed)
+        casino_editor.queue(interaction.message, embed=embed)
         await asyncio.sleep(2)
         
         # ==========================================
@@ -1774,7 +2945,7 @@ class RouletteBetView(discord.ui.View):
         embed.title = f"{E_CROWN} ROULETTE: FINAL RESULTS"
         embed.description = desc
         embed.color = 0x2ecc71 if winners else 0xe74c3c
-        await interaction.message.edit(embed=embed)
+        await casino_editor.edit(interaction.message, embed=embed)
         
         # Log to DB
         gamble_history_col.insert_one({"match_id": self.match_id, "game": "roulette", "currency": self.currency, "total_pot": self.pot, "timestamp": int(asyncio.get_event_loop().time()), "players": [p['id'] for p in self.players if not p['is_bot']], "results": db_results})
@@ -2029,11 +3200,13 @@ class GambleLBSelect(discord.ui.Select):
         sort_key = "net_profit" if self.values[0] == "profit" else f"game_stats.{self.values[0]}.wins"
         top_players = list(gamble_profiles_col.find().sort(sort_key, -1).limit(10))
         
+        users = await user_resolver.resolve_many([p["user_id"] for p in top_players])
+        
         desc = f"{E_ARROW} Category: **{self.values[0].replace('_', ' ').title()}**\n\n"
         for i, p in enumerate(top_players, 1):
             val = p.get('net_profit', 0) if self.values[0] == "profit" else p.get('game_stats', {}).get(self.values[0], {}).get('wins', 0)
             sign = "+" if (self.values[0] == "profit" and val >= 0) else ""
-            user = bot.get_user(int(p["user_id"]))
+            user = users.get(int(p["user_id"]))
             name = user.display_name if user else f"User({p['user_id']})"
             desc += f"{E_ITEMBOX} **#{i}.** {name} - ({sign}{val:,})\n"
             
@@ -2047,10 +3220,11 @@ class GambleLBView(discord.ui.View):
 @bot.command(name="gamblingleaderboard", aliases=["glb"])
 async def gamblingleaderboard(ctx):
     top_players = list(gamble_profiles_col.find().sort("net_profit", -1).limit(10))
+    users = await user_resolver.resolve_many([p["user_id"] for p in top_players])
     desc = f"{E_ARROW} Category: **Highest Net Profit**\n\n"
     for i, p in enumerate(top_players, 1):
         sign = "+" if p.get("net_profit", 0) >= 0 else ""
-        user = bot.get_user(int(p["user_id"]))
+        user = users.get(int(p["user_id"]))
         name = user.display_name if user else f"User({p['user_id']})"
         desc += f"{E_ITEMBOX} **#{i}.** {name} - ({sign}{p.get('net_profit', 0):,})\n"
     await ctx.send(embed=discord.Embed(title=f"{E_CROWN} HALL OF FAME", description=desc, color=0xf1c40f), view=GambleLBView())
@@ -2282,15 +3456,13 @@ class UserPredictionView(discord.ui.View):
         # Lock ticket in database
         prediction_tickets_col.update_one({"ticket_id": self.ticket_id}, {"$set": {"status": "locked", "user_id": interaction.user.id}})
         
-        # Send Public Receipt to the Thread Channel
-        log_channel = interaction.guild.get_thread(PREDICTION_LOG_CHANNEL_ID) or interaction.guild.get_channel(PREDICTION_LOG_CHANNEL_ID)
-        if log_channel:
-            log_embed = discord.Embed(title=f"{E_ITEMBOX} NEW PREDICTION: {interaction.user.name}", description=f"**Ticket ID:** `{self.ticket_id}` | **Event:** {self.event['event_id']}", color=0x2ecc71)
-            for bet in ticket.get("bets", []):
-                icon = E_FIRE if bet["type"] == "football" else E_STARS
-                log_embed.add_field(name=f"{icon} Match: {bet['match_id']}", value=f"{E_ARROW} **Predict:** {bet['prediction']}\n{E_MONEY} **Stake:** {bet['wager_raw']}", inline=False)
-            log_embed.add_field(name=f"{E_CHAT} Bold Take:", value=f"*{ticket.get('opinion')}*", inline=False)
-            await log_channel.send(embed=log_embed)
+        # Send Public Receipt to the Thread Channel (batched)
+        log_embed = discord.Embed(title=f"{E_ITEMBOX} NEW PREDICTION: {interaction.user.name}", description=f"**Ticket ID:** `{self.ticket_id}` | **Event:** {self.event['event_id']}", color=0x2ecc71)
+        for bet in ticket.get("bets", []):
+            icon = E_FIRE if bet["type"] == "football" else E_STARS
+            log_embed.add_field(name=f"{icon} Match: {bet['match_id']}", value=f"{E_ARROW} **Predict:** {bet['prediction']}\n{E_MONEY} **Stake:** {bet['wager_raw']}", inline=False)
+        log_embed.add_field(name=f"{E_CHAT} Bold Take:", value=f"*{ticket.get('opinion')}*", inline=False)
+        await log_publisher.publish(PREDICTION_LOG_CHANNEL_ID, log_embed)
 
         await interaction.message.delete()
         await interaction.response.send_message(f"{E_SUCCESS} **BETSLIP LOCKED!** Your wagers are secured. Use `.myp` to view them.", ephemeral=True)
@@ -2645,11 +3817,14 @@ class AdminScheduleView(discord.ui.View):
     async def reset_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
         schedule_events_col.delete_many({})
         schedule_reminders_col.delete_many({})
+        job_scheduler.cancel("schedule_event")
         await interaction.response.send_message(embed=discord.Embed(description=f"{E_SUCCESS} Schedule completely reset.", color=0x2ecc71), ephemeral=True)
 
     @discord.ui.button(label="Confirm & Publish", style=discord.ButtonStyle.success, emoji=discord.PartialEmoji.from_str(E_GOLD_TICK), row=2)
     async def publish_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        drafts = list(schedule_events_col.find({"status": "draft"}))
         schedule_events_col.update_many({"status": "draft"}, {"$set": {"status": "published"}})
+        for e in drafts: job_scheduler.schedule("schedule_event", e["event_id"], schedule_event_alert_time(e))
         await interaction.response.edit_message(embed=discord.Embed(description=f"{E_SUCCESS} Schedule successfully published! Users can now use `.schedule`.", color=0x2ecc71), view=None)
 
     @discord.ui.button(label="Decline & Cancel", style=discord.ButtonStyle.secondary, emoji=discord.PartialEmoji.from_str(E_ERROR), row=2)
@@ -2751,34 +3926,33 @@ async def schedule_prefix(ctx):
 
     await ctx.send(embed=pages[0], view=UserScheduleView(events, pages, 0))
 
-# --- BACKGROUND TASK: DM REMINDERS ---
-@tasks.loop(minutes=1)
-async def check_schedule_reminders():
-    current_unix = int(discord.utils.utcnow().timestamp())
+# --- SCHEDULED JOB: DM REMINDERS ---
+def schedule_event_alert_time(event):
+    # Fire a minute before the event starts
+    return datetime.fromtimestamp(event["unix_time"] - 60)
+
+def seed_schedule_event_jobs():
+    events = schedule_events_col.find({"status": "published", "notified": {"$ne": True}})
+    job_scheduler.seed("schedule_event", [(e["event_id"], schedule_event_alert_time(e), None) for e in events])
+
+@job_scheduler.handler("schedule_event", seed=seed_schedule_event_jobs)
+async def check_schedule_reminders(job):
+    event = schedule_events_col.find_one({"event_id": job["key"], "status": "published", "notified": {"$ne": True}})
+    if not event: return
     
-    # Check for events happening within the next 2 minutes
-    upcoming_events = list(schedule_events_col.find({"status": "published", "unix_time": {"$lte": current_unix + 60}, "notified": {"$ne": True}}))
+    reminders = list(schedule_reminders_col.find({"event_id": event["event_id"], "active": True}))
     
-    for event in upcoming_events:
-        reminders = list(schedule_reminders_col.find({"event_id": event["event_id"], "active": True}))
-        
-        for r in reminders:
-            user = bot.get_user(r["user_id"])
-            if user:
-                embed = discord.Embed(title=f"{E_ALERT} EVENT STARTING NOW!", description=f"{E_ARROW} **{event['name']}** is starting right now in **{event['channel']}**!", color=0xf1c40f)
-                try:
-                    await user.send(embed=embed)
-                except discord.Forbidden:
-                    pass # User has DMs disabled
-                    
-        # Mark event as notified so we don't spam DMs
-        schedule_events_col.update_one({"_id": event["_id"]}, {"$set": {"notified": True}})
-
-# Start the background loop when the bot boots up
-@bot.listen('on_ready')
-async def start_reminder_loop():
-    if not check_schedule_reminders.is_running():
-        check_schedule_reminders.start()
+    for r in reminders:
+        user = await user_resolver.resolve(r["user_id"])
+        if user:
+            embed = discord.Embed(title=f"{E_ALERT} EVENT STARTING NOW!", description=f"{E_ARROW} **{event['name']}** is starting right now in **{event['channel']}**!", color=0xf1c40f)
+            try:
+                await user.send(embed=embed)
+            except discord.Forbidden:
+                pass # User has DMs disabled
+                
+    # Mark event as notified so we don't spam DMs
+    schedule_events_col.update_one({"_id": event["_id"]}, {"$set": {"notified": True}})
 
 # ==========================================================
 # 🏆 PREMIUM TOURNAMENT & ONGOING EVENTS SYSTEM 
@@ -2970,29 +4144,34 @@ class TransferBuyView(discord.ui.View):
         if buyer_w.get("balance", 0) < self.price:
             return await interaction.response.send_message(f"{E_ERROR} The buying club no longer has enough funds to complete this transfer.", ephemeral=True)
             
-        # 2. Transfer the Money
-        wallets_col.update_one({"user_id": str(self.buyer_club["owner_id"])}, {"$inc": {"balance": -self.price}})
+        # 2. Move the money and the duelist together (the debit re-checks the balance)
+        settle = Settlement(f"transfer {self.duelist['_id']}")
+        settle.debit(wallets_col, {"user_id": str(self.buyer_club["owner_id"])}, "balance", self.price)
         if self.old_club and self.old_club.get("owner_id"):
-            wallets_col.update_one({"user_id": str(self.old_club["owner_id"])}, {"$inc": {"balance": self.price}})
+            settle.update(wallets_col, {"user_id": str(self.old_club["owner_id"])}, {"$inc": {"balance": self.price}})
             
         # 3. Transfer the Duelist
-        duelists_col.update_one(
+        settle.update(duelists_col,
             {"_id": self.duelist["_id"]}, 
             {"$set": {"club_id": self.buyer_club["_id"], "transfer_listed": False, "status": "Signed"}}
         )
         # Clear pending transfers
-        db.pending_transfers.delete_many({"duelist_id": self.duelist["_id"]})
+        settle.delete(db.pending_transfers, {"duelist_id": self.duelist["_id"]})
+        if not settle.commit():
+            return await interaction.response.send_message(f"{E_ERROR} The buying club no longer has enough funds to complete this transfer.", ephemeral=True)
         
         # Disable buttons
         for child in self.children: child.disabled = True
         await interaction.response.edit_message(embed=create_embed("Transfer Complete", f"{E_SUCCESS} You are now signed to **{self.buyer_club['name']}**!", 0x2ecc71), view=self)
         
-        # Notify Owners
+        # Notify Owners (both looked up in one batch)
         try:
-            buyer = await bot.fetch_user(int(self.buyer_club["owner_id"]))
+            old_owner_id = self.old_club.get("owner_id") if self.old_club else None
+            users = await user_resolver.resolve_many([self.buyer_club["owner_id"], old_owner_id])
+            buyer = users[int(self.buyer_club["owner_id"])]
             await buyer.send(embed=create_embed("Transfer Accepted", f"{E_SUCCESS} <@{self.duelist['user_id']}> accepted your transfer offer and has joined **{self.buyer_club['name']}**!", 0x2ecc71))
-            if self.old_club and self.old_club.get("owner_id"):
-                old_owner = await bot.fetch_user(int(self.old_club["owner_id"]))
+            if old_owner_id:
+                old_owner = users[int(old_owner_id)]
                 await old_owner.send(embed=create_embed("Transfer Complete", f"{E_MONEY} <@{self.duelist['user_id']}> has been sold to **{self.buyer_club['name']}**. **${self.price:,}** has been added to your balance.", 0x2ecc71))
         except: pass
 
@@ -3014,7 +4193,7 @@ class TransferBuyView(discord.ui.View):
         for child in self.children: child.disabled = True
         await interaction.response.edit_message(embed=create_embed("Transfer Rejected", f"{E_DANGER} You rejected the transfer to **{self.buyer_club['name']}**.", 0xff0000), view=self)
         try:
-            buyer = await bot.fetch_user(int(self.buyer_club["owner_id"]))
+            buyer = await user_resolver.resolve(self.buyer_club["owner_id"])
             await buyer.send(embed=create_embed("Transfer Rejected", f"{E_DANGER} <@{self.duelist['user_id']}> rejected your transfer offer.", 0xff0000))
         except: pass
 
@@ -3105,7 +4284,9 @@ class PayTaxView(discord.ui.View):
         current_due = self.club.get("tax_due_date", datetime.now())
         new_due = max(datetime.now(), current_due) + timedelta(days=30)
         
-        clubs_col.update_one({"_id": self.club["_id"]}, {"$set": {"tax_due_date": new_due, "tax_reminder_stage": 0}})
+        next_alert = next_tax_alert_time(new_due, 0)
+        clubs_col.update_one({"_id": self.club["_id"]}, {"$set": {"tax_due_date": new_due, "tax_reminder_stage": 0, "next_tax_alert_at": next_alert}})
+        wake_tax_sweep(next_alert)
         
         # Disable buttons
         for child in self.children:
@@ -3132,61 +4313,82 @@ class PayTaxView(discord.ui.View):
         except: pass
         await interaction.followup.send("Tax payment cancelled.", ephemeral=True)
 
-async def club_tax_alert_task():
-    """Background loop to check club taxes, send DMs, and disown expired clubs."""
-    await bot.wait_until_ready()
-    
-    # Reminder stages mapping (Hours Left -> Stage Level)
-    stages = [
-        (360, 1, "15 Days"), (240, 2, "10 Days"), (120, 3, "5 Days"), 
-        (72, 4, "3 Days"), (48, 5, "2 Days"), (24, 6, "1 Day"), 
-        (12, 7, "12 Hours"), (6, 8, "6 Hours"), (1, 9, "1 Hour")
-    ]
-    
-    while not bot.is_closed():
-        now = datetime.now()
-        # Find all owned clubs
-        owned_clubs = clubs_col.find({"owner_id": {"$ne": None}})
+# Reminder stages mapping (Hours Left -> Stage Level)
+TAX_REMINDER_STAGES = [
+    (360, 1, "15 Days"), (240, 2, "10 Days"), (120, 3, "5 Days"), 
+    (72, 4, "3 Days"), (48, 5, "2 Days"), (24, 6, "1 Day"), 
+    (12, 7, "12 Hours"), (6, 8, "6 Hours"), (1, 9, "1 Hour")
+]
+
+def next_tax_alert_time(due_date, stage):
+    """When the next unsent reminder threshold is crossed, or the deadline itself once all are sent."""
+    for req_hours, stage_num, _ in TAX_REMINDER_STAGES:
+        if stage_num > stage:
+            return due_date - timedelta(hours=req_hours)
+    return due_date
+
+def wake_tax_sweep(when):
+    job_scheduler.schedule("club_tax_sweep", "all", max(datetime.now(), when), earliest=True)
+
+def seed_club_tax_sweep():
+    # Backfill clubs taxed before next_tax_alert_at existed, and drop the old per-club jobs
+    job_scheduler.cancel("club_tax")
+    legacy = clubs_col.find({"owner_id": {"$ne": None}, "tax_due_date": {"$type": "date"}, "next_tax_alert_at": {"$exists": False}},
+                            {"tax_due_date": 1, "tax_reminder_stage": 1})
+    ops = [UpdateOne({"_id": c["_id"]}, {"$set": {"next_tax_alert_at": next_tax_alert_time(c["tax_due_date"], c.get("tax_reminder_stage", 0))}}) for c in legacy]
+    if ops: clubs_col.bulk_write(ops, ordered=False)
+    job_scheduler.seed("club_tax_sweep", [("all", datetime.now(), None)])
+
+@job_scheduler.handler("club_tax_sweep", seed=seed_club_tax_sweep)
+async def club_tax_alert_task(job):
+    """Sends due tax reminders and disowns expired clubs, touching only clubs whose alert time has come."""
+    now = datetime.now()
+    ops = []
+    for club in clubs_col.find({"next_tax_alert_at": {"$lte": now}}):
+        due_date = club.get("tax_due_date")
+        if not club.get("owner_id") or not isinstance(due_date, datetime):
+            ops.append(UpdateOne({"_id": club["_id"]}, {"$unset": {"next_tax_alert_at": ""}})) # Ownership changed elsewhere
+            continue
         
-        for club in owned_clubs:
-            due_date = club.get("tax_due_date")
-            if not due_date: continue 
-            
-            time_left = due_date - now
-            hours_left = time_left.total_seconds() / 3600
-            current_stage = club.get("tax_reminder_stage", 0)
-            
-            # Check for Expiration (Disown Club)
-            if hours_left <= 0:
-                clubs_col.update_one({"_id": club["_id"]}, {"$set": {"owner_id": None, "tax_due_date": None, "tax_reminder_stage": 0}})
+        hours_left = (due_date - now).total_seconds() / 3600
+        current_stage = club.get("tax_reminder_stage", 0)
+        # Guard on the due date we read, so a payment landing mid-sweep wins
+        match = {"_id": club["_id"], "tax_due_date": due_date}
+        
+        # Check for Expiration (Disown Club)
+        if hours_left <= 0:
+            ops.append(UpdateOne(match, {"$set": {"owner_id": None, "tax_due_date": None, "tax_reminder_stage": 0}, "$unset": {"next_tax_alert_at": ""}}))
+            try:
+                desc = f"{E_DANGER} Your ownership of **{club['name']}** has been officially revoked because you failed to pay the required 25% club tax in time. \n\nThe club is now unsold and back on the public market."
+                dm_digest.notify(int(club["owner_id"]), f"{E_ALERT} Club Disowned", desc, 0xff0000)
+            except: pass # group:<name> owners have no DM
+            continue
+        
+        # Only the most urgent unsent stage goes out, so a late wake-up never sends a burst of stale reminders
+        for req_hours, stage_num, time_text in reversed(TAX_REMINDER_STAGES):
+            if hours_left <= req_hours and current_stage < stage_num:
+                tax_amount = int(club.get("value", 0) * 0.25) # 25% of Live Worth
                 try:
-                    user = bot.get_user(int(club["owner_id"])) or await bot.fetch_user(int(club["owner_id"]))
-                    desc = f"{E_DANGER} Your ownership of **{club['name']}** has been officially revoked because you failed to pay the required 25% club tax in time. \n\nThe club is now unsold and back on the public market."
-                    await user.send(embed=create_embed(f"{E_ALERT} Club Disowned", desc, 0xff0000))
+                    desc = (
+                        f"{E_ALERT} Your club **{club['name']}** has pending taxes!\n\n"
+                        f"{E_MONEY} **Tax Amount:** ${tax_amount:,}\n"
+                        f"{E_TIMER} **Time Remaining:** {time_text} (<t:{int(due_date.timestamp())}:R>)\n\n"
+                        f"Use `.paytax {club['name']}` in the server to pay and avoid losing your club!"
+                    )
+                    dm_digest.notify(int(club["owner_id"]), f"{E_CROWN} Tax Reminder: {time_text} Left", desc, 0xf1c40f)
                 except: pass
-                continue
-            
-            # Check Reminders
-            for req_hours, stage_num, time_text in stages:
-                if hours_left <= req_hours and current_stage < stage_num:
-                    tax_amount = int(club.get("value", 0) * 0.25) # 25% of Live Worth
-                    try:
-                        user = bot.get_user(int(club["owner_id"])) or await bot.fetch_user(int(club["owner_id"]))
-                        desc = (
-                            f"{E_ALERT} Your club **{club['name']}** has pending taxes!\n\n"
-                            f"{E_MONEY} **Tax Amount:** ${tax_amount:,}\n"
-                            f"{E_TIMER} **Time Remaining:** {time_text} (<t:{int(due_date.timestamp())}:R>)\n\n"
-                            f"Use `.paytax {club['name']}` in the server to pay and avoid losing your club!"
-                        )
-                        await user.send(embed=create_embed(f"{E_CROWN} Tax Reminder: {time_text} Left", desc, 0xf1c40f))
-                    except: pass
-                    
-                    clubs_col.update_one({"_id": club["_id"]}, {"$set": {"tax_reminder_stage": stage_num}})
-                    break # Only trigger one stage per loop cycle
-
-        await asyncio.sleep(600) # Check the database every 10 minutes
+                current_stage = stage_num
+                break
+        
+        ops.append(UpdateOne(match, {"$set": {"tax_reminder_stage": current_stage, "next_tax_alert_at": next_tax_alert_time(due_date, current_stage)}}))
+    
+    if ops: clubs_col.bulk_write(ops, ordered=False)
+    
+    # Sleep until the earliest pending alert across all clubs
+    upcoming = clubs_col.find_one({"next_tax_alert_at": {"$type": "date"}}, {"next_tax_alert_at": 1}, sort=[("next_tax_alert_at", 1)])
+    if upcoming: job_scheduler.schedule("club_tax_sweep", "all", max(datetime.now(), upcoming["next_tax_alert_at"]))
 
-@tasks.loop(hours=1) # Runs exactly every 15 seconds!
+@supervisor.every("club_market", 3600, lease=jobs_lease, role="jobs")
 async def club_market_simulation_task():
     """Background loop to fluctuate club values."""
     try:
@@ -3218,44 +4420,22 @@ async def club_market_simulation_task():
             
     except Exception as e:
         print(f"MARKET SIMULATION ERROR: {e}")
-        
-@club_market_simulation_task.before_loop
-async def before_market_loop():
-    await bot.wait_until_ready()
-
-#AND THEN IN YOUR on_ready() EVENT, START IT LIKE THIS:
-# club_market_simulation_task.start()     
     
-class ParticipantView(discord.ui.View):
-    def __init__(self, message_id, required_roles=None):
+class GiveawayView(discord.ui.View):
+    """Persistent participants button; counts come from giveaway_entries, not the reaction list."""
+    def __init__(self):
         super().__init__(timeout=None)
-        self.message_id = message_id
-        self.required_roles = required_roles
-    @discord.ui.button(label="Check Participants", style=discord.ButtonStyle.gray, emoji=discord.PartialEmoji.from_str(E_ADMIN))
+    @discord.ui.button(label="Check Participants", style=discord.ButtonStyle.gray, emoji=discord.PartialEmoji.from_str(E_ADMIN), custom_id="giveaway_participants")
     async def check_list(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not interaction.user.guild_permissions.administrator: return await interaction.response.send_message(f"{E_ERROR} Admins only.", ephemeral=True)
-        message = await interaction.channel.fetch_message(self.message_id)
-        reaction = None
-        emoji_to_check = "🎉"
-        if E_GIVEAWAY.startswith("<"): emoji_to_check = E_GIVEAWAY 
-        for r in message.reactions:
-             if str(r.emoji) == str(emoji_to_check) or str(r.emoji) == "🎉":
-                 reaction = r
-                 break
-        if not reaction: return await interaction.response.send_message("No entries yet.", ephemeral=True)
-        users = [user async for user in reaction.users() if not user.bot]
-        valid_participants = []
-        for u in users:
-            if isinstance(u, discord.Member):
-                if self.required_roles:
-                    user_role_ids = [r.id for r in u.roles]
-                    if isinstance(self.required_roles, list): 
-                        if any(rid in self.required_roles for rid in user_role_ids): valid_participants.append(f"• {u.display_name}") 
-                    elif isinstance(self.required_roles, int):
-                         if self.required_roles in user_role_ids: valid_participants.append(f"• {u.display_name}")
-                else: valid_participants.append(f"• {u.display_name}")
-        count = len(valid_participants)
-        text = "\n".join(valid_participants[:40])
+        mid = interaction.message.id
+        count = giveaway_entries_col.count_documents({"giveaway_id": mid})
+        entries = giveaway_entries_col.find({"giveaway_id": mid}, {"user_id": 1}).limit(40)
+        names = []
+        for e in entries:
+            m = interaction.guild.get_member(int(e["user_id"]))
+            names.append(f"• {m.display_name if m else e['user_id']}")
+        text = "\n".join(names)
         if count > 40: text += f"\n...and {count-40} more."
         if count == 0: text = "No valid entries found."
         await interaction.response.send_message(f"**Valid Entries:** {count}\n\n{text}", ephemeral=True)
@@ -3281,8 +4461,11 @@ def resolve_emoji(item):
         return item
     return str(item)
 
+def activity_doc(user_id, type, description):
+    return {"user_id": str(user_id), "type": type, "description": description, "timestamp": datetime.now()}
+
 def log_user_activity(user_id, type, description):
-    if db is not None: activities_col.insert_one({"user_id": str(user_id), "type": type, "description": description, "timestamp": datetime.now()})
+    if db is not None: activities_col.insert_one(activity_doc(user_id, type, description))
 
 def log_past_entity(user_id, type, name):
     if db is not None: 
@@ -3293,12 +4476,133 @@ def log_past_entity(user_id, type, name):
             "timestamp": datetime.now()
         })
 
+class LogPublisher:
+    """Buffers log embeds per channel and posts them 10 at a time."""
+    def __init__(self, interval=LOG_FLUSH_INTERVAL, max_buffer=LOG_BUFFER_LIMIT, put_timeout=5.0):
+        self.interval = interval
+        self.max_buffer = max_buffer
+        self.put_timeout = put_timeout
+        self.queues = {}  # channel_id -> asyncio.Queue of embeds
+        self.workers = {} # channel_id -> flusher task
+        self.sent = 0
+        self.dropped = 0
+
+    async def publish(self, channel_id, embed):
+        q = self.queues.get(channel_id)
+        if q is None:
+            q = self.queues[channel_id] = asyncio.Queue(maxsize=self.max_buffer)
+            self.workers[channel_id] = bot.loop.create_task(self._flusher(channel_id, q))
+        try:
+            # Backpressure: a full buffer makes the caller wait for the flusher, then we give up
+            await asyncio.wait_for(q.put(embed), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            print(f"[Log Publisher] Buffer full for {channel_id}, dropped embed ({self.dropped} total)")
+
+    async def _flusher(self, channel_id, q):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await q.get()]
+            deadline = loop.time() + self.interval
+            while len(batch) < 10: # Discord allows 10 embeds per message
+                timeout = deadline - loop.time()
+                if timeout <= 0: break
+                try: batch.append(await asyncio.wait_for(q.get(), timeout=timeout))
+                except asyncio.TimeoutError: break
+            await self._send(channel_id, batch)
+
+    async def _send(self, channel_id, batch):
+        # Split the batch so no single message goes over the combined embed length cap
+        chunk, size = [], 0
+        for embed in batch:
+            if chunk and size + len(embed) > LOG_MESSAGE_CHARS:
+                await self._post(channel_id, chunk)
+                chunk, size = [], 0
+            chunk.append(embed)
+            size += len(embed)
+        if chunk: await self._post(channel_id, chunk)
+
+    async def _post(self, channel_id, embeds):
+        try:
+            url = LOG_WEBHOOKS.get(channel_id)
+            if url:
+                await discord.Webhook.from_url(url, client=bot).send(embeds=embeds)
+            else:
+                channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+                await channel.send(embeds=embeds)
+            self.sent += len(embeds)
+        except discord.HTTPException as e:
+            if e.status == 400 and len(embeds) > 1:
+                # Discord rejected the message as a whole; post one by one so only a bad embed is lost
+                for embed in embeds: await self._post(channel_id, [embed])
+                return
+            self.dropped += len(embeds)
+            print(f"[Log Publisher] Could not post {len(embeds)} embeds to {channel_id}: {e}")
+        except Exception as e:
+            self.dropped += len(embeds)
+            print(f"[Log Publisher] Could not post {len(embeds)} embeds to {channel_id}: {e}")
+
+log_publisher = LogPublisher()
+
+class DMDigest:
+    """Merges a user's notification DMs that arrive within a short window into one embed."""
+    def __init__(self, window=DM_DIGEST_WINDOW):
+        self.window = window
+        self.pending = {}      # user_id -> list of (title, description, color)
+        self.instant = set()   # user_ids that opted out of digests (kept in memory only)
+        self.sent = 0
+        self.merged = 0
+
+    def notify(self, user, title, description, color=0x3498db):
+        """Queues a DM. `user` can be a User/Member or a raw ID (resolved on delivery)."""
+        uid = int(getattr(user, "id", user))
+        items = self.pending.get(uid)
+        if items is not None:
+            items.append((title, description, color))
+            self.merged += 1
+            return
+        self.pending[uid] = [(title, description, color)]
+        delay = 0 if uid in self.instant else self.window
+        bot.loop.create_task(self._deliver(uid, user, delay))
+
+    def build_embed(self, items):
+        if len(items) == 1: return create_embed(*items[0])
+        embed = discord.Embed(title=f"{E_BOOK} Notification Digest ({len(items)})", color=items[-1][2])
+        for i, (title, desc, _) in enumerate(items):
+            # Stay under Discord's 25 field / 6000 character embed limits
+            if i >= 24 or len(embed) + len(title) + min(len(desc), 1024) > 5800:
+                embed.add_field(name=f"{E_ALERT} And {len(items) - i} more...", value="Check the server for details.", inline=False)
+                break
+            embed.add_field(name=title[:256], value=desc[:1024], inline=False)
+        return embed
+
+    async def _deliver(self, uid, user, delay):
+        await asyncio.sleep(delay)
+        items = self.pending.pop(uid, [])
+        if not items: return
+        try:
+            if not isinstance(user, discord.abc.User):
+                user = await user_resolver.resolve(uid)
+            await user.send(embed=self.build_embed(items))
+            self.sent += 1
+        except: pass # DMs closed
+
+dm_digest = DMDigest()
+
+@bot.command(name="dmdigest", description="Toggle merging your bot notification DMs into digests.")
+async def dmdigest(ctx):
+    uid = ctx.author.id
+    if uid in dm_digest.instant:
+        dm_digest.instant.discard(uid)
+        await ctx.send(embed=create_embed(f"{E_GOLD_TICK} Digest Enabled", f"Notifications arriving within {int(dm_digest.window)}s will be merged into one DM.", 0x2ecc71))
+    else:
+        dm_digest.instant.add(uid)
+        await ctx.send(embed=create_embed(f"{E_ERROR} Digest Disabled", "You will get every notification as its own DM (resets when the bot restarts).", 0xff0000))
+
 async def send_log(channel_key, embed):
     if db is None: return
     cid = LOG_CHANNELS.get(channel_key)
-    if cid:
-        ch = bot.get_channel(cid)
-        if ch: await ch.send(embed=embed)
+    if cid: await log_publisher.publish(cid, embed)
 
 def parse_duration(time_str):
     time_str = time_str.lower()
@@ -3319,87 +4623,171 @@ def parse_prize_amount(prize_str):
     return 0
 
 # ---------- TASKS & EVENTS ----------
+@supervisor.every("market_drift", 3600, delay_first=True, lease=jobs_lease, role="jobs")
 async def market_simulation_task():
-    await bot.wait_until_ready()
-    print("[Market] Simulation task started.")
-    while not bot.is_closed():
-        try:
-            # Wait 1 hour (3600 seconds)
-            await asyncio.sleep(3600)
-            
-            if db is not None:
-                updated_count = 0
-                for c in clubs_col.find():
-                    # Get current value, fallback to base_price if missing
-                    current_val = c.get("value", c.get("base_price", 0))
-                    
-                    # Fluctuate between -3% and +3%
-                    percent_change = random.uniform(-0.03, 0.03)
-                    change_amount = int(current_val * percent_change)
-                    new_value = max(100, current_val + change_amount) # Minimum value 100
-                    
-                    clubs_col.update_one({"_id": c["_id"]}, {"$set": {"value": new_value}})
-                    updated_count += 1
-                
-                print(f"[Market] Auto-Updated values for {updated_count} clubs.")
-                
-                # Optional: Log to Discord Channel
-                log_ch = bot.get_channel(LOG_CHANNELS["club"])
-                if log_ch: 
-                    await log_ch.send(embed=create_embed(f"{E_STARS} Market Update", f"Values for **{updated_count}** clubs have shifted due to market volatility.", 0x3498db))
-                    
-        except Exception as e:
-            print(f"[Market Error] {e}")
-            await asyncio.sleep(60) # Wait 1 min before retrying if error
+    if db is None: return
+    updated_count = 0
+    for c in clubs_col.find():
+        # Get current value, fallback to base_price if missing
+        current_val = c.get("value", c.get("base_price", 0))
+        
+        # Fluctuate between -3% and +3%
+        percent_change = random.uniform(-0.03, 0.03)
+        change_amount = int(current_val * percent_change)
+        new_value = max(100, current_val + change_amount) # Minimum value 100
+        
+        clubs_col.update_one({"_id": c["_id"]}, {"$set": {"value": new_value}})
+        updated_count += 1
+    
+    print(f"[Market] Auto-Updated values for {updated_count} clubs.")
+    
+    # Optional: Log to Discord Channel
+    try: await messageable(LOG_CHANNELS["club"]).send(embed=create_embed(f"{E_STARS} Market Update", f"Values for **{updated_count}** clubs have shifted due to market volatility.", 0x3498db))
+    except discord.HTTPException as e: print(f"[Market] Update log failed: {e}")
 
 @bot.event
 async def on_command_completion(ctx):
     log_user_activity(ctx.author.id, "Command", f"Used {E_CHAT} `.{ctx.command.name}`")
 
 # ==============================================================================
-#  GIVEAWAY RECOVERY SYSTEM (Fixes Restart Issue)
+#  GIVEAWAY ENGINE (Entries stored as they happen, end time is a scheduled job)
 # ==============================================================================
 
-async def restart_giveaway_timer(mid, ch, prize, time_left):
-    """Helper to restart a timer for a specific giveaway."""
-    await asyncio.sleep(time_left)
-    await end_giveaway(mid, ch, prize)
+active_giveaways = {} # message_id -> giveaway doc, for giveaways still taking entries
+tracked_giveaway_messages = {} # message_id -> embed title, for every bot giveaway (quest credit)
 
+def is_giveaway_emoji(emoji):
+    target_emoji_str = str(discord.PartialEmoji.from_str(E_GIVEAWAY)) if E_GIVEAWAY.startswith("<") else "🎉"
+    return str(emoji) in (target_emoji_str, "🎉")
+
+def giveaway_entry_weight(member, gw):
+    """0 if the member can't enter, otherwise their ticket count."""
+    role_ids = {r.id for r in member.roles}
+    required = gw.get("required_role_ids") or []
+    if required and not role_ids.intersection(required): return 0
+    weight = 1
+    if gw.get("weighted"):
+        for rid, w in DONOR_WEIGHTS.items():
+            if rid in role_ids: weight = max(weight, w)
+    return weight
+
+def draw_giveaway_winners(entries, k, weighted=False, seed=None):
+    """Picks k distinct user IDs from (user_id, weight) pairs.
+
+    Weighted draws use Efraimidis-Spirakis A-Res: every entrant gets the key u^(1/w) and the k
+    largest keys win, which is one pass and a k-sized heap. The same seed and entry order
+    always give the same winners, so a stored draw_seed makes a result auditable.
+    """
+    rng = random.Random(seed)
+    if not weighted: return rng.sample([u for u, _ in entries], min(k, len(entries)))
+    # log(u)/w orders the same as u^(1/w) without underflowing for big weights
+    return [u for _, u in heapq.nlargest(k, ((math.log(1.0 - rng.random()) / w, u) for u, w in entries if w > 0))]
+
+@bot.listen('on_raw_reaction_add')
+async def giveaway_entry_tracker(payload):
+    gw = active_giveaways.get(payload.message_id)
+    if not gw or not payload.member or payload.member.bot or not is_giveaway_emoji(payload.emoji): return
+    weight = giveaway_entry_weight(payload.member, gw)
+    if weight:
+        giveaway_entries_col.update_one(
+            {"giveaway_id": payload.message_id, "user_id": str(payload.user_id)},
+            {"$setOnInsert": {"weight": weight, "entered_at": datetime.now()}}, upsert=True
+        )
+
+@bot.listen('on_raw_reaction_remove')
+async def giveaway_entry_untracker(payload):
+    if payload.message_id in active_giveaways and is_giveaway_emoji(payload.emoji):
+        giveaway_entries_col.delete_one({"giveaway_id": payload.message_id, "user_id": str(payload.user_id)})
+
+async def end_giveaway(mid, ch=None, prize=None):
+    """Draws winners from the stored entries. The giveaway stays `drawing` until the winners are stored
+    and paid, so a run that crashes part-way is finished by the next one (the job is re-queued)."""
+    gw = giveaways_col.find_one_and_update({"message_id": int(mid), "ended": False}, {"$set": {"drawing": True}}, return_document=ReturnDocument.AFTER)
+    active_giveaways.pop(int(mid), None)
+    if not gw: return
+    channel = ch or bot.get_channel(gw["channel_id"])
+    if not channel:
+        giveaways_col.update_one({"_id": gw["_id"]}, {"$set": {"ended": True}, "$unset": {"drawing": ""}})
+        return
+    msg = channel.get_partial_message(gw["message_id"]) # Reply without re-fetching the message
+    
+    if "draw_seed" not in gw:
+        # Entrants who left the server since entering can't win
+        guild = channel.guild
+        entries = [(e["user_id"], e.get("weight", 1)) for e in giveaway_entries_col.find({"giveaway_id": gw["message_id"]}, {"user_id": 1, "weight": 1}).sort("user_id", 1)
+                   if guild.get_member(int(e["user_id"]))]
+        if not entries:
+            giveaways_col.update_one({"_id": gw["_id"]}, {"$set": {"ended": True}, "$unset": {"drawing": ""}})
+            return await msg.reply(embed=create_embed("Ended", "No entrants.", 0x95a5a6))
+        
+        draw_seed = random.getrandbits(63)
+        final_winners = draw_giveaway_winners(entries, gw["winners_count"], gw.get("weighted", False), seed=draw_seed)
+        # The first stored draw stands; a resumed run pays out that one instead of drawing again
+        giveaways_col.update_one({"_id": gw["_id"], "draw_seed": {"$exists": False}}, {"$set": {"winners": final_winners, "entrant_count": len(entries), "draw_seed": draw_seed}})
+        gw = giveaways_col.find_one({"_id": gw["_id"]})
+    final_winners = gw["winners"]
+    
+    winner_mentions = ", ".join([f"<@{uid}>" for uid in final_winners])
+    tip_amount = 0
+    try:
+        clean = (prize or gw["prize"]).lower().replace(",", "").replace("$", "")
+        if "k" in clean: tip_amount = int(float(clean.replace("k", "")) * 1000)
+    except: pass
+    tip_msg = ""
+    # Tips and `ended` land together; keyed so a resumed run doesn't tip twice
+    settle = Settlement(f"giveaway {gw['message_id']}", key=f"giveaway:{gw['_id']}")
+    settle.guard(giveaways_col, {"_id": gw["_id"], "ended": False}, {"$set": {"ended": True}, "$unset": {"drawing": ""}})
+    if tip_amount > 0:
+        for uid in final_winners: settle.update(wallets_col, {"user_id": uid}, {"$inc": {"balance": tip_amount}}, upsert=True)
+        tip_msg = f"\n{E_MONEY} **Auto-Tip:** ${tip_amount:,} sent!"
+    if not settle.commit(): return # Another run already finished this giveaway
+    await msg.reply(f"Congratulations {winner_mentions}! {tip_msg}")
+
+def seed_giveaway_jobs():
+    gws = giveaways_col.find({"ended": False}, {"message_id": 1, "end_time": 1})
+    job_scheduler.seed("giveaway_end", [(g["message_id"], datetime.fromtimestamp(g["end_time"]), None) for g in gws])
+
+@job_scheduler.handler("giveaway_end", seed=seed_giveaway_jobs, gateway=True)
+async def giveaway_end_job(job):
+    await end_giveaway(int(job["key"]))
+
+@supervisor.once("giveaway_recovery")
 async def check_active_giveaways():
-    """Checks DB for active giveaways on startup and resumes them."""
+    """Reloads running giveaways on startup and catches up on reactions made while offline."""
     await bot.wait_until_ready()
     
     if db is None: return
     
-    # Find all giveaways that haven't been marked as ended
-    active_gws = giveaways_col.find({"ended": False})
+    for g in giveaways_col.find({}, {"message_id": 1, "prize": 1}):
+        tracked_giveaway_messages[g["message_id"]] = f"{E_GIVEAWAY} {g['prize']}"
     
     count = 0
-    for gw in active_gws:
+    for gw in giveaways_col.find({"ended": False}):
+        active_giveaways[gw["message_id"]] = gw
         try:
             channel = bot.get_channel(gw['channel_id'])
             if not channel: continue # Channel deleted?
+            msg = await channel.fetch_message(gw["message_id"])
+            reaction = next((r for r in msg.reactions if is_giveaway_emoji(r.emoji)), None)
+            if not reaction: continue
             
-            # Calculate remaining time
-            now = datetime.now().timestamp()
-            end_time = gw['end_time']
-            remaining = end_time - now
-            
-            if remaining <= 0:
-                # Giveaway ended while bot was offline -> Finish it NOW
-                print(f"[Giveaway] Ending expired giveaway {gw['message_id']}")
-                await end_giveaway(gw['message_id'], channel, gw['prize'])
-            else:
-                # Giveaway still running -> Restart the timer
-                print(f"[Giveaway] Resuming giveaway {gw['message_id']} ({int(remaining)}s left)")
-                bot.loop.create_task(restart_giveaway_timer(gw['message_id'], channel, gw['prize'], remaining))
-            
+            # One reaction scan per restart, rather than one per draw
+            ops, reactors = [], []
+            async for user in reaction.users():
+                member = channel.guild.get_member(user.id)
+                if user.bot or not member: continue
+                reactors.append(str(user.id))
+                weight = giveaway_entry_weight(member, gw)
+                if weight:
+                    ops.append(UpdateOne({"giveaway_id": gw["message_id"], "user_id": str(user.id)}, {"$setOnInsert": {"weight": weight, "entered_at": datetime.now()}}, upsert=True))
+            if ops: giveaway_entries_col.bulk_write(ops, ordered=False)
+            giveaway_entries_col.delete_many({"giveaway_id": gw["message_id"], "user_id": {"$nin": reactors}})
             count += 1
         except Exception as e:
             print(f"[Giveaway Error] Failed to resume {gw.get('message_id')}: {e}")
             
     if count > 0:
-        print(f"[System] Resumed/Ended {count} active giveaways.")
+        print(f"[System] Resumed {count} active giveaways.")
 
 @bot.event
 async def on_message(message):
@@ -3421,11 +4809,8 @@ async def on_message(message):
         
         if ret and ret.get("count", 0) % 150 == 0:
             wallets_col.update_one({"user_id": str(message.author.id)}, {"$inc": {"pc_boxes": 1}}, upsert=True)
-            try:
-                desc = f"You just sent 150 messages today and earned **1x PC Box**!\nType `.ob` to open it."
-                await message.author.send(embed=create_embed(f"{E_ITEMBOX} Box Earned!", desc, 0x2ecc71))
-            except: 
-                pass
+            desc = f"You just sent 150 messages today and earned **1x PC Box**!\nType `.ob` to open it."
+            dm_digest.notify(message.author, f"{E_ITEMBOX} Box Earned!", desc, 0x2ecc71)
         
         await update_quest(message.author.id, "msgs", 1)
         
@@ -3452,16 +4837,94 @@ async def on_message(message):
                 )
                 reward_txt = f"\n\n{E_GIVEAWAY} **Rewards Unlocked:**\n{E_PC} **{reward['pc']:,} PC**\n{E_MONEY} **${reward['cash']:,} Cash**"
             
-            try:
-                desc = f"You reached **Level {new_lvl}** in the main chat!{reward_txt}"
-                await message.author.send(embed=create_embed(f"{E_STARS} Level Up!", desc, 0xf1c40f))
-            except: 
-                pass
+            desc = f"You reached **Level {new_lvl}** in the main chat!{reward_txt}"
+            dm_digest.notify(message.author, f"{E_STARS} Level Up!", desc, 0xf1c40f)
 
     # 3. CRITICAL: This line tells the bot to actually read your commands!
     # Notice how it is outdented all the way to the left so it runs no matter what.
     await bot.process_commands(message)
 
+DEPOSIT_EXPIRY_HOURS = 24
+
+class DepositMatcher:
+    """amount -> FIFO of pending deposits, one index per stage ("Queued" waits for the PokéTwo listing,
+    "On Hold" for the purchase). A match pops from memory and claims the doc with a status-guarded
+    update, so a stale entry is skipped instead of paying out twice."""
+    STAGES = ("Queued", "On Hold")
+
+    def __init__(self):
+        self.index = {stage: {} for stage in self.STAGES} # stage -> amount -> deque of deposit docs
+        self.loaded = False
+
+    def rebuild(self):
+        self.index = {stage: {} for stage in self.STAGES}
+        for dep in deposits_col.find({"status": {"$in": list(self.STAGES)}}).sort([("listed_at", 1), ("created_at", 1)]):
+            self.add(dep)
+        self.loaded = True
+        return sum(len(q) for amounts in self.index.values() for q in amounts.values())
+
+    def add(self, deposit):
+        if deposit.get("status") in self.index:
+            self.index[deposit["status"]].setdefault(deposit["amount"], deque()).append(deposit)
+
+    def discard(self, deposit_id):
+        for amounts in self.index.values():
+            for amount, q in list(amounts.items()):
+                for dep in list(q):
+                    if dep["deposit_id"] == deposit_id: q.remove(dep)
+                if not q: del amounts[amount]
+
+    def claim(self, stage, amount, fields):
+        """Oldest deposit of this stage and amount, moved on with `fields` set. None if nothing matches."""
+        if not self.loaded: self.rebuild()
+        amounts = self.index[stage]
+        q = amounts.get(amount)
+        while q:
+            dep = q.popleft()
+            claimed = deposits_col.find_one_and_update({"_id": dep["_id"], "status": stage}, {"$set": fields}, return_document=ReturnDocument.AFTER)
+            if claimed:
+                if not q: amounts.pop(amount, None)
+                self.add(claimed)
+                return claimed
+        amounts.pop(amount, None)
+        return None
+
+    def claim_expired(self, amount, fields):
+        """Oldest expired deposit of this amount that had been listed: its listing can still sell after expiry."""
+        return deposits_col.find_one_and_update(
+            {"status": "Expired", "amount": amount, "market_id": {"$ne": None}, "listed_at": {"$ne": None}},
+            {"$set": fields}, sort=[("listed_at", 1)], return_document=ReturnDocument.AFTER
+        )
+
+    def expire(self):
+        """Marks deposits left pending for DEPOSIT_EXPIRY_HOURS as Expired and drops them from the index.
+        Queued deposits age from the request, On Hold ones from their PokéTwo listing."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=DEPOSIT_EXPIRY_HOURS)
+        overdue = {"$or": [{"status": "Queued", "created_at": {"$lt": cutoff}}, {"status": "On Hold", "listed_at": {"$lt": cutoff}}]}
+        stale = [d["_id"] for d in deposits_col.find(overdue, {"_id": 1})]
+        if stale:
+            deposits_col.update_many({"_id": {"$in": stale}, **overdue}, {"$set": {"status": "Expired"}})
+        stale = set(stale)
+        for amounts in self.index.values():
+            for amount, q in list(amounts.items()):
+                kept = deque(d for d in q if d["_id"] not in stale)
+                if kept: amounts[amount] = kept
+                else: del amounts[amount]
+        return len(stale)
+
+deposit_matcher = DepositMatcher()
+
+@supervisor.once("deposit_index")
+def load_deposit_index():
+    if db is None: return
+    print(f"[Deposits] Indexed {deposit_matcher.rebuild()} pending deposits.")
+
+@supervisor.every("deposit_expiry", 900, delay_first=True)
+async def expire_deposits():
+    if db is None: return
+    expired = deposit_matcher.expire()
+    if expired: print(f"[Deposits] Expired {expired} stale deposits.")
+
 @bot.listen('on_message')
 async def auto_deposit_listener(message):
     # Ignore messages outside the market channel
@@ -3483,12 +4946,8 @@ async def auto_deposit_listener(message):
                 market_id = match_id.group(1)
                 print(f"[MARKET DEBUG] Success! Amount: {amount} | Market ID: {market_id}")
 
-                deposit = deposits_col.find_one({"status": "Queued", "amount": amount}, sort=[("created_at", 1)])
+                deposit = deposit_matcher.claim("Queued", amount, {"status": "On Hold", "market_id": market_id, "listed_at": datetime.now(timezone.utc)})
                 if deposit:
-                    deposits_col.update_one(
-                        {"_id": deposit["_id"]},
-                        {"$set": {"status": "On Hold", "market_id": market_id, "listed_at": datetime.now(timezone.utc)}}
-                    )
                     
                     user = bot.get_user(int(deposit["user_id"]))
                     if user:
@@ -3525,38 +4984,38 @@ async def auto_deposit_listener(message):
                 amount = int(match.group(1).replace(",", ""))
                 print(f"[MARKET DEBUG] Success! Sold for: {amount}")
 
-                deposit = deposits_col.find_one({"status": "On Hold", "amount": amount}, sort=[("listed_at", 1)])
+                deposit = deposit_matcher.claim("On Hold", amount, {"status": "Completed"})
+                late = False
+                if not deposit:
+                    # The listing outlived its deposit's expiry, but the user still paid for it
+                    deposit = deposit_matcher.claim_expired(amount, {"status": "Completed", "completed_late": True})
+                    late = deposit is not None
                 if deposit:
-                    print(f"[MARKET DEBUG] Found matching On Hold deposit: {deposit['deposit_id']}")
-                    deposits_col.update_one(
-                        {"_id": deposit["_id"]},
-                        {"$set": {"status": "Completed"}}
-                    )
+                    print(f"[MARKET DEBUG] Found matching {'Expired' if late else 'On Hold'} deposit: {deposit['deposit_id']}")
                     
                     wallets_col.update_one({"user_id": deposit["user_id"]}, {"$inc": {"pc": amount}}, upsert=True)
-                    user = bot.get_user(int(deposit["user_id"]))
-                    
-                    if user:
-                        try:
-                            dm_desc = f"{E_SUCCESS} Your deposit of **{amount:,} PC** (ID: `{deposit['deposit_id']}`) is fully confirmed!\n💰 The PC has been added to your bot account."
-                            await user.send(embed=create_embed("Deposit Confirmed", dm_desc, 0x2ecc71))
-                        except:
-                            pass
+                    dm_desc = f"{E_SUCCESS} Your deposit of **{amount:,} PC** (ID: `{deposit['deposit_id']}`) is fully confirmed!\n💰 The PC has been added to your bot account."
+                    dm_digest.notify(int(deposit["user_id"]), "Deposit Confirmed", dm_desc, 0x2ecc71)
 
                     # Log it! Now tracks WHO confirmed it.
-                    log_channel = bot.get_channel(1483526389339521066)
-                    if log_channel:
-                        log_desc = (
-                            f"**Deposit ID:** `{deposit['deposit_id']}`\n"
-                            f"**User:** <@{deposit['user_id']}>\n"
-                            f"**Amount:** {amount:,} PC\n"
-                            f"**Status:** {E_SUCCESS} Successfully added PC\n"
-                            f"**Confirmed By:** {message.author.mention}"
-                        )
-                        await log_channel.send(embed=discord.Embed(title="Deposit Log: Completed", description=log_desc, color=0x2ecc71))
-                        print("[MARKET DEBUG] Log sent to admin channel. Process complete!")
+                    log_desc = (
+                        f"**Deposit ID:** `{deposit['deposit_id']}`\n"
+                        f"**User:** <@{deposit['user_id']}>\n"
+                        f"**Amount:** {amount:,} PC\n"
+                        f"**Status:** {E_SUCCESS} Successfully added PC{' (deposit had expired, listing still sold)' if late else ''}\n"
+                        f"**Confirmed By:** {message.author.mention}"
+                    )
+                    await log_publisher.publish(1483526389339521066, discord.Embed(title="Deposit Log: Completed", description=log_desc, color=0x2ecc71))
+                    print("[MARKET DEBUG] Log queued for admin channel. Process complete!")
                 else:
                     print("[MARKET DEBUG] ERROR: Could not find an 'On Hold' deposit for this amount.")
+                    # Nobody was credited for coins the bot received; admins settle it by hand
+                    log_desc = (
+                        f"**Amount:** {amount:,} PC\n"
+                        f"**Status:** {E_ERROR} No pending or expired deposit matches this purchase\n"
+                        f"**Confirmed By:** {message.author.mention} ([message]({message.jump_url}))"
+                    )
+                    await log_publisher.publish(1483526389339521066, discord.Embed(title="Deposit Log: Unmatched Purchase", description=log_desc, color=0xe74c3c))
             else:
                 print("[MARKET DEBUG] ERROR: Regex failed to read the sold amount.")
 
@@ -3589,62 +5048,58 @@ async def economy_lockdown_shield(ctx):
     # If it's a club, duelist, or giveaway command, let it pass through!
     return True
                 
-async def check_login_reminders():
-    """Checks for expired login cooldowns and pings users."""
-    await bot.wait_until_ready()
+def wake_login_sweep(when):
+    job_scheduler.schedule("login_reminder_sweep", "all", max(datetime.now(), when), earliest=True)
+
+def seed_login_reminder_sweep():
+    # Backfill remind_at for reminders that predate it, and drop the old per-user jobs
+    job_scheduler.cancel("login_reminder")
+    legacy = wallets_col.find({"remind_login": True, "reminder_sent": False, "last_login": {"$type": "date"}, "remind_at": {"$exists": False}}, {"last_login": 1})
+    ops = [UpdateOne({"_id": u["_id"]}, {"$set": {"remind_at": u["last_login"] + timedelta(hours=24)}}) for u in legacy]
+    if ops: wallets_col.bulk_write(ops, ordered=False)
+    job_scheduler.seed("login_reminder_sweep", [("all", datetime.now(), None)])
+
+@job_scheduler.handler("login_reminder_sweep", seed=seed_login_reminder_sweep)
+async def check_login_reminders(job):
+    """Pings every user whose login cooldown has expired, several mentions per message."""
+    channel = messageable(LOGIN_LOG_CHANNEL_ID)
     
-    # FIX: Use the variable directly, do not use ["login_log"]
-    channel = bot.get_channel(LOGIN_LOG_CHANNEL_ID)
+    now = datetime.now()
+    due = list(wallets_col.find({"remind_at": {"$lte": now}}, {"user_id": 1, "remind_at": 1, "login_streak": 1, "remind_login": 1}))
+    
+    # Claim before pinging: compare-and-set on remind_at, tagged with this sweep. A second sweep running
+    # at the same time, or a fresh /login, leaves the wallet unclaimed here, so nobody is pinged twice
+    claimed = set()
+    if due:
+        sweep_id = uuid.uuid4().hex
+        wallets_col.bulk_write([
+            UpdateOne({"_id": u["_id"], "remind_at": u["remind_at"]}, {"$set": {"reminder_sent": True, "reminder_sweep": sweep_id}, "$unset": {"remind_at": ""}})
+            for u in due
+        ], ordered=False)
+        claimed = {w["_id"] for w in wallets_col.find({"_id": {"$in": [u["_id"] for u in due]}, "reminder_sweep": sweep_id}, {"_id": 1})}
+    
+    # OFFINE CATCH-UP LOGIC:
+    # Only remind if the deadline passed within the last 12 hours.
+    ready = [u for u in due if u["_id"] in claimed and u.get("remind_login") and now - u["remind_at"] < timedelta(hours=12)]
+    
+    for i in range(0, len(ready), LOGIN_PINGS_PER_MESSAGE):
+        batch = ready[i:i + LOGIN_PINGS_PER_MESSAGE]
+        # Construct Premium Embed
+        streaks = "\n".join(f"<@{u['user_id']}> — **{u.get('login_streak', 0)} Days**" for u in batch)
+        embed = discord.Embed(
+            title=f"{E_TIMER} Login Ready!",
+            description=f"Your 24-hour cooldown has ended.\nUse `/login` now to keep your streak alive!\n\n{E_BOOST} **Current Streaks**\n{streaks}",
+            color=0x3498db
+        )
+        embed.set_footer(text="Disable this via /remindlogin")
+        if bot.user.avatar: embed.set_thumbnail(url=bot.user.avatar.url)
+
+        # Send Ping + Embed
+        try: await channel.send(content=" ".join(f"<@{u['user_id']}>" for u in batch), embed=embed)
+        except Exception as e: print(f"[Reminder Sweep Error] {e}")
     
-    if not channel:
-        print(f"[Warning] Login Log Channel (ID: {LOGIN_LOG_CHANNEL_ID}) not found.")
-    
-    while not bot.is_closed():
-        if channel:
-            now = datetime.now()
-            # Find users who:
-            # 1. Have reminders enabled
-            # 2. Have NOT been reminded yet for this cycle
-            # 3. Have a last_login date recorded
-            users = wallets_col.find({
-                "remind_login": True,
-                "reminder_sent": False, # This flag resets when they use .login
-                "last_login": {"$ne": None}
-            })
-
-            for user in users:
-                try:
-                    last_login = user["last_login"]
-                    # Ensure last_login is datetime
-                    if not isinstance(last_login, datetime): continue
-                    
-                    next_claim = last_login + timedelta(hours=24)
-                    
-                    # Check if time has passed
-                    if now >= next_claim:
-                        # OFFINE CATCH-UP LOGIC:
-                        # Only remind if the deadline passed within the last 12 hours.
-                        time_diff = now - next_claim
-                        if time_diff < timedelta(hours=12):
-                            # Construct Premium Embed
-                            embed = discord.Embed(
-                                title=f"{E_TIMER} Login Ready!",
-                                description=f"Your 24-hour cooldown has ended.\nUse `/login` now to keep your streak alive!",
-                                color=0x3498db
-                            )
-                            embed.add_field(name=f"{E_BOOST} Current Streak", value=f"**{user.get('login_streak', 0)} Days**", inline=True)
-                            embed.set_footer(text="Disable this via /remindlogin")
-                            if bot.user.avatar: embed.set_thumbnail(url=bot.user.avatar.url)
-
-                            # Send Ping + Embed
-                            await channel.send(content=f"<@{user['user_id']}>", embed=embed)
-
-                        # Mark as sent so we don't spam
-                        wallets_col.update_one({"_id": user["_id"]}, {"$set": {"reminder_sent": True}})
-                except Exception as e:
-                    print(f"[Reminder Loop Error] {e}")
-
-        await asyncio.sleep(60) # Check every minute
+    upcoming = wallets_col.find_one({"remind_at": {"$type": "date"}}, {"remind_at": 1}, sort=[("remind_at", 1)])
+    if upcoming: job_scheduler.schedule("login_reminder_sweep", "all", max(datetime.now(), upcoming["remind_at"]))
 
 # ==============================================================================
 #  DUELIST SYSTEM: CORE & EVENTS
@@ -3958,11 +5413,14 @@ async def login(ctx):
             "$set": {
                 "last_login": now, 
                 "login_streak": current_streak,
-                "reminder_sent": False # <--- CRITICAL: Resets the reminder for next time
+                "reminder_sent": False, # <--- CRITICAL: Resets the reminder for next time
+                **({"remind_at": now + timedelta(hours=24)} if user_data.get("remind_login") else {})
             }
         },
         upsert=True
     )
+    if user_data.get("remind_login"):
+        wake_login_sweep(now + timedelta(hours=24))
     
     await update_quest(ctx.author.id, "login", 1)           # Daily Task
     await update_quest(ctx.author.id, "login_days", 1)      # Weekly/Monthly/Yearly
@@ -4009,9 +5467,10 @@ async def groupinfo(ctx, *, group_name: str):
     if g.get('logo'): embed.set_thumbnail(url=g['logo'])
     embed.add_field(name="Bank", value=f"{E_MONEY} ${g['funds']:,}", inline=True)
     mlist = []
+    users = await user_resolver.resolve_many([m['user_id'] for m in members[:15]])
     for m in members[:15]:
-        try: u = await bot.fetch_user(int(m['user_id'])); name = u.name
-        except: name = "Unknown"
+        u = users.get(int(m['user_id'])) if str(m['user_id']).isdigit() else None
+        name = u.name if u else "Unknown"
         mlist.append(f"{E_ARROW} {name}: {m['share_percentage']}%")
     if len(members) > 15: mlist.append(f"...and {len(members)-15} more.")
     embed.add_field(name=f"Members ({len(members)})", value="\n".join(mlist) or "None", inline=False)
@@ -4384,11 +5843,23 @@ def min_required_bid(current):
     add = current * MIN_INCREMENT_PERCENT / 100
     return int(current + max(1, round(add)))
 
+def max_outbid(amount):
+    """Highest standing bid that `amount` still beats by the minimum increment."""
+    lo, hi = 0, amount
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if min_required_bid(mid) <= amount: lo = mid
+        else: hi = mid - 1
+    return lo if min_required_bid(lo) <= amount else -1
+
 def get_current_bid(item_type=None, item_id=None):
     if db is None: return 0
     if item_type and item_id is not None:
-        bid = bids_col.find_one({"item_type": item_type, "item_id": int(item_id)}, sort=[("amount", -1)])
-        if bid: return bid["amount"]
+        auc = timed_auctions_col.find_one({"item_type": item_type, "item_id": int(item_id), "live": True}, {"high_bid": 1})
+        if auc and auc.get("high_bid"): return auc["high_bid"]["amount"]
+    return item_base_price(item_type, item_id)
+
+def item_base_price(item_type, item_id):
     if item_type == "club":
         c = clubs_col.find_one({"id": int(item_id)})
         return c["base_price"] if c else 0
@@ -4397,38 +5868,70 @@ def get_current_bid(item_type=None, item_id=None):
         return d["base_price"] if d else 0
     return 0
 
-async def finalize_auction(item_type: str, item_id: int, channel_id: int):
-    if db is None: return
-    winner_bid = bids_col.find_one({"item_type": item_type, "item_id": int(item_id)}, sort=[("amount", -1)])
-    channel = bot.get_channel(channel_id)
-    club_item = clubs_col.find_one({"id": int(item_id)}) if item_type == "club" else None
+def auction_step(auc, step):
+    """Marks a side effect that can't be repeated (the announcement) as done. False if an earlier run
+    already did it, so a crash right after marking loses the message rather than sending it twice."""
+    return timed_auctions_col.update_one({"_id": auc["_id"], "steps": {"$ne": step}}, {"$push": {"steps": step}}).modified_count == 1
+
+async def finalize_auction(item_type: str, item_id: int, channel_id: int, due_only: bool = False, forced_bid: dict = None):
+    """Settles an auction exactly once. Safe to call again after a crash part-way through."""
+    if db is None: return True
+    item_id = int(item_id)
+    match = {"item_type": item_type, "item_id": item_id, "live": True}
+    claim = {**match, "status": "open"}
+    if due_only: claim["ends_at"] = {"$lte": datetime.now()}
+    
+    # Claim the open auction, or pick up one a previous run left half-settled
+    auc = timed_auctions_col.find_one_and_update(claim, {"$set": {"status": "settling"}}, return_document=ReturnDocument.AFTER) \
+        or timed_auctions_col.find_one({**match, "status": "settling"})
+    if not auc:
+        if due_only: return False # A late bid pushed the end time out
+        auc = {**match, "status": "settling", "channel_id": channel_id, "started_at": datetime.now(), "ends_at": datetime.now(), "extensions": 0}
+        try: timed_auctions_col.insert_one(auc) # forcewinner on an item with no running auction
+        except DuplicateKeyError: return False
+    
+    # Freeze the winner on the auction doc so a resumed run settles the same bid
+    if "winner" not in auc:
+        bid = forced_bid or auc.get("high_bid") or {}
+        winner = {"bidder": bid["bidder"], "amount": int(bid["amount"])} if bid.get("bidder") else None
+        timed_auctions_col.update_one({"_id": auc["_id"], "winner": {"$exists": False}}, {"$set": {"winner": winner}})
+        auc = timed_auctions_col.find_one({"_id": auc["_id"]})
+    
+    winner_bid = auc["winner"]
+    channel = bot.get_channel(channel_id or auc.get("channel_id"))
+    club_item = clubs_col.find_one({"id": item_id}) if item_type == "club" else None
     
     if winner_bid:
         bidder_str = winner_bid["bidder"]
-        amount = int(winner_bid["amount"])
+        amount = winner_bid["amount"]
+        # Charge and hand over in one settlement. Keyed to the auction, so a run resumed after a crash
+        # finishes a half-applied settlement instead of skipping or repeating its writes
+        settle = Settlement(f"auction {item_type} {item_id}", key=f"auction:{auc['_id']}")
+        settle.guard(timed_auctions_col, {"_id": auc["_id"], "steps": {"$ne": "charge"}}, {"$push": {"steps": {"$each": ["charge", "transfer"]}}})
         if bidder_str.startswith('group:'):
             gname = bidder_str.replace('group:', '').lower()
-            groups_col.update_one({"name": gname}, {"$inc": {"funds": -amount}})
+            settle.update(groups_col, {"name": gname}, {"$inc": {"funds": -amount}})
         else:
-            wallets_col.update_one({"user_id": bidder_str}, {"$inc": {"balance": -amount}})
-            log_user_activity(bidder_str, "Transaction", f"Paid ${amount:,} for Auction {item_type} {item_id}")
+            settle.update(wallets_col, {"user_id": bidder_str}, {"$inc": {"balance": -amount}})
+            settle.insert(activities_col, activity_doc(bidder_str, "Transaction", f"Paid ${amount:,} for Auction {item_type} {item_id}"))
             
         if item_type == "club":
             old_owner = club_item.get("owner_id")
             if old_owner and not old_owner.startswith("group:"):
-                profiles_col.update_one({"user_id": old_owner}, {"$unset": {"owned_club_id": "", "owned_club_share": ""}})
-                past_entities_col.insert_one({"user_id": str(old_owner), "type": "ex_owner", "name": club_item["name"], "timestamp": datetime.now()})
-            history_col.insert_one({"club_id": int(item_id), "winner": bidder_str, "amount": amount, "timestamp": datetime.now(), "market_value_at_sale": club_item.get("value", 0)})
-            clubs_col.update_one({"id": int(item_id)}, {"$set": { "owner_id": bidder_str, "last_bid_price": amount, "value": amount, "ex_owner_id": old_owner }})
+                settle.update(profiles_col, {"user_id": old_owner}, {"$unset": {"owned_club_id": "", "owned_club_share": ""}})
+                settle.insert(past_entities_col, {"user_id": str(old_owner), "type": "ex_owner", "name": club_item["name"], "timestamp": datetime.now()})
+            settle.insert(history_col, {"club_id": item_id, "winner": bidder_str, "amount": amount, "timestamp": datetime.now(), "market_value_at_sale": club_item.get("value", 0)})
+            settle.update(clubs_col, {"id": item_id}, {"$set": { "owner_id": bidder_str, "last_bid_price": amount, "value": amount, "ex_owner_id": old_owner }})
             if not bidder_str.startswith('group:'):
-                profiles_col.update_one({"user_id": bidder_str}, {"$set": {"owned_club_id": int(item_id), "owned_club_share": 100}}, upsert=True)
-                log_user_activity(bidder_str, "Win", f"Won Auction for Club {club_item['name']}")
-            if channel:
+                settle.update(profiles_col, {"user_id": bidder_str}, {"$set": {"owned_club_id": item_id, "owned_club_share": 100}}, upsert=True)
+                settle.insert(activities_col, activity_doc(bidder_str, "Win", f"Won Auction for Club {club_item['name']}"))
+            settle.commit()
+            if channel and auction_step(auc, "announce"):
                 await channel.send(embed=create_embed(f"{E_GIVEAWAY} AUCTION SOLD", f"{E_SUCCESS} **New Owner:** {bidder_str}\n{E_ITEMBOX} **Club:** {club_item['name']}\n{E_MONEY} **Final Price:** ${amount:,}\n{E_STARS} **New Market Value:** ${amount:,}", 0xf1c40f, thumbnail=club_item.get("logo")))
         else: 
-            d_item = duelists_col.find_one({"id": int(item_id)})
+            d_item = duelists_col.find_one({"id": item_id})
             salary = d_item["expected_salary"]
-            contracts_col.insert_one({"duelist_id": int(item_id), "club_owner": bidder_str, "purchase_price": amount, "salary": salary, "signed_at": datetime.now()})
+            settle.insert(contracts_col, {"duelist_id": item_id, "club_owner": bidder_str, "purchase_price": amount, "salary": salary, "signed_at": datetime.now()})
             target_club_id = None
             if bidder_str.startswith('group:'):
                 gname = bidder_str.replace('group:', '').lower()
@@ -4437,62 +5940,225 @@ async def finalize_auction(item_type: str, item_id: int, channel_id: int):
             else:
                 c = clubs_col.find_one({"owner_id": bidder_str})
                 if c: target_club_id = c['id']
-            duelists_col.update_one({"id": int(item_id)}, {"$set": {"owned_by": bidder_str, "club_id": target_club_id}})
-            wallets_col.update_one({"user_id": d_item["discord_user_id"]}, {"$inc": {"balance": amount}}, upsert=True)
-            log_user_activity(d_item["discord_user_id"], "Transaction", f"Received ${amount:,} Signing Fee.")
-            if channel:
+            settle.update(duelists_col, {"id": item_id}, {"$set": {"owned_by": bidder_str, "club_id": target_club_id}})
+            settle.update(wallets_col, {"user_id": d_item["discord_user_id"]}, {"$inc": {"balance": amount}}, upsert=True)
+            settle.insert(activities_col, activity_doc(d_item["discord_user_id"], "Transaction", f"Received ${amount:,} Signing Fee."))
+            settle.commit()
+            if channel and auction_step(auc, "announce"):
                  await channel.send(embed=create_embed(f"{E_GIVEAWAY} DUELIST SIGNED", f"{E_SUCCESS} **Signed To:** {bidder_str}\n{E_ITEMBOX} **Player:** {d_item['username']}\n{E_MONEY} **Transfer Fee:** ${amount:,}", 0x9b59b6, thumbnail=d_item.get('avatar_url')))
     else:
-        if channel: await channel.send(embed=create_embed(f"{E_TIMER} Auction Ended", "No bids were placed.", color=0x95a5a6))
-    bids_col.delete_many({"item_type": item_type, "item_id": int(item_id)})
+        if channel and auction_step(auc, "announce"): await channel.send(embed=create_embed(f"{E_TIMER} Auction Ended", "No bids were placed.", color=0x95a5a6))
+    timed_auctions_col.update_one({"_id": auc["_id"]}, {"$set": {"status": "settled", "settled_at": datetime.now()}, "$unset": {"live": ""}})
     active_timers.pop((item_type, str(item_id)), None)
+    club_proxies.clear((item_type, str(item_id)))
+    return True
+
+async def run_auction_timer(item_type: str, item_id: int):
+    """Sleeps until the stored end time, re-reading it so anti-snipe extensions are honoured."""
+    key = (item_type, str(item_id))
+    try:
+        while True:
+            auc = timed_auctions_col.find_one({"item_type": item_type, "item_id": int(item_id), "live": True})
+            if not auc: return
+            delay = (auc["ends_at"] - datetime.now()).total_seconds()
+            if auc["status"] == "open" and delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if await finalize_auction(item_type, item_id, auc["channel_id"], due_only=True): return
+    except Exception as e:
+        print(f"[Auction Timer] {item_type} {item_id}: {e}")
+    finally:
+        if active_timers.get(key) is asyncio.current_task(): active_timers.pop(key, None)
+
+def arm_auction_timer(item_type: str, item_id: int):
+    key = (item_type, str(item_id))
+    if active_timers.get(key) and not active_timers[key].done(): return # The running timer re-reads ends_at
+    active_timers[key] = bot.loop.create_task(run_auction_timer(item_type, int(item_id)))
 
 def schedule_auction_timer(item_type: str, item_id: int, channel_id: int):
+    """Opens (or restarts) an auction at the item's base price with a fresh TIME_LIMIT clock."""
+    if db is None: return
+    now = datetime.now()
+    match = {"item_type": item_type, "item_id": int(item_id), "live": True, "status": "open"}
+    high_bid = {"bidder": None, "amount": item_base_price(item_type, item_id), "at": now}
+    update = {"$set": {"ends_at": now + timedelta(seconds=TIME_LIMIT), "extensions": 0, "channel_id": channel_id, "high_bid": high_bid}, "$setOnInsert": {"started_at": now}}
+    try:
+        timed_auctions_col.update_one(match, update, upsert=True)
+    except DuplicateKeyError:
+        return # Already settling
+    club_proxies.clear((item_type, str(item_id)))
+    arm_auction_timer(item_type, item_id)
+
+def place_high_bid(item_type: str, item_id: int, bidder: str, amount: int, channel_id: int):
+    """Compare-and-set on the auction doc: the bid only lands if it beats the stored high bid by the
+    minimum increment, and the same write pushes the anti-snipe clock out. None if it lost the race."""
+    if db is None: return None
+    now = datetime.now()
+    item_id = int(item_id)
+    ceiling = max_outbid(amount)
+    match = {"item_type": item_type, "item_id": item_id, "live": True}
+    beats = {"high_bid.amount": {"$lte": ceiling}} # Open docs always carry high_bid (see rehydrate_auction_timers)
+    high_bid = {"bidder": bidder, "amount": amount, "at": now}
+    update = {"$set": {"high_bid": high_bid, "channel_id": channel_id}, "$max": {"ends_at": now + timedelta(seconds=TIME_LIMIT)}, "$inc": {"extensions": 1}}
+    auc = None
+    for _ in range(2):
+        auc = timed_auctions_col.find_one_and_update({**match, "status": "open", **beats}, update, return_document=ReturnDocument.AFTER)
+        if auc: break
+        if timed_auctions_col.find_one(match, {"_id": 1}): return None # Outbid, or the hammer already fell
+        # Nothing running for this item yet: the first valid bid opens the auction
+        if item_base_price(item_type, item_id) > ceiling: return None
+        auc = {**match, "status": "open", "high_bid": high_bid, "channel_id": channel_id, "started_at": now, "ends_at": now + timedelta(seconds=TIME_LIMIT), "extensions": 0}
+        try:
+            timed_auctions_col.insert_one(auc)
+            break
+        except DuplicateKeyError:
+            auc = None # Someone opened it first; retry against their doc
+    if not auc: return None
+    bids_col.insert_one({"bidder": bidder, "amount": amount, "item_type": item_type, "item_id": item_id, "auction_id": auc["_id"], "timestamp": now})
+    arm_auction_timer(item_type, item_id)
+    return auc
+
+class ProxyBook:
+    """Private max bids, resolved in memory. The leader ends up one minimum increment over the
+    runner-up's max (never above their own), so a whole bidding war costs a single write."""
+    def __init__(self):
+        self.maxes = {} # auction key -> {bidder: max}, in registration order
+
+    def set(self, key, bidder, amount):
+        book = self.maxes.setdefault(key, {})
+        book.pop(bidder, None) # Re-registering moves you to the back of the tie order
+        book[bidder] = amount
+
+    def drop(self, key, bidder):
+        self.maxes.get(key, {}).pop(bidder, None)
+
+    def clear(self, key):
+        self.maxes.pop(key, None)
+
+    def resolve(self, key, current, leader, step, funds):
+        """(bidder, amount) the high bid should move to, or None if the standing bid holds.
+        `step(x)` is the minimum bid over x, `funds(bidder)` what they can still cover."""
+        while True:
+            book = self.maxes.get(key) or {}
+            floor = step(current)
+            values = [(leader, max(current, book.get(leader, 0)))] if leader is not None else []
+            values += [(b, m) for b, m in book.items() if b != leader and m >= floor]
+            if [b for b, _ in values] in ([], [leader]): return None
+            top, top_max = max(values, key=lambda v: v[1]) # First maximum wins ties: the leader, then earliest registered
+            others = [m for b, m in values if b != top]
+            price = min(top_max, step(max(others))) if others else floor
+            if top == leader and price <= current: return None
+            if funds(top) >= price: return top, price
+            self.drop(key, top) # Can't cover it any more
+
+club_proxies = ProxyBook()
+
+def club_proxy_funds(bidder):
+    w = wallets_col.find_one({"user_id": str(bidder)}, {"balance": 1})
+    return w.get("balance", 0) if w else 0
+
+def apply_proxy_bids(item_type, item_id, channel_id):
+    """Lets registered max bids answer the standing high bid. Returns (bidder, amount, leader_changed) if it moved."""
     key = (item_type, str(item_id))
-    if active_timers.get(key) and not active_timers.get(key).done(): active_timers[key].cancel()
-    loop = asyncio.get_event_loop()
-    t = loop.create_task(asyncio.sleep(TIME_LIMIT))
-    async def wrapper():
-        try: await t; await finalize_auction(item_type, item_id, channel_id)
-        except asyncio.CancelledError: return
-    active_timers[key] = loop.create_task(wrapper())
+    if not club_proxies.maxes.get(key): return None
+    for _ in range(3):
+        auc = timed_auctions_col.find_one({"item_type": item_type, "item_id": int(item_id), "live": True}, {"high_bid": 1, "status": 1})
+        if auc and auc["status"] != "open": return None
+        hb = (auc or {}).get("high_bid") or {}
+        current = hb.get("amount", item_base_price(item_type, item_id))
+        res = club_proxies.resolve(key, current, hb.get("bidder"), min_required_bid, club_proxy_funds)
+        if not res: return None
+        if place_high_bid(item_type, item_id, res[0], res[1], channel_id): return res[0], res[1], res[0] != hb.get("bidder")
+    return None # Lost the race three times; the next bid re-runs it
+
+async def reply_privately(ctx, embed):
+    """Ephemeral for slash commands; prefix commands lose their message and get a DM instead."""
+    if ctx.interaction: return await ctx.send(embed=embed, ephemeral=True)
+    try: await ctx.message.delete()
+    except: pass
+    try: await ctx.author.send(embed=embed)
+    except: pass
 
-@bot.hybrid_command(name="placebid", aliases=["pb"], description="Place a bid.")
-async def placebid(ctx, amount: HumanInt, item_type: str, item_id: int, club_name: str = None):
-    if bidding_frozen: return await ctx.send(embed=create_embed("Frozen", f"{E_DANGER} Auctions frozen.", 0xff0000))
-    item_type = item_type.lower()
-    
+def bid_eligibility_error(ctx, item_type, item_id, club_name, amount):
+    """Shared checks for placebid/maxbid. Returns an error embed, or None if the bid may go in."""
     if item_type == "duelist":
         d = duelists_col.find_one({"id": int(item_id)})
         is_active = (item_type, str(item_id)) in active_timers
-        if d.get("owned_by") and not is_active: return await ctx.send(embed=create_embed(f"{E_ALERT} Sold Out", f"{E_ERROR} This duelist is already signed.", 0xff0000))
-        if not club_name: return await ctx.send(embed=create_embed("Error", "Provide club name.", 0xff0000))
+        if d.get("owned_by") and not is_active: return create_embed(f"{E_ALERT} Sold Out", f"{E_ERROR} This duelist is already signed.", 0xff0000)
+        if not club_name: return create_embed("Error", "Provide club name.", 0xff0000)
         c = clubs_col.find_one({"name": {"$regex": f"^{club_name}$", "$options": "i"}})
-        if not c: return await ctx.send(embed=create_embed("Error", "Club not found.", 0xff0000))
+        if not c: return create_embed("Error", "Club not found.", 0xff0000)
         allowed = False
         if str(ctx.author.id) == c.get("owner_id"): allowed = True
         elif c.get("owner_id", "").startswith("group:"):
             gname = c.get("owner_id").replace("group:", "")
             if group_members_col.find_one({"group_name": gname, "user_id": str(ctx.author.id)}): allowed = True
-        if not allowed: return await ctx.send(embed=create_embed("Error", "You/Group don't own this club.", 0xff0000))
+        if not allowed: return create_embed("Error", "You/Group don't own this club.", 0xff0000)
     
     if item_type == "club":
          c = clubs_col.find_one({"id": int(item_id)})
-         if not c: return await ctx.send(embed=create_embed("Error", "Club not found.", 0xff0000))
+         if not c: return create_embed("Error", "Club not found.", 0xff0000)
          is_active = (item_type, str(item_id)) in active_timers
-         if c.get("owner_id") and not is_active: return await ctx.send(embed=create_embed("Sold Out", f"{E_ERROR} This club is **SOLD OUT**. Wait for owner to sell.", 0xff0000))
+         if c.get("owner_id") and not is_active: return create_embed("Sold Out", f"{E_ERROR} This club is **SOLD OUT**. Wait for owner to sell.", 0xff0000)
          prof = profiles_col.find_one({"user_id": str(ctx.author.id)})
-         if prof and prof.get("owned_club_id"): return await ctx.send(embed=create_embed("Error", f"{E_ERROR} You already own a club (100%). Sell it first.", 0xff0000))
+         if prof and prof.get("owned_club_id"): return create_embed("Error", f"{E_ERROR} You already own a club (100%). Sell it first.", 0xff0000)
     
     w = wallets_col.find_one({"user_id": str(ctx.author.id)})
-    if not w or w.get("balance", 0) < amount: return await ctx.send(embed=create_embed("Error", "Insufficient funds.", 0xff0000))
-    req = min_required_bid(get_current_bid(item_type, item_id))
-    if amount < req: return await ctx.send(embed=create_embed("Bid Error", f"Min bid is ${req:,}", 0xff0000))
+    if not w or w.get("balance", 0) < amount: return create_embed("Error", "Insufficient funds.", 0xff0000)
+    return None
+
+@supervisor.once("auction_timers", lease=gateway_lease)
+def rehydrate_auction_timers():
+    """Re-arms every open auction (and resumes half-settled ones) after a restart."""
+    if db is None: return
+    # Auctions opened before the high bid lived on the doc: carry over their top bid from bids_col (which
+    # was wiped per item back then), else the base price like resetauction. Bids on them fail until this runs.
+    for auc in timed_auctions_col.find({"status": "open", "high_bid": {"$exists": False}}, {"item_type": 1, "item_id": 1}):
+        top = bids_col.find_one({"item_type": auc["item_type"], "item_id": auc["item_id"], "auction_id": {"$exists": False}}, sort=[("amount", -1)])
+        high_bid = {"bidder": top["bidder"], "amount": top["amount"], "at": top.get("timestamp") or datetime.now()} if top else {"bidder": None, "amount": item_base_price(auc["item_type"], auc["item_id"]), "at": datetime.now()}
+        timed_auctions_col.update_one({"_id": auc["_id"], "high_bid": {"$exists": False}}, {"$set": {"high_bid": high_bid}})
+    pending = list(timed_auctions_col.find({"status": {"$in": ["open", "settling"]}}, {"item_type": 1, "item_id": 1}))
+    for auc in pending: arm_auction_timer(auc["item_type"], auc["item_id"])
+    if pending: print(f"[Auction Timer] Rehydrated {len(pending)} auction timers.")
+
+@bot.hybrid_command(name="placebid", aliases=["pb"], description="Place a bid.")
+async def placebid(ctx, amount: HumanInt, item_type: str, item_id: int, club_name: str = None):
+    if bidding_frozen: return await ctx.send(embed=create_embed("Frozen", f"{E_DANGER} Auctions frozen.", 0xff0000))
+    item_type = item_type.lower()
+    
+    err = bid_eligibility_error(ctx, item_type, item_id, club_name, amount)
+    if err: return await ctx.send(embed=err)
+    if not place_high_bid(item_type, item_id, str(ctx.author.id), amount, ctx.channel.id):
+        req = min_required_bid(get_current_bid(item_type, item_id))
+        return await ctx.send(embed=create_embed("Bid Error", f"Min bid is ${req:,}", 0xff0000))
     
-    bids_col.insert_one({"bidder": str(ctx.author.id), "amount": amount, "item_type": item_type, "item_id": int(item_id), "timestamp": datetime.now()})
     log_user_activity(ctx.author.id, "Bid", f"Placed bid of ${amount:,} on {item_type} {item_id}")
     await ctx.send(embed=create_embed(f"{E_SUCCESS} Bid Placed", f"Bid of **${amount:,}** accepted.", 0x2ecc71))
-    schedule_auction_timer(item_type, item_id, ctx.channel.id)
+    await announce_proxy_answer(ctx, item_type, item_id)
+
+async def announce_proxy_answer(ctx, item_type, item_id):
+    answer = apply_proxy_bids(item_type, item_id, ctx.channel.id)
+    if answer and answer[2]:
+        await ctx.send(embed=create_embed(f"{E_ALERT} Outbid", f"A max bid answered instantly: <@{answer[0]}> now leads {item_type} {item_id} at **${answer[1]:,}**.", 0xe67e22))
+
+@bot.hybrid_command(name="maxbid", aliases=["mb"], description="Privately set the most you'll pay; the bot bids for you.")
+async def maxbid(ctx, amount: HumanInt, item_type: str, item_id: int, club_name: str = None):
+    if bidding_frozen: return await ctx.send(embed=create_embed("Frozen", f"{E_DANGER} Auctions frozen.", 0xff0000))
+    item_type = item_type.lower()
+    
+    err = bid_eligibility_error(ctx, item_type, item_id, club_name, amount)
+    if err: return await reply_privately(ctx, err)
+    club_proxies.set((item_type, str(item_id)), str(ctx.author.id), amount)
+    answer = apply_proxy_bids(item_type, item_id, ctx.channel.id)
+    
+    lead = get_current_bid(item_type, item_id)
+    auc = timed_auctions_col.find_one({"item_type": item_type, "item_id": int(item_id), "live": True}, {"high_bid": 1})
+    leading = ((auc or {}).get("high_bid") or {}).get("bidder") == str(ctx.author.id)
+    status = f"You lead at **${lead:,}**." if leading else f"Your max doesn't beat the standing bid of **${lead:,}**."
+    await reply_privately(ctx, create_embed(f"{E_SUCCESS} Max Bid Set", f"The bot will bid for you on {item_type} {item_id} up to **${amount:,}**, one minimum step at a time.\n{status}", 0x2ecc71))
+    log_user_activity(ctx.author.id, "Bid", f"Set a max bid on {item_type} {item_id}")
+    if answer and answer[2]:
+        await ctx.channel.send(embed=create_embed(f"{E_AUCTION} New Leader", f"<@{answer[0]}> leads {item_type} {item_id} at **${answer[1]:,}**.", 0x3498db))
 
 @bot.hybrid_command(name="groupbid", aliases=["gb"], description="Place a bid using group funds.")
 async def groupbid(ctx, group_name: str, amount: HumanInt, item_type: str, item_id: int, club_name: str = None):
@@ -4514,10 +6180,12 @@ async def groupbid(ctx, group_name: str, amount: HumanInt, item_type: str, item_
         c = clubs_col.find_one({"name": {"$regex": f"^{club_name}$", "$options": "i"}})
         if not c or c.get("owner_id") != f"group:{gname}": return await ctx.send(embed=create_embed("Error", "Group doesn't own club.", 0xff0000))
     if g["funds"] < amount: return await ctx.send(embed=create_embed("Error", "Insufficient funds.", 0xff0000))
-    bids_col.insert_one({"bidder": f"group:{gname}", "amount": amount, "item_type": item_type, "item_id": int(item_id)})
+    if not place_high_bid(item_type, item_id, f"group:{gname}", amount, ctx.channel.id):
+        req = min_required_bid(get_current_bid(item_type, item_id))
+        return await ctx.send(embed=create_embed("Bid Error", f"Min bid is ${req:,}", 0xff0000))
     log_user_activity(ctx.author.id, "Bid", f"Group bid ${amount:,} on {item_type} {item_id}")
     await ctx.send(embed=create_embed(f"{E_SUCCESS} Group Bid", f"Group **{group_name}** bid **${amount:,}**.", 0x2ecc71))
-    schedule_auction_timer(item_type, item_id, ctx.channel.id)
+    await announce_proxy_answer(ctx, item_type, item_id)
 
 @bot.hybrid_command(name="sellclub", aliases=["sc"], description="Sell your club.")
 async def sellclub(ctx, club_name: str, buyer: discord.Member = None):
@@ -4531,18 +6199,19 @@ async def sellclub(ctx, club_name: str, buyer: discord.Member = None):
     except: return await ctx.send(embed=create_embed("Info", "Timed out.", 0x95a5a6))
     if msg.content.lower() == 'no': return await ctx.send(embed=create_embed("Info", "Cancelled.", 0x95a5a6))
     old_owner = c.get("owner_id")
-    if old_owner:
-        profiles_col.update_one({"user_id": old_owner}, {"$unset": {"owned_club_id": "", "owned_club_share": ""}})
-        log_past_entity(old_owner, "ex_owner", c['name'])
+    # The club guard stops the same club being sold twice from two confirmations
+    settle = Settlement(f"club sale {c['id']}")
+    settle.guard(clubs_col, {"id": c["id"], "owner_id": old_owner}, {"$set": {"owner_id": str(buyer.id) if buyer else None, "ex_owner_id": old_owner}})
     if buyer:
         bw = wallets_col.find_one({"user_id": str(buyer.id)})
         if not bw or bw.get("balance", 0) < val: return await ctx.send(embed=create_embed("Error", "Buyer broke.", 0xff0000))
-        wallets_col.update_one({"user_id": str(buyer.id)}, {"$inc": {"balance": -val}})
-        clubs_col.update_one({"id": c["id"]}, {"$set": {"owner_id": str(buyer.id), "ex_owner_id": old_owner}})
-        profiles_col.update_one({"user_id": str(buyer.id)}, {"$set": {"owned_club_id": c["id"], "owned_club_share": 100}}, upsert=True)
-    else:
-        clubs_col.update_one({"id": c["id"]}, {"$set": {"owner_id": None, "ex_owner_id": old_owner}})
-    wallets_col.update_one({"user_id": str(ctx.author.id)}, {"$inc": {"balance": val}}, upsert=True)
+        settle.debit(wallets_col, {"user_id": str(buyer.id)}, "balance", val)
+        settle.update(profiles_col, {"user_id": str(buyer.id)}, {"$set": {"owned_club_id": c["id"], "owned_club_share": 100}}, upsert=True)
+    if old_owner:
+        settle.update(profiles_col, {"user_id": old_owner}, {"$unset": {"owned_club_id": "", "owned_club_share": ""}})
+        settle.insert(past_entities_col, {"user_id": str(old_owner), "type": "ex_owner", "name": c['name'], "timestamp": datetime.now()})
+    settle.update(wallets_col, {"user_id": str(ctx.author.id)}, {"$inc": {"balance": val}}, upsert=True)
+    if not settle.commit(): return await ctx.send(embed=create_embed("Error", "Sale failed: the club changed hands or the buyer is short.", 0xff0000))
     embed_log = create_embed(f"{E_ADMIN} Club Sold", f"**Club:** {c['name']}\n**Seller:** {ctx.author.mention}\n**Buyer:** {target.mention if buyer else 'Market'}\n**Price:** ${val:,}", 0xe67e22)
     await send_log("club", embed_log)
     log_user_activity(ctx.author.id, "Sale", f"Sold club {c['name']} for ${val:,}")
@@ -4694,20 +6363,18 @@ async def clubinfo(ctx, *, club_name_or_id: str):
     except: c = clubs_col.find_one({"name": {"$regex": f"^{club_name_or_id}$", "$options": "i"}})
     if not c: return await ctx.send(embed=create_embed("Error", f"{E_ERROR} Club not found.", 0xff0000))
     owner_display = c.get('owner_id') or "Unowned"
+    users = await user_resolver.resolve_many([c.get("manager_id"), c.get("owner_id")]) # Skips group:/None
     manager_name = "None"
     if c.get("manager_id"):
-        try: m = await bot.fetch_user(int(c["manager_id"])); manager_name = m.name
-        except: manager_name = "Unknown"
+        m = users.get(int(c["manager_id"])) if str(c["manager_id"]).isdigit() else None
+        manager_name = m.name if m else "Unknown"
     shareholder_text = ""
     if owner_display.startswith('group:'): 
         gname = owner_display.replace('group:', '').title()
         owner_display = f"Group: {gname}"
     else:
-        try:
-            if owner_display != "Unowned":
-                owner_user = await bot.fetch_user(int(owner_display))
-                owner_display = f"User: {owner_user.display_name}"
-        except: pass
+        owner_user = users.get(int(owner_display)) if owner_display.isdigit() else None
+        if owner_user: owner_display = f"User: {owner_user.display_name}"
     duelists = list(duelists_col.find({"club_id": c['id']}))
     d_list = "\n".join([f"{E_ARROW} {d['username']}" for d in duelists]) or "None"
     embed = discord.Embed(title=f"{E_CROWN} {c['name']}", description=f"{E_BOOST} **{c.get('level_name')}**{shareholder_text}", color=0x3498db)
@@ -4899,23 +6566,25 @@ class TradeFinalView(View):
         # 2. Execute Transfers
         u1, u2 = self.session.users[0], self.session.users[1]
         
-        # Function to transfer assets from sender to receiver
+        settle = Settlement(f"trade {u1}-{u2}")
+        
+        # Function to transfer assets from sender to receiver (debits are guarded, so a spend in between aborts the trade)
         def transfer_assets(sender, receiver):
             offer = self.session.offers[sender]
             
             # Currency
             if offer["cash"] > 0:
-                wallets_col.update_one({"user_id": sender}, {"$inc": {"balance": -offer["cash"]}})
-                wallets_col.update_one({"user_id": receiver}, {"$inc": {"balance": offer["cash"]}}, upsert=True)
+                settle.debit(wallets_col, {"user_id": sender}, "balance", offer["cash"])
+                settle.update(wallets_col, {"user_id": receiver}, {"$inc": {"balance": offer["cash"]}}, upsert=True)
             if offer["sc"] > 0:
-                wallets_col.update_one({"user_id": sender}, {"$inc": {"shiny_coins": -offer["sc"]}})
-                wallets_col.update_one({"user_id": receiver}, {"$inc": {"shiny_coins": offer["sc"]}}, upsert=True)
+                settle.debit(wallets_col, {"user_id": sender}, "shiny_coins", offer["sc"])
+                settle.update(wallets_col, {"user_id": receiver}, {"$inc": {"shiny_coins": offer["sc"]}}, upsert=True)
             
             # Items
             for item_name, qty in offer["items"].items():
                 # Remove from Sender
                 sender_item = inventory_col.find_one({"user_id": sender, "name": item_name})
-                inventory_col.update_one({"_id": sender_item["_id"]}, {"$inc": {"quantity": -qty}})
+                settle.debit(inventory_col, {"_id": sender_item["_id"]}, "quantity", qty)
                 
                 # Add to Receiver
                 # We need the item_id and type to upsert correctly.
@@ -4924,7 +6593,7 @@ class TradeFinalView(View):
                 
                 # If Pokemon, we might need to update ownership in pokemon_col too if unique
                 # Assuming inventory quantity based, we just move quantity.
-                inventory_col.update_one(
+                settle.update(inventory_col,
                     {"user_id": receiver, "item_id": item_id},
                     {"$inc": {"quantity": qty}, "$set": {"name": item_name, "type": item_type}},
                     upsert=True
@@ -4939,6 +6608,9 @@ class TradeFinalView(View):
         # Execute Swap
         transfer_assets(u1, u2)
         transfer_assets(u2, u1)
+        if not settle.commit():
+            for uid in (u1, u2): active_trades.pop(uid, None)
+            return await interaction.channel.send(f"{E_ERROR} Balances or items changed before the swap. Trade Cancelled.")
 
         await update_quest(u1, "trade", 1)
         await update_quest(u2, "trade", 1)
@@ -5359,7 +7031,9 @@ async def removetax(ctx, *, club_name: str):
     current_due = club.get("tax_due_date", datetime.now())
     new_due = max(datetime.now(), current_due) + timedelta(days=30)
     
-    clubs_col.update_one({"_id": club["_id"]}, {"$set": {"tax_due_date": new_due, "tax_reminder_stage": 0}})
+    next_alert = next_tax_alert_time(new_due, 0)
+    clubs_col.update_one({"_id": club["_id"]}, {"$set": {"tax_due_date": new_due, "tax_reminder_stage": 0, "next_tax_alert_at": next_alert}})
+    wake_tax_sweep(next_alert)
     
     desc = f"{E_SUCCESS} Successfully waived tax for **{club['name']}**.\n{E_TIMER} **New Deadline:** <t:{int(new_due.timestamp())}:f>"
     await ctx.send(embed=create_embed(f"{E_ADMIN} Tax Waived", desc, 0x2ecc71))
@@ -5550,7 +7224,6 @@ async def registerclub(ctx, name: str, base_price: HumanInt, *, slogan: str = ""
 async def startclubauction(ctx, club_name: str):
     c = clubs_col.find_one({"name": {"$regex": f"^{club_name}$", "$options": "i"}})
     if not c: return await ctx.send(embed=create_embed("Error", f"{E_ERROR} Club not found.", 0xff0000))
-    bids_col.delete_many({"item_type": "club", "item_id": c["id"]})
     await ctx.send(embed=create_embed(f"{E_AUCTION} Auction Started", f"{E_ARROW} **Club:** {c['name']}\n{E_MONEY} **Base:** ${c['base_price']:,}", 0xe67e22, thumbnail=c.get('logo')))
     schedule_auction_timer("club", c["id"], ctx.channel.id)
 
@@ -5559,7 +7232,6 @@ async def startclubauction(ctx, club_name: str):
 async def startduelistauction(ctx, duelist_id: int):
     d = duelists_col.find_one({"id": int(duelist_id)})
     if not d: return await ctx.send(embed=create_embed("Error", f"{E_ERROR} Duelist not found.", 0xff0000))
-    bids_col.delete_many({"item_type": "duelist", "item_id": d["id"]})
     await ctx.send(embed=create_embed(f"{E_AUCTION} Duelist Auction", f"{E_ARROW} **Player:** {d['username']}\n{E_MONEY} **Base:** ${d['base_price']:,}", 0x9b59b6, thumbnail=d.get('avatar_url')))
     schedule_auction_timer("duelist", d["id"], ctx.channel.id)
 # bot.py Part 3 of 4 - Admin, Giveaways & Shop Backend
@@ -5700,6 +7372,8 @@ async def auditlog(ctx, lines: int = 10):
 @bot.hybrid_command(name="resetauction", description="Owner: Clear bids.")
 async def resetauction(ctx):
     bids_col.delete_many({})
+    for auc in timed_auctions_col.find({"status": "open"}, {"item_type": 1, "item_id": 1}):
+        timed_auctions_col.update_one({"_id": auc["_id"], "status": "open"}, {"$set": {"high_bid": {"bidder": None, "amount": item_base_price(auc["item_type"], auc["item_id"]), "at": datetime.now()}}})
     await ctx.send(embed=create_embed(f"{E_SUCCESS} Reset", "Bids cleared.", 0x2ecc71))
 
 @bot.hybrid_command(name="transferclub", aliases=["tc"], description="Admin: Transfer club.")
@@ -6098,8 +7772,8 @@ async def admin_reset_all(ctx):
 @bot.hybrid_command(name="forcewinner", aliases=["fw"], description="Owner: Force win.")
 @commands.has_permissions(administrator=True)
 async def forcewinner(ctx, item_type: str, item_id: int, winner_str: str, amount: HumanInt):
-    bids_col.insert_one({"bidder": winner_str, "amount": amount, "item_type": item_type, "item_id": int(item_id)})
-    await finalize_auction(item_type, int(item_id), ctx.channel.id)
+    bids_col.insert_one({"bidder": winner_str, "amount": amount, "item_type": item_type, "item_id": int(item_id), "timestamp": datetime.now()})
+    await finalize_auction(item_type, int(item_id), ctx.channel.id, forced_bid={"bidder": winner_str, "amount": amount})
     await ctx.send(embed=create_embed(f"{E_ADMIN} Force Win", f"Forced winner **{winner_str}**.", 0xe67e22))
 
 @bot.command(name="freezeauction", aliases=["fa"], description="Owner: Freeze auctions.")
@@ -6170,7 +7844,7 @@ async def managedeal(ctx, deal_id: str, action: str):
                 # Handle User Refund
                 wallets_col.update_one({"user_id": buyer_id}, {"$inc": {"balance": price}})
                 try: 
-                    user = await bot.fetch_user(int(buyer_id))
+                    user = await user_resolver.resolve(buyer_id)
                     await user.send(embed=create_embed(f"{E_DANGER} Deal Rejected", f"Your request to buy **{deal['club_name']}** was rejected.\n{E_MONEY} **${price:,}** refunded.", 0xff0000))
                 except: pass
             
@@ -6192,14 +7866,18 @@ async def managedeal(ctx, deal_id: str, action: str):
                 return await ctx.send(embed=create_embed("Error", "Club is already owned! Deal cancelled and refunded.", 0xff0000))
 
            # Transfer Ownership with Tax Timer
+            tax_due = datetime.now() + timedelta(days=30)
+            next_alert = next_tax_alert_time(tax_due, 0)
             clubs_col.update_one(
                 {"id": c["id"]}, 
                 {"$set": {
                     "owner_id": buyer_id,
-                    "tax_due_date": datetime.now() + timedelta(days=30),
-                    "tax_reminder_stage": 0
+                    "tax_due_date": tax_due,
+                    "tax_reminder_stage": 0,
+                    "next_tax_alert_at": next_alert
                 }}
             )
+            wake_tax_sweep(next_alert)
             
             # If User (not group), update profile
             if not buyer_id.startswith("group:") and deal.get("type") != "group":
@@ -6397,64 +8075,22 @@ async def run_giveaway(ctx, prize, winners_count, duration_seconds, description,
     embed.add_field(name="Winners", value=f"{E_CROWN} {winners_count}", inline=True)
     if image_url: embed.set_image(url=image_url)
     embed.set_footer(text="React with 🎉 to enter!")
-    msg = await ctx.send(embed=embed)
+    msg = await ctx.send(embed=embed, view=GiveawayView())
+    
+    if isinstance(required_role_ids, int): required_role_ids = [required_role_ids]
+    gw = {
+        "message_id": msg.id, "channel_id": ctx.channel.id, "host_id": str(ctx.author.id),
+        "prize": prize, "winners_count": winners_count, "description": description,
+        "required_role_ids": required_role_ids or [], "weighted": weighted,
+        "end_time": end_time, "ended": False, "winners": []
+    }
+    giveaways_col.insert_one(gw)
+    active_giveaways[msg.id] = gw
+    tracked_giveaway_messages[msg.id] = embed.title
+    job_scheduler.schedule("giveaway_end", msg.id, datetime.fromtimestamp(end_time))
+    
     try: await msg.add_reaction("🎉") 
     except: pass
-    view = ParticipantView(msg.id, required_role_ids)
-    await msg.edit(view=view)
-    await asyncio.sleep(duration_seconds)
-    try: msg = await ctx.channel.fetch_message(msg.id)
-    except: return
-    reaction = None
-    target_emoji = discord.PartialEmoji.from_str(E_GIVEAWAY)
-    for r in msg.reactions:
-         if str(r.emoji) == str(target_emoji) or str(r.emoji) == "🎉":
-             reaction = r
-             break
-    users = []
-    if reaction:
-        async for user in reaction.users():
-            if not user.bot:
-                member = ctx.guild.get_member(user.id)
-                if member:
-                    users.append(member)
-    if not users:
-        return await msg.reply(embed=create_embed("Ended", "No entrants.", 0x95a5a6))
-    
-    # Weighted Logic (If weighted=True)
-    pool = []
-    if weighted:
-        for u in users:
-            weight = 1
-            user_roles = [r.id for r in u.roles]
-            for rid, w in DONOR_WEIGHTS.items():
-                if rid in user_roles: weight = max(weight, w)
-            for _ in range(weight): pool.append(u)
-    else:
-        pool = users
-
-    final_winners = random.sample(pool, min(len(users), winners_count)) # Sample from pool but unique logic needed if pool has dupes? 
-    # Simplify: If weighted, we use random.choices but need unique winners.
-    if weighted:
-        final_winners = []
-        while len(final_winners) < winners_count and len(pool) > 0:
-            w = random.choice(pool)
-            if w not in final_winners: final_winners.append(w)
-            # Remove all instances of w from pool to prevent dupes
-            pool = [x for x in pool if x.id != w.id]
-    
-    winner_mentions = ", ".join([w.mention for w in final_winners])
-    tip_amount = 0
-    try:
-        clean = prize.lower().replace(",", "").replace("$", "")
-        if "k" in clean: tip_amount = int(float(clean.replace("k", "")) * 1000)
-    except: pass
-    tip_msg = ""
-    if tip_amount > 0:
-        for w in final_winners:
-             wallets_col.update_one({"user_id": str(w.id)}, {"$inc": {"balance": tip_amount}}, upsert=True)
-        tip_msg = f"\n{E_MONEY} **Auto-Tip:** ${tip_amount:,} sent!"
-    await msg.reply(f"Congratulations {winner_mentions}! {tip_msg}")
 
 @bot.hybrid_command(name="giveaway_daily", description="Start Daily giveaway.")
 @commands.has_permissions(administrator=True)
@@ -6487,6 +8123,20 @@ async def reroll(ctx, message_id: str):
     except (discord.NotFound, ValueError):
         return await ctx.send(embed=create_embed("Error", f"{E_ERROR} Message ID `{message_id}` not found in this channel.", 0xff0000), ephemeral=True)
     
+    gw = giveaways_col.find_one({"message_id": msg.id, "ended": True})
+    if gw:
+        # Draw from the stored entries, skipping anyone who already won
+        entries = [(e["user_id"], e.get("weight", 1)) for e in giveaway_entries_col.find({"giveaway_id": msg.id, "user_id": {"$nin": gw.get("winners", [])}})
+                   if ctx.guild.get_member(int(e["user_id"]))]
+        if not entries:
+            return await ctx.send(embed=create_embed(f"{E_ALERT} Reroll Failed", "No valid entrants available to reroll.", 0x95a5a6))
+        new_winner = ctx.guild.get_member(int(draw_giveaway_winners(entries, 1, gw.get("weighted", False))[0]))
+        giveaways_col.update_one({"_id": gw["_id"]}, {"$push": {"winners": str(new_winner.id)}})
+        desc = f"{E_CROWN} **New Winner:** {new_winner.mention}\n{E_ARROW} **Original Giveaway:** [Jump to Message]({msg.jump_url})"
+        embed = create_embed(f"{E_GIVEAWAY} Giveaway Rerolled!", desc, 0x2ecc71)
+        if new_winner.avatar: embed.set_thumbnail(url=new_winner.avatar.url)
+        return await ctx.send(content=f"Congratulations {new_winner.mention}!", embed=embed)
+    
     reaction = None
     target_emoji = discord.PartialEmoji.from_str(E_GIVEAWAY) if E_GIVEAWAY.startswith("<") else "🎉"
     
@@ -7226,6 +8876,7 @@ async def logdepositpc(ctx, deposit_id: str, status: str):
 
     new_status = "Completed" if stat == "Approved" else "Rejected"
     deposits_col.update_one({"deposit_id": dep_id}, {"$set": {"status": new_status}})
+    deposit_matcher.discard(dep_id)
 
     if stat == "Approved":
         wallets_col.update_one({"user_id": deposit["user_id"]}, {"$inc": {"pc": deposit["amount"]}}, upsert=True)
@@ -7363,8 +9014,7 @@ async def duelistinfo(ctx, identifier: str = None):
         if not duelist:
             return await ctx.send(embed=create_embed("Not Registered", f"{E_ERROR} You are not registered as a duelist.", 0xff0000))
 
-    try: target_user = await bot.fetch_user(int(duelist["user_id"]))
-    except: pass
+    target_user = await user_resolver.resolve(duelist["user_id"]) or target_user
 
     club_name = "Free Agent"
     if duelist.get("club_id"):
@@ -7782,7 +9432,8 @@ async def ze_chat(ctx, *, prompt: str):
 
                 elif f_name == "set_reminder":
                     unlock = datetime.now() + timedelta(days=int(args.get("days", 1)))
-                    ai_reminders_col.insert_one({"user_id": str(ctx.author.id), "channel_id": str(ctx.channel.id), "message": args.get("message", "Reminder"), "unlocks_at": unlock, "status": "pending"})
+                    res = ai_reminders_col.insert_one({"user_id": str(ctx.author.id), "channel_id": str(ctx.channel.id), "message": args.get("message", "Reminder"), "unlocks_at": unlock, "status": "pending"})
+                    job_scheduler.schedule("ai_reminder", res.inserted_id, unlock)
                     return await ctx.send(embed=create_embed(f"{E_TIMER} Reminder Logged", f"I've noted that in the books for <t:{int(unlock.timestamp())}:f>.", 0x2ecc71))
 
                 elif f_name == "execute_bot_command":
@@ -7880,16 +9531,21 @@ async def forget(ctx, concept: str):
         return await ctx.send(f"{E_ERROR} I have no memory of that.")
     await ctx.send(embed=create_embed(f"{E_ADMIN} Neural Wipe", f"Erase **{concept}** from the vault?", 0xe74c3c), view=TrainConfirmView(ctx, concept, None, "forget"))
 
-# 6. BACKGROUND REMINDER TASK
-@tasks.loop(minutes=1)
-async def ai_reminder_loop():
-    await bot.wait_until_ready()
-    due = ai_reminders_col.find({"status": "pending", "unlocks_at": {"$lte": datetime.now()}})
-    for r in due:
-        chan = bot.get_channel(int(r["channel_id"]))
-        if chan:
-            await chan.send(embed=create_embed(f"{E_TIMER} AI Reminder", f"<@{r['user_id']}>, you asked me to remind you:\n\n**{r['message']}**", 0xf1c40f))
-        ai_reminders_col.update_one({"_id": r["_id"]}, {"$set": {"status": "completed"}})
+# 6. SCHEDULED REMINDER JOB
+def seed_ai_reminder_jobs():
+    job_scheduler.seed("ai_reminder", [(r["_id"], r["unlocks_at"], None) for r in ai_reminders_col.find({"status": "pending"})])
+
+@job_scheduler.handler("ai_reminder", seed=seed_ai_reminder_jobs)
+async def ai_reminder_loop(job):
+    r = ai_reminders_col.find_one({"status": "pending", "_id": ObjectId(job["key"])})
+    if not r: return
+    try:
+        await messageable(int(r["channel_id"])).send(embed=create_embed(f"{E_TIMER} AI Reminder", f"<@{r['user_id']}>, you asked me to remind you:\n\n**{r['message']}**", 0xf1c40f))
+    except (discord.NotFound, discord.Forbidden) as e:
+        # Channel deleted or no access: retire the reminder so it isn't re-seeded on every boot
+        ai_reminders_col.update_one({"_id": r["_id"]}, {"$set": {"status": "failed", "error": str(e)}})
+        return
+    ai_reminders_col.update_one({"_id": r["_id"]}, {"$set": {"status": "completed"}})
     
 # --- START OF HELP MENU & BOTINFO ---
 
@@ -8309,6 +9965,7 @@ async def botinfo(ctx):
 
 # Define the ID here so it works standalone
 LOGIN_LOG_CHANNEL_ID = 1455496870003740736
+LOGIN_PINGS_PER_MESSAGE = 50 # Mentions per reminder message; keeps content well under 2000 chars
 
 @bot.command(name="remindlogin", description="Toggle daily login reminders.")
 async def remindlogin(ctx):
@@ -8325,7 +9982,13 @@ async def remindlogin(ctx):
     current_status = user.get("remind_login", False)
     new_status = not current_status
     
-    wallets_col.update_one({"user_id": uid}, {"$set": {"remind_login": new_status}})
+    update = {"$set": {"remind_login": new_status}}
+    if not new_status:
+        update["$unset"] = {"remind_at": ""}
+    elif isinstance(user.get("last_login"), datetime) and not user.get("reminder_sent"):
+        update["$set"]["remind_at"] = user["last_login"] + timedelta(hours=24)
+    wallets_col.update_one({"user_id": uid}, update)
+    if "remind_at" in update["$set"]: wake_login_sweep(update["$set"]["remind_at"])
     
     # 3. Response
     status_text = "Enabled" if new_status else "Disabled"
@@ -8337,45 +10000,52 @@ async def remindlogin(ctx):
                          color)
     await ctx.send(embed=embed)
 
+def command_tree_hash():
+    """SHA-256 of the slash command tree as canonical JSON, so an unchanged tree never re-syncs."""
+    payload = []
+    for cmd in bot.tree.get_commands():
+        try: payload.append(cmd.to_dict(bot.tree))
+        except TypeError: payload.append(cmd.to_dict()) # discord.py < 2.4
+    payload.sort(key=lambda c: (c.get("type", 1), c["name"]))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+async def sync_command_tree(force=False):
+    """Pushes the tree to Discord only when its hash differs from the last synced one. Returns True if it synced."""
+    tree_hash = command_tree_hash()
+    stored = config_col.find_one({"key": "command_tree_hash"}) if db is not None else None
+    if not force and stored and stored.get("value") == tree_hash:
+        print("[Sync] Command tree unchanged, skipping sync.")
+        return False
+    await bot.tree.sync()
+    if db is not None:
+        config_col.update_one({"key": "command_tree_hash"}, {"$set": {"value": tree_hash, "synced_at": datetime.now()}}, upsert=True)
+    print(f"[Sync] Synced command tree ({tree_hash[:12]}).")
+    return True
+
+@supervisor.once("command_sync")
+async def sync_commands():
+    await sync_command_tree()
+
+@bot.command(name="sync", description="Owner: Force a slash command sync.")
+@commands.is_owner() # Global syncs are heavily rate-limited, so not every server admin gets this
+async def sync(ctx):
+    await sync_command_tree(force=True)
+    await ctx.send(embed=create_embed(f"{E_SUCCESS} Synced", f"Slash commands pushed to Discord.\n{E_ARROW} **Hash:** `{command_tree_hash()[:12]}`", 0x2ecc71))
+
+@supervisor.once("persistent_views")
+def register_persistent_views():
+    # Register Views (So buttons work after restart)
+    bot.add_view(GiveawayView()) 
+    bot.add_view(ShopView())
+    bot.add_view(BotInfoView())
+    bot.add_view(DepositView())
+    bot.add_view(AuctionInfoView(guild_id=824238712770003027))
+
 @bot.event
 async def on_ready():
     print(f"Logged in as {bot.user}")
-    try:
-        await bot.tree.sync()
-        
-        # 1. Register Views (So buttons work after restart)
-        bot.add_view(GiveawayView()) 
-        bot.add_view(ShopView())
-        bot.add_view(BotInfoView())
-        
-        bot.loop.create_task(pc_claim_alert_task())
-        bot.loop.create_task(club_tax_alert_task())
-        bot.loop.create_task(check_active_giveaways())# 3. START GIVEAWAY RECOVERY (The Fix)
-        bot.add_view(DepositView())
-        
-        ai_reminder_loop.start()
-        
-        club_market_simulation_task.start()
-        
-        # 2. Start Market Simulation (If not running)
-        if not hasattr(bot, 'market_task_started'):
-            bot.loop.create_task(market_simulation_task())
-            bot.market_task_started = True
-
-        # 3. Start Login Reminders (If not running)
-        if not hasattr(bot, 'reminders_started'):
-            # These two lines MUST be indented 4 spaces relative to the 'if' above
-            bot.loop.create_task(check_login_reminders())
-            bot.reminders_started = True
-            
-        # 3. START GIVEAWAY RECOVERY (The Fix)
-        bot.loop.create_task(check_active_giveaways())
-        
-    except Exception as e: print(e)
-
-# Paste them safely below the entire try/except block!
-    bot.add_view(AuctionInfoView(guild_id=824238712770003027))
-    auction_clock.start()
+    # Gateway reconnects fire this again; the supervisor only starts what this process hasn't started yet
+    supervisor.start_all()
 
 @bot.event
 async def on_command_error(ctx, error):
@@ -8387,59 +10057,45 @@ async def on_command_error(ctx, error):
 
 @bot.listen('on_raw_reaction_add')
 async def auto_giveaway_quest(payload):
+    # 1. Only bot giveaways count; a dict lookup instead of fetching every reacted message
+    title = tracked_giveaway_messages.get(payload.message_id)
+    if title is None: return
+    
     # Ignore bots
-    if payload.member.bot: return
+    if not payload.member or payload.member.bot: return
     
-    # 1. Check if the emoji used is the giveaway emoji or default popper
-    target_emoji_str = str(discord.PartialEmoji.from_str(E_GIVEAWAY)) if E_GIVEAWAY.startswith("<") else "🎉"
-    if str(payload.emoji) != target_emoji_str and str(payload.emoji) != "🎉":
-        return
-        
-    # 2. Fetch the channel and message
-    channel = bot.get_channel(payload.channel_id)
-    if not channel: return
-    try:
-        msg = await channel.fetch_message(payload.message_id)
-    except:
+    # 2. Check if the emoji used is the giveaway emoji or default popper
+    if not is_giveaway_emoji(payload.emoji):
         return
-        
-    if not msg.embeds: return
-    embed = msg.embeds[0]
     
-    # 3. Verify it is an official bot giveaway by checking the footer
-    if embed.footer and embed.footer.text == "React with 🎉 to enter!":
-        uid = str(payload.user_id)
+    uid = str(payload.user_id)
+    
+    # 3. Check the 24-Hour Cooldown
+    w = wallets_col.find_one({"user_id": uid})
+    if not w: 
+        w = get_wallet(payload.user_id) # Ensure they have a profile
         
-        # 4. Check the 24-Hour Cooldown
-        w = wallets_col.find_one({"user_id": uid})
-        if not w: 
-            w = get_wallet(payload.user_id) # Ensure they have a profile
+    last_react = w.get("last_gw_react")
+    now = datetime.now()
+    
+    if last_react and isinstance(last_react, datetime):
+        # If less than 24 hours (86400 seconds) have passed, stop here.
+        if (now - last_react).total_seconds() < 86400:
+            return 
             
-        last_react = w.get("last_gw_react")
-        now = datetime.now()
-        
-        if last_react and isinstance(last_react, datetime):
-            # If less than 24 hours (86400 seconds) have passed, stop here.
-            if (now - last_react).total_seconds() < 86400:
-                return 
-                
-        # 5. Passed cooldown! Update the timestamp and credit the quest
-        wallets_col.update_one({"user_id": uid}, {"$set": {"last_gw_react": now}})
-        
-        # This will update Daily, Weekly, Monthly, Yearly, and Career giveaway quests!
-        await update_quest(payload.user_id, "giveaway", 1)
-        
-        # 6. Send the Premium DM
-        try:
-            desc = (
-                f"Your participation in **{embed.title}** has been verified!\n\n"
-                f"{E_GOLD_TICK} **+1 Giveaway Quest Progress** has been added to your profile.\n"
-                f"{E_TIMER} You can earn this automatic quest credit again in exactly 24 hours."
-            )
-            dm_embed = create_embed(f"{E_GIVEAWAY} Quest Completed!", desc, 0x2ecc71)
-            await payload.member.send(embed=dm_embed)
-        except discord.Forbidden:
-            pass # Fails silently if the user has their DMs closed
+    # 4. Passed cooldown! Update the timestamp and credit the quest
+    wallets_col.update_one({"user_id": uid}, {"$set": {"last_gw_react": now}})
+    
+    # This will update Daily, Weekly, Monthly, Yearly, and Career giveaway quests!
+    await update_quest(payload.user_id, "giveaway", 1)
+    
+    # 5. Send the Premium DM (merged with any other notifications in the digest window)
+    desc = (
+        f"Your participation in **{title}** has been verified!\n\n"
+        f"{E_GOLD_TICK} **+1 Giveaway Quest Progress** has been added to your profile.\n"
+        f"{E_TIMER} You can earn this automatic quest credit again in exactly 24 hours."
+    )
+    dm_digest.notify(payload.member, f"{E_GIVEAWAY} Quest Completed!", desc, 0x2ecc71)
 
 # ==============================================================================
 #  RENDER PORT BINDING (Fix for "No open ports detected")
@@ -8459,7 +10115,44 @@ def run_web_server():
     port = int(os.getenv("PORT", 10000))
     uvicorn.run(app, host="0.0.0.0", port=port, log_level="warning")
 
-if __name__ == "__main__":
+async def run_worker(token):
+    """Headless job worker: logs in over REST (no gateway), then drains offloaded jobs and runs the heavy loops."""
+    async with bot:
+        await bot.login(token)
+        print(f"[Worker] {INSTANCE_ID} running jobs as {bot.user} (REST only).")
+        supervisor.start_all()
+        while not bot.is_closed():
+            await asyncio.sleep(3600)
+
+async def run_gateway(token):
+    """Gateway process: waits as a standby until it holds gateway_lease and only then connects, so a second
+    replica handles no events, commands or loops while the leader is up. Losing the lease disconnects and
+    exits; the restarted process parks as the standby."""
+    discord.utils.setup_logging()
+    async with bot:
+        lease = asyncio.create_task(gateway_lease.run())
+        print(f"[Lease] {INSTANCE_ID} waiting for the gateway lease before connecting...")
+        await gateway_lease.acquired.wait()
+        gateway = asyncio.create_task(bot.start(token))
+        lost = asyncio.create_task(gateway_lease.lost.wait())
+        await asyncio.wait({gateway, lost}, return_when=asyncio.FIRST_COMPLETED)
+        lease.cancel()
+        if not lost.done():
+            lost.cancel()
+            return gateway.result() # Closed normally, or a login error worth seeing
+        print(f"[Lease] {INSTANCE_ID} lost the gateway lease; disconnecting.")
+        await bot.close()
+        await asyncio.gather(gateway, return_exceptions=True)
+    sys.exit(1) # Non-zero so the host restarts us as the standby
+
+if __name__ == "__main__" and WORKER_MODE:
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        print("CRITICAL ERROR: No DISCORD_TOKEN found in Environment Variables!")
+    else:
+        asyncio.run(run_worker(token))
+
+elif __name__ == "__main__":
     # 1. Start the web server in a background thread so it doesn't block the code
     web_thread = threading.Thread(target=run_web_server)
     web_thread.daemon = True
@@ -8467,12 +10160,12 @@ if __name__ == "__main__":
     
     print("Web server started in background. Waking up the Pit Boss...")
     
-    # 2. Start the Discord Bot on the main thread
+    # 2. Start the Discord Bot on the main thread (once this replica holds the gateway lease)
     token = os.getenv("DISCORD_TOKEN")
     if not token:
         print("CRITICAL ERROR: No DISCORD_TOKEN found in Environment Variables!")
     else:
-        bot.run(token)
+        asyncio.run(run_gateway(token))
 
 
 
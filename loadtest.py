@@ -0,0 +1,495 @@
+# loadtest.py
+# Synthetic load for the live auction, casino and chat paths, without a live guild.
+# Dependencies: everything bot.py needs, plus mongomock for --mongo mock
+#
+#   python loadtest.py auction --bidders 50 --rooms 3 --rate 20 --duration 60
+#   python loadtest.py casino --bidders 40 --tables 8 --duration 60
+#   python loadtest.py chat --bidders 200 --rate 50 --duration 30 --mongo mongodb://localhost:27017
+#   python loadtest.py giveaway --entrants 100000 --winners 10 --duration 10
+#
+# bot.py is imported as a module (its __main__ block never runs). The gateway is faked by
+# feeding MESSAGE_CREATE payloads to the connection state, REST by swapping bot.http.request,
+# and interactions by a small stand-in with the response/followup calls the casino views use.
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import contextvars
+import re
+import discord
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+current_handler = contextvars.ContextVar("current_handler", default="(background)")
+
+# ==========================================================
+# 📊 METRICS
+# ==========================================================
+
+def percentile(values, pct):
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class Metrics:
+    """Latencies per handler, DB commands per handler, REST calls per route and event-loop lag."""
+    def __init__(self):
+        self.latency = defaultdict(list) # handler -> seconds
+        self.calls = Counter()           # handler -> invocations
+        self.queries = Counter()         # handler -> DB commands issued while it ran
+        self.commands = Counter()        # DB command name -> count
+        self.http = Counter()            # "METHOD /route" -> count
+        self.lag = []
+        self.events = 0
+
+    def query(self, name):
+        self.commands[name] += 1
+        self.queries[current_handler.get()] += 1
+
+    def record(self, handler, seconds):
+        self.calls[handler] += 1
+        self.latency[handler].append(seconds)
+
+    def report(self, title, elapsed):
+        print(f"\n[LoadTest] ===== {title} ({elapsed:.1f}s) =====")
+        total_queries = sum(self.queries.values())
+        print(f"[LoadTest] Events: {self.events} ({self.events / max(elapsed, 1e-9):.1f}/s) | DB commands: {total_queries} ({total_queries / max(self.events, 1):.2f} per event)")
+        print(f"[LoadTest] {'handler':<48} {'calls':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'q/call':>7}")
+        for name in sorted(self.latency, key=lambda n: -len(self.latency[n])):
+            lat = self.latency[name]
+            print(f"[LoadTest] {name:<48} {len(lat):>7} {percentile(lat, 50) * 1000:>9.2f} {percentile(lat, 99) * 1000:>9.2f} {max(lat) * 1000:>9.2f} {self.queries[name] / max(self.calls[name], 1):>7.2f}")
+        if self.queries.get("(background)"):
+            print(f"[LoadTest] {'(background tasks)':<48} {'':>7} {'':>9} {'':>9} {'':>9} {self.queries['(background)']:>7}")
+        print(f"[LoadTest] Event-loop lag: p50 {percentile(self.lag, 50) * 1000:.2f} ms | p99 {percentile(self.lag, 99) * 1000:.2f} ms | max {max(self.lag, default=0) * 1000:.2f} ms")
+        print("[LoadTest] DB commands: " + (", ".join(f"{k}={v}" for k, v in self.commands.most_common()) or "none"))
+        print("[LoadTest] REST calls: " + (", ".join(f"{k}={v}" for k, v in self.http.most_common()) or "none"))
+
+metrics = Metrics()
+
+async def lag_probe(interval=0.05):
+    """Sleeps `interval` in a loop; anything past it is time the loop spent blocked elsewhere."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        metrics.lag.append(max(0.0, loop.time() - start - interval))
+
+# ==========================================================
+# 🗄️ DATABASE: MONGOMOCK OR A LOCAL MONGOD
+# ==========================================================
+
+MOCK_METHODS = ("find", "find_one", "find_one_and_update", "find_one_and_replace", "find_one_and_delete",
+                "insert_one", "insert_many", "update_one", "update_many", "replace_one", "delete_one",
+                "delete_many", "count_documents", "aggregate", "bulk_write", "distinct")
+
+def install_mongomock(db_latency):
+    """Routes bot.py's MongoClient to mongomock and counts each outermost collection call as one command.
+    `db_latency` blocks like a synchronous round trip would, so its cost shows up as loop lag."""
+    import pymongo
+    import mongomock
+    from mongomock.collection import Collection
+
+    depth = contextvars.ContextVar("mock_depth", default=0) # mongomock calls its own public methods
+
+    def counted(name, fn):
+        def wrapper(self, *args, **kwargs):
+            outer = depth.get() == 0
+            if outer:
+                metrics.query(name)
+                if db_latency: time.sleep(db_latency)
+            token = depth.set(depth.get() + 1)
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                depth.reset(token)
+        return wrapper
+
+    for name in MOCK_METHODS:
+        setattr(Collection, name, counted(name, getattr(Collection, name)))
+
+    create_index = Collection.create_index
+    def lenient_create_index(self, keys, **kwargs):
+        try:
+            return create_index(self, keys, **kwargs)
+        except NotImplementedError:
+            kwargs.pop("partialFilterExpression", None) # Not every mongomock release knows partial indexes
+            return create_index(self, keys, **kwargs)
+    Collection.create_index = lenient_create_index
+
+    shared = mongomock.MongoClient()
+    pymongo.MongoClient = lambda *args, **kwargs: shared
+    os.environ["MONGO_URL"] = "mongodb://mongomock"
+
+def install_mongod(url):
+    """Counts real wire commands through pymongo's command monitoring."""
+    import pymongo
+    from pymongo import monitoring
+
+    class CommandCounter(monitoring.CommandListener):
+        IGNORED = {"hello", "ismaster", "isMaster", "ping", "endSessions", "saslStart", "saslContinue", "buildInfo"}
+        def started(self, event):
+            if event.command_name not in self.IGNORED: metrics.query(event.command_name)
+        def succeeded(self, event): pass
+        def failed(self, event): pass
+
+    monitoring.register(CommandCounter())
+    real_client = pymongo.MongoClient
+    def client(host=None, **kwargs):
+        # bot.py always passes the Atlas CA bundle; a plain local mongod doesn't speak TLS
+        if host and not host.startswith("mongodb+srv") and "tls=true" not in host.lower():
+            kwargs.pop("tlsCAFile", None)
+        return real_client(host, **kwargs)
+    pymongo.MongoClient = client
+    os.environ["MONGO_URL"] = url
+
+# ==========================================================
+# 🛰️ FAKE GATEWAY & REST
+# ==========================================================
+
+GUILD_ID = 1483437925000000000
+CASINO_CHANNEL = 1483437925000000001
+ROOM_BASE = 1483437925000000100
+USER_BASE = 1483437925000100000
+SELLER_BASE = 1483437925000200000
+BOT_USER_ID = 1483437925000900000
+
+_ids = iter(range(1, 1 << 62))
+
+def snowflake():
+    return discord.utils.time_snowflake(datetime.now(timezone.utc)) + next(_ids) % 4194304
+
+def user_payload(uid, name, bot_account=False):
+    return {"id": str(uid), "username": name, "global_name": name, "discriminator": "0", "avatar": None, "bot": bot_account}
+
+def channel_payload(cid, name, position=0):
+    return {"id": str(cid), "type": 0, "name": name, "position": position, "guild_id": str(GUILD_ID),
+            "permission_overwrites": [], "nsfw": False, "parent_id": None, "topic": None,
+            "rate_limit_per_user": 0, "last_message_id": None}
+
+def role_payload(rid, name, position=0):
+    return {"id": str(rid), "name": name, "permissions": "0", "position": position, "color": 0,
+            "hoist": False, "managed": False, "mentionable": False, "flags": 0}
+
+def member_payload(uid=None, name=None):
+    data = {"roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+    if uid is not None: data["user"] = user_payload(uid, name)
+    return data
+
+class FakeHTTP:
+    """Stands in for bot.http.request: every REST call sleeps `latency`, is counted per route and
+    answers with the smallest payload discord.py will parse."""
+    REACTION = re.compile(r"/channels/\d+/messages/(\d+)/reactions/")
+
+    def __init__(self, gateway, latency):
+        self.gateway = gateway
+        self.latency = latency
+
+    async def request(self, route, *, files=None, form=None, **kwargs):
+        metrics.http[f"{route.method} {route.path}"] += 1
+        if self.latency: await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        method, path = route.method, route.path
+        payload = kwargs.get("json") or {}
+
+        if path == "/channels/{channel_id}/messages" and method == "POST":
+            return self.gateway.bot_message(route.channel_id, payload)
+        if path == "/channels/{channel_id}/messages/{message_id}" and method in ("PATCH", "GET"):
+            mid = int(route.url.rstrip("/").rsplit("/", 1)[1])
+            return self.gateway.bot_message(route.channel_id, payload, message_id=mid)
+        if path == "/channels/{channel_id}" and method == "GET":
+            return channel_payload(route.channel_id, f"channel-{route.channel_id}")
+        if path == "/users/@me/channels":
+            uid = payload.get("recipient_id")
+            return {"id": str(snowflake()), "type": 1, "recipients": [user_payload(uid, f"user-{uid}")]}
+        if path.startswith("/channels/{channel_id}/messages/{message_id}/reactions/") and method == "PUT":
+            match = self.REACTION.search(route.url)
+            if match: self.gateway.acked(int(match.group(1)))
+        return None
+
+class FakeGateway:
+    """One synthetic guild in the bot's connection state; messages go in as MESSAGE_CREATE payloads."""
+    def __init__(self, bot_module, bidders, rooms, sellers):
+        self.bot_module = bot_module
+        self.bot = bot_module.bot
+        self.state = self.bot._connection
+        self.sent_at = {} # message id -> perf_counter at dispatch, for bid -> reaction latency
+
+        self.state.user = discord.ClientUser(state=self.state, data=user_payload(BOT_USER_ID, "LoadTestBot", bot_account=True))
+        self.bidders = [USER_BASE + i for i in range(bidders)]
+        self.sellers = [SELLER_BASE + i for i in range(sellers)]
+        self.rooms = [ROOM_BASE + i for i in range(rooms)]
+
+        fixed = {CASINO_CHANNEL: "casino", bot_module.LOG_CHANNEL_ID: "gamble-logs", 1483860590907883580: "disputes"}
+        fixed.update({cid: name for name, cid in bot_module.LOG_CHANNELS.items()})
+        fixed.update({cid: f"bidding-{i + 1}" for i, cid in enumerate(self.rooms)})
+        members = [member_payload(uid, f"bidder{i}") for i, uid in enumerate(self.bidders)]
+        members += [member_payload(uid, f"seller{i}") for i, uid in enumerate(self.sellers)]
+        members.append(member_payload(BOT_USER_ID, "LoadTestBot"))
+        data = {
+            "id": str(GUILD_ID), "name": "Load Test", "owner_id": str(BOT_USER_ID),
+            "roles": [role_payload(GUILD_ID, "@everyone"), role_payload(1483871103473553498, "Seller", 1)],
+            "channels": [channel_payload(cid, name, pos) for pos, (cid, name) in enumerate(fixed.items())],
+            "members": members, "member_count": len(members), "emojis": [], "stickers": [], "features": [],
+            "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+            "mfa_level": 0, "premium_tier": 0, "nsfw_level": 0, "afk_timeout": 300, "system_channel_flags": 0,
+            "preferred_locale": "en-US", "unavailable": False,
+        }
+        self.guild = discord.Guild(data=data, state=self.state)
+        self.state._add_guild(self.guild)
+
+    def message_payload(self, channel_id, author, content, message_id=None, embeds=None):
+        return {
+            "id": str(message_id or snowflake()), "channel_id": str(channel_id), "guild_id": str(GUILD_ID),
+            "author": author, "content": content, "type": 0, "tts": False, "pinned": False, "flags": 0,
+            "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+            "embeds": embeds or [], "components": [], "timestamp": datetime.now(timezone.utc).isoformat(),
+            "edited_timestamp": None,
+        }
+
+    def bot_message(self, channel_id, payload, message_id=None):
+        embeds = payload.get("embeds") or []
+        return self.message_payload(channel_id, user_payload(BOT_USER_ID, "LoadTestBot", True), payload.get("content") or "", message_id, embeds)
+
+    def send(self, channel_id, user_id, content):
+        """Delivers a user message through the same parser the websocket uses."""
+        data = self.message_payload(channel_id, user_payload(user_id, f"user-{user_id}"), content)
+        data["member"] = member_payload()
+        self.sent_at[int(data["id"])] = time.perf_counter()
+        metrics.events += 1
+        self.state.parse_message_create(data)
+
+    def acked(self, message_id):
+        start = self.sent_at.pop(message_id, None)
+        if start is not None: metrics.record("bid -> reaction", time.perf_counter() - start)
+
+def time_handlers(bot):
+    """Wraps the client's event runner so every listener is timed and its DB commands are attributed to it."""
+    run_event = bot._run_event
+    async def timed(coro, event_name, *args, **kwargs):
+        name = f"{event_name}:{coro.__name__}" if coro.__name__ != event_name else event_name
+        current_handler.set(name)
+        start = time.perf_counter()
+        try:
+            await run_event(coro, event_name, *args, **kwargs)
+        finally:
+            metrics.record(name, time.perf_counter() - start)
+    bot._run_event = timed
+
+class FakeResponse:
+    """The subset of InteractionResponse the casino views call. Replies go out as channel messages
+    through the fake REST layer, so they cost what a callback would."""
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    def _ack(self):
+        if not self.done:
+            self.done = True
+            metrics.record(f"{self.interaction.name} (ack)", time.perf_counter() - self.interaction.created)
+
+    async def defer(self, **kwargs):
+        self._ack()
+
+    async def send_message(self, content=None, *, ephemeral=False, view=None, **kwargs):
+        self._ack()
+        kwargs = {k: v for k, v in kwargs.items() if k in ("embed", "embeds")}
+        if view is not None: kwargs["view"] = view
+        message = await self.interaction.channel.send(content, **kwargs)
+        if not ephemeral: self.interaction.original, self.interaction.view = message, view
+
+    async def edit_message(self, **kwargs):
+        self._ack()
+        await self.interaction.message.edit(**kwargs)
+
+class FakeInteraction:
+    """Component interaction stand-in: user, channel, the clicked message and a response object."""
+    def __init__(self, name, user, channel, message=None):
+        self.name = name
+        self.user = user
+        self.channel = channel
+        self.guild = channel.guild
+        self.message = message
+        self.original = None
+        self.view = None
+        self.created = time.perf_counter()
+        self.response = FakeResponse(self)
+        self.followup = channel
+
+    async def send(self, content=None, **kwargs):
+        """What helpers taking a ctx or an interaction (send_gamble_panel) call when it isn't a real Interaction."""
+        message = await self.channel.send(content, **kwargs)
+        self.original, self.view = message, kwargs.get("view")
+        return message
+
+# ==========================================================
+# 🎬 SCENARIOS
+# ==========================================================
+
+async def paced(rate, duration, fire):
+    """Calls fire() `rate` times a second for `duration` seconds, catching up if the loop falls behind."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    sent = 0
+    while loop.time() - start < duration:
+        due = int((loop.time() - start) * rate)
+        while sent < due:
+            fire()
+            sent += 1
+        await asyncio.sleep(1 / rate)
+
+async def scenario_chat(bm, gw, args):
+    """K messages/sec from N members in the daily-task chat channel (message counts, quests, levels)."""
+    chat = bm.LOG_CHANNELS["chat_channel"]
+    for uid in gw.bidders:
+        bm.wallets_col.update_one({"user_id": str(uid)}, {"$set": {"lifetime_msgs": random.randint(0, 500), "balance": 0, "pc": 0}}, upsert=True)
+    words = ["gg", "anyone trading?", "nice shiny", "lol", "who's up for the auction", "brb", "pog"]
+    await paced(args.rate, args.duration, lambda: gw.send(chat, random.choice(gw.bidders), random.choice(words)))
+
+async def scenario_auction(bm, gw, args):
+    """N bidders against M rooms of run_live_auction, each room resumed straight into its bidding phase.
+    Bids arrive at K/sec; about one in ten is under the minimum so the denial path runs too."""
+    now = datetime.now()
+    session_id = f"loadtest-{int(time.time())}"
+    rooms = {}
+    for i, cid in enumerate(gw.rooms):
+        auc_id = f"AUC-LT{i:03d}"
+        bm.auction_queue_col.insert_one({"auction_id": auc_id, "pokemon_id": str(100 + i), "user_id": gw.sellers[i], "status": "live", "room": cid, "slot": 1000 + i})
+        rooms[str(cid)] = {"auction_id": auc_id, "slot": i + 1, "phase": "bidding", "high_bid": None, "min_increment": 0, "deadline": now + timedelta(seconds=30)}
+    for uid in gw.bidders:
+        bm.wallets_col.update_one({"user_id": str(uid)}, {"$set": {"pc": random.randint(5, 50) * 1_000_000}}, upsert=True)
+    session = bm.LiveSessionWriter(session_id, state={"status": "running", "opened": True, "started_at": now, "rooms": rooms})
+
+    event = asyncio.create_task(bm.run_live_auction(gw.bot, gw.guild, session))
+    await asyncio.sleep(0.5) # Let the rooms claim their lots and post the resume notice
+
+    def bid():
+        cid = random.choice(gw.rooms)
+        room = bm.live_rooms.get(cid)
+        if room is None: return
+        floor = max(room.session.state.get("min_increment") or 0, 1000)
+        amount = int(floor * (random.uniform(0.5, 0.95) if random.random() < 0.1 else random.uniform(1.0, 1.08)))
+        gw.send(cid, random.choice(gw.bidders), str(amount))
+
+    try:
+        await paced(args.rate, args.duration, bid)
+    finally:
+        live = list(bm.live_rooms.values())
+        event.cancel()
+        await asyncio.gather(event, return_exceptions=True)
+        bm.live_rooms.clear()
+    accepted = sum(r.stats["bids"] for r in live)
+    writes = sum(r.session.writes for r in live)
+    print(f"[LoadTest] {len(live)} rooms accepted {accepted} bids with {writes} session writes and {bm.tracker_editor.sent} tracker edits")
+
+async def scenario_casino(bm, gw, args):
+    """M slot tables running back to back: panel, joins, one house bot, start. Each table is one
+    host plus up to three players drawn from the N members."""
+    channel = gw.guild.get_channel(CASINO_CHANNEL)
+    wager = 1000
+    for uid in gw.bidders:
+        bm.wallets_col.update_one({"user_id": str(uid)}, {"$set": {"balance": 10_000_000}}, upsert=True)
+
+    async def timed(name, coro):
+        metrics.events += 1
+        token = current_handler.set(name)
+        start = time.perf_counter()
+        try:
+            await coro
+        finally:
+            metrics.record(name, time.perf_counter() - start)
+            current_handler.reset(token)
+
+    async def click(view, custom_id, user, message):
+        button = next(c for c in view.children if getattr(c, "custom_id", None) == custom_id)
+        await timed(custom_id, button.callback(FakeInteraction(custom_id, user, channel, message)))
+
+    async def table():
+        loop = asyncio.get_running_loop()
+        end = loop.time() + args.duration
+        while loop.time() < end:
+            seats = random.sample(gw.bidders, k=min(len(gw.bidders), random.randint(1, 4)))
+            host = gw.guild.get_member(seats[0])
+            opener = FakeInteraction("gamble_panel", host, channel)
+            await timed("gamble_panel", bm.send_gamble_panel(opener, host, wager))
+            panel, view = opener.original, opener.view
+            view.game = "slots" # What the game select would set
+            for uid in seats[1:]:
+                await click(view, "join_gamble", gw.guild.get_member(uid), panel)
+            await click(view, "add_bot", host, panel)
+            await click(view, "start_gamble", host, panel)
+            await asyncio.sleep(random.uniform(0.5, 2.0))
+
+    await asyncio.gather(*(table() for _ in range(args.tables)))
+
+async def scenario_giveaway(bm, gw, args):
+    """Back-to-back weighted draws over synthetic entrants with donor-style weights. end_giveaway
+    draws on the event loop, so the cost shows up as loop lag as well as draw latency."""
+    rng = random.Random(args.seed)
+    weights = list(bm.DONOR_WEIGHTS.values()) + [1] * 20
+    entries = [(str(USER_BASE + i), rng.choice(weights)) for i in range(args.entrants)]
+    loop = asyncio.get_running_loop()
+    end = loop.time() + args.duration
+    while loop.time() < end:
+        metrics.events += 1
+        start = time.perf_counter()
+        bm.draw_giveaway_winners(entries, args.winners, weighted=True, seed=rng.getrandbits(63))
+        metrics.record("draw_giveaway_winners", time.perf_counter() - start)
+        await asyncio.sleep(0.1)
+
+SCENARIOS = {"chat": scenario_chat, "auction": scenario_auction, "casino": scenario_casino, "giveaway": scenario_giveaway}
+
+# ==========================================================
+# 🚀 ENTRY POINT
+# ==========================================================
+
+async def main(args):
+    global metrics
+    import bot as bm # Imported here so the Mongo patches and env vars above are already in place
+
+    if bm.db is None:
+        sys.exit("[LoadTest] No database; pass --mongo mock or a mongod URL.")
+    await bm.bot._async_setup_hook() # Binds bot.loop and the connection state to this loop, no login
+    gw = FakeGateway(bm, args.bidders, args.rooms, max(args.rooms, 1))
+    bm.bot.http.request = FakeHTTP(gw, args.rest_latency).request
+    time_handlers(bm.bot)
+    bm.bot._ready.set()
+
+    for name in (SCENARIOS if args.scenario == "all" else [args.scenario]):
+        metrics = Metrics()
+        probe = asyncio.create_task(lag_probe())
+        start = time.perf_counter()
+        await SCENARIOS[name](bm, gw, args)
+        await asyncio.sleep(args.settle) # Let coalesced edits, delayed deletes and session flushes drain
+        probe.cancel()
+        metrics.report(f"{name}: {args.bidders} members, {args.rooms} rooms, {args.tables} tables, {args.rate}/s", time.perf_counter() - start)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetic load for bot.py's auction, casino and chat paths.")
+    parser.add_argument("scenario", choices=[*SCENARIOS, "all"])
+    parser.add_argument("--bidders", type=int, default=50, help="N: members taking part (bidders, players, chatters)")
+    parser.add_argument("--rooms", type=int, default=3, help="M: live auction rooms")
+    parser.add_argument("--tables", type=int, default=4, help="M: concurrent slot tables")
+    parser.add_argument("--entrants", type=int, default=100000, help="Entrants per giveaway draw")
+    parser.add_argument("--winners", type=int, default=10, help="Winners per giveaway draw")
+    parser.add_argument("--rate", type=float, default=20, help="K: messages (bids) per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to drive each scenario")
+    parser.add_argument("--settle", type=float, default=3, help="Seconds to wait for background work after driving")
+    parser.add_argument("--mongo", default="mock", help="'mock' for mongomock, or a mongod URL")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="Blocking seconds added per mongomock call")
+    parser.add_argument("--rest-latency", type=float, default=0.05, help="Mean seconds per fake REST call")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    # bot.py reads these at import time
+    os.environ["LIVE_AUCTION_ROOMS"] = ",".join(str(ROOM_BASE + i) for i in range(args.rooms))
+    os.environ.setdefault("GROQ_API_KEY", "loadtest")
+    os.environ.pop("JOB_WORKERS", None)
+    if args.mongo == "mock": install_mongomock(args.db_latency)
+    else: install_mongod(args.mongo)
+    asyncio.run(main(args))